@@ -1,10 +1,15 @@
 import streamlit as st
 import folium
 from streamlit_folium import st_folium
-import sumolib
 import json
-import os
-import numpy as np
+import math
+import sumo_network
+import map_layers
+import perf
+import point_import
+import point_store
+import snap_memo
+import sumo_stops
 
 # Sayfa konfigürasyonu
 st.set_page_config(page_title="SUMO Ağ Haritası", layout="wide")
@@ -24,46 +29,67 @@ st.markdown("""
 # Başlık
 st.title("🗺️ SUMO Ağ Haritası ve Nokta Seçici")
 
-# SUMO ağ dosyasını yükle (session state'de sakla)
+NET_FILE = "sumo_configs_emek/osm.net.xml.gz"
+# Nokta ve tıklama listelerinde sayfa başına gösterilecek kayıt sayısı
+LIST_PAGE_SIZE = 50
+# Render önbelleğinde tutulacak en fazla katman betiği sayısı (kenar ağı ve nokta katmanları)
+RENDER_CACHE_ENTRIES = 32
+# Kalıcı nokta deposundaki projeler uygulama ve ağ hash'i ile ayrılır
+APP_NAME = "addition-app"
+
+# Bu çalıştırmanın aşama süreleri (kenar çubuğundaki "⏱️ Performans" paneli ve günlük)
+timer = perf.start_rerun(APP_NAME, st.session_state)
+
+# SUMO ağ dosyasını arka planda yükle (süreç başına bir kez başlatılır)
+# İlk çalıştırmada ağ sumolib ile okunup diskte snapshot'a yazılır, sonraki
+# başlatmalarda snapshot'tan yüklenir. Ağ dosyası değişirse hash değişir ve
+# snapshot otomatik olarak yeniden oluşturulur. Yükleme sürerken altlık harita
+# ve başlıktan okunan sınırlar gösterilir; eşleme ağ hazır olunca etkinleşir.
 @st.cache_resource
+def start_network_load(net_digest):
+    return sumo_network.NetworkLoader(NET_FILE)
+
 def load_sumo_network():
+    """Ağ hazırsa döndürür, değilse None (beklemez)"""
+    net_digest = sumo_network.file_sha256(NET_FILE)
+    loader = start_network_load(net_digest)
+    if not loader.done():
+        return None
     try:
-        return sumolib.net.readNet("sumo_configs_emek/osm.net.xml.gz")
+        return loader.result()
     except Exception as e:
+        # Başarısız yükleyici önbellekte kalmasın; sonraki çalıştırma yüklemeyi yeniden dener
+        start_network_load.clear(net_digest)
         st.error(f"SUMO ağ dosyası yüklenemedi: {e}")
-        return None
+        st.stop()
 
 # SUMO ağının sınırlarını hesapla
 @st.cache_data
 def get_network_bounds():
     """SUMO ağının coğrafi sınırlarını hesapla"""
     try:
-        net = load_sumo_network()
-        if net is None:
-            return None
+        # Hızlı yol: sınırları ağ dosyasının başlığındaki <location> elemanından oku,
+        # ağın tamamının yüklenmesini bekleme
+        bounds = sumo_network.header_bounds(NET_FILE)
+        if bounds:
+            return bounds
         
-        all_lats = []
-        all_lons = []
+        # Ağın yüklenmesini bekle
+        net = start_network_load(sumo_network.file_sha256(NET_FILE)).wait()
         
-        # Tüm kenarların koordinatlarını topla
-        for edge in net.getEdges():
-            try:
-                shape = edge.getShape()
-                for coord in shape:
-                    lon, lat = net.convertXY2LonLat(coord[0], coord[1])
-                    all_lats.append(lat)
-                    all_lons.append(lon)
-            except:
-                continue
+        # Başlıkta sınır yoksa tüm kenar noktalarını tek seferde projekte et
+        lonlat = net.edge_shapes_lonlat()
         
-        if all_lats and all_lons:
+        if len(lonlat):
+            min_lon, min_lat = lonlat.min(axis=0)
+            max_lon, max_lat = lonlat.max(axis=0)
             bounds = {
-                'min_lat': min(all_lats),
-                'max_lat': max(all_lats),
-                'min_lon': min(all_lons),
-                'max_lon': max(all_lons),
-                'center_lat': (min(all_lats) + max(all_lats)) / 2,
-                'center_lon': (min(all_lons) + max(all_lons)) / 2
+                'min_lat': float(min_lat),
+                'max_lat': float(max_lat),
+                'min_lon': float(min_lon),
+                'max_lon': float(max_lon),
+                'center_lat': float(min_lat + max_lat) / 2,
+                'center_lon': float(min_lon + max_lon) / 2
             }
             return bounds
         return None
@@ -71,17 +97,107 @@ def get_network_bounds():
         st.error(f"Ağ sınırları hesaplanamadı: {e}")
         return None
 
-# Session state başlatma
-if "selected_points" not in st.session_state:
-    st.session_state.selected_points = []
-if "clicked_history" not in st.session_state:
-    st.session_state.clicked_history = []
+def page_range(total, key):
+    """Uzun listeler için sayfa seçici; gösterilecek indeks aralığını döndürür"""
+    pages = max(1, math.ceil(total / LIST_PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Sayfa (1-{pages})", min_value=1, max_value=pages, value=1, key=key)
+    start = (page - 1) * LIST_PAGE_SIZE
+    return range(start, min(total, start + LIST_PAGE_SIZE))
+
+@st.cache_resource
+def get_point_store():
+    """Süreç genelinde paylaşılan kalıcı nokta deposu"""
+    return point_store.PointStore()
+
+def load_project(project_id, name):
+    """Projenin noktalarını ve tıklama geçmişini depodan oturuma yükle"""
+    store = get_point_store()
+    st.session_state.project_id = project_id
+    st.session_state.project_name = name
+    st.session_state.selected_points = store.load(project_id)
+    st.session_state.clicked_history = store.load(project_id, point_store.CLICK)
+    st.session_state.point_counter = len(st.session_state.selected_points)
+    st.session_state.stop_index = None
+    st.session_state.last_clicked_coords = None
+
+def get_stop_index():
+    """Seçilen noktaların edge başına sıralı konum dizini (duplikat kontrolü için)"""
+    index = st.session_state.get("stop_index")
+    # Liste dizin dışında değiştiyse (ör. oturum geri yüklendi) yeniden kur
+    if index is None or len(index) != len(st.session_state.selected_points):
+        index = sumo_stops.StopIndex((p['edge_id'], p['position']) for p in st.session_state.selected_points)
+        st.session_state.stop_index = index
+    return index
+
+# Nokta listesi yalnızca aşağıdaki fonksiyonlarla değiştirilir; her değişiklik
+# depoya artımlı olarak (yalnızca ilgili satırlar) yazılır
+
+def add_points(points):
+    """Duplikat kontrolünden geçmiş (dizine eklenmiş) noktaları listeye ve depoya ekle"""
+    get_point_store().add(st.session_state.project_id, points)
+    st.session_state.selected_points.extend(points)
+    st.session_state.point_counter += len(points)
+
+def remove_point(i):
+    """i. noktayı listeden, dizinden ve depodan sil"""
+    index = get_stop_index()
+    point = st.session_state.selected_points.pop(i)
+    index.remove(point['edge_id'], point['position'])
+    get_point_store().delete(st.session_state.project_id, [point.get('uid')])
+
+def set_points(points):
+    """Tüm nokta listesini değiştir (temizleme, JSON içe aktarma)"""
+    get_point_store().replace(st.session_state.project_id, points)
+    st.session_state.selected_points = points
+    st.session_state.stop_index = None
+    st.session_state.point_counter = len(points)
+
+def add_click(click):
+    get_point_store().add(st.session_state.project_id, [click], point_store.CLICK)
+    st.session_state.clicked_history.append(click)
+
+def set_clicks(clicks):
+    get_point_store().replace(st.session_state.project_id, clicks, point_store.CLICK)
+    st.session_state.clicked_history = clicks
+
+def clear_click_history():
+    """Tıklama geçmişini temizle
+
+    Harita bileşeni yeniden oluşturulmadığından st_folium son tıklamayı döndürmeye
+    devam eder; bu tıklama, last_clicked_coords sıfırlanmadan önce işlenmiş olarak
+    kaydedilir, yoksa temizlikten hemen sonra geçmişe yeniden eklenir.
+    """
+    st.session_state.handled_click = st.session_state.last_clicked_coords
+    st.session_state.last_clicked_coords = None
+    set_clicks([])
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def is_valid_point(point):
+    """JSON'dan gelen noktanın beklenen alan ve türlere sahip olup olmadığını kontrol et"""
+    return (isinstance(point, dict) and
+            point.get('type') in ('containerStop', 'chargingStation') and
+            isinstance(point.get('edge_id'), str) and
+            isinstance(point.get('lane', ''), str) and
+            all(_is_number(point.get(key)) for key in ('position', 'x', 'y', 'lat', 'lon')))
+
+def is_valid_click(click):
+    """JSON'dan gelen tıklama kaydını kontrol et"""
+    return isinstance(click, dict) and _is_number(click.get('lat')) and _is_number(click.get('lon'))
+
+# Session state başlatma (noktalar ağ yüklendikten sonra projeden yüklenir)
 if "point_counter" not in st.session_state:
     st.session_state.point_counter = 0
 if "map_key" not in st.session_state:
     st.session_state.map_key = 0
 if "last_clicked_coords" not in st.session_state:
     st.session_state.last_clicked_coords = None
+if "handled_click" not in st.session_state:
+    # Eklenen/iptal edilen son tıklama; harita yeniden kurulmadığından st_folium aynı tıklamayı döndürmeye devam eder
+    st.session_state.handled_click = None
 if "map_center" not in st.session_state:
     # Ağ sınırlarını al ve merkezi ayarla
     bounds = get_network_bounds()
@@ -91,14 +207,29 @@ if "map_center" not in st.session_state:
         st.session_state.map_center = [39.7667, 30.5256]
 if "zoom_level" not in st.session_state:
     st.session_state.zoom_level = 16
-
-# Ağ yükleme
-net = load_sumo_network()
-if net is None:
-    st.stop()
-
-# Ağ sınırlarını al
-network_bounds = get_network_bounds()
+if "reported_zoom" not in st.session_state:
+    # Haritanın en son bildirdiği zoom
+    st.session_state.reported_zoom = None
+if "viewport" not in st.session_state:
+    # st_folium'dan gelen son görünür alan (min_lon, min_lat, max_lon, max_lat)
+    st.session_state.viewport = None
+
+# Ağ sınırlarını al (yalnızca dosya başlığı okunur, ağ yüklenmeden önce hazırdır)
+with timer.stage("bounds"):
+    network_bounds = get_network_bounds()
+
+# Ağ yükleme (arka planda; hazır değilse net None'dır)
+with timer.stage("network_load"):
+    net_digest = sumo_network.file_sha256(NET_FILE)
+    net = load_sumo_network()
+
+# Son kullanılan projeyi (yoksa varsayılanı) depodan yükle
+if "project_id" not in st.session_state:
+    projects = get_point_store().list_projects(APP_NAME, net_digest)
+    if projects:
+        load_project(projects[0]['id'], projects[0]['name'])
+    else:
+        load_project(get_point_store().open_project(APP_NAME, net_digest), point_store.DEFAULT_PROJECT)
 
 # Sidebar kontrolleri
 st.sidebar.header("⚙️ Kontroller")
@@ -111,6 +242,26 @@ if network_bounds:
     st.sidebar.write(f"**Boylam:** {network_bounds['min_lon']:.4f} - {network_bounds['max_lon']:.4f}")
     st.sidebar.markdown("---")
 
+# Proje seçimi (noktalar otomatik olarak kaydedilir)
+st.sidebar.subheader("💾 Proje")
+projects = get_point_store().list_projects(APP_NAME, net_digest)
+project_names = [project['name'] for project in projects]
+selected_project = st.sidebar.selectbox(
+    "Proje",
+    project_names,
+    index=project_names.index(st.session_state.project_name) if st.session_state.project_name in project_names else 0,
+    format_func=lambda name: f"{name} ({next(p['points'] for p in projects if p['name'] == name)} nokta)"
+)
+if selected_project != st.session_state.project_name:
+    load_project(next(p['id'] for p in projects if p['name'] == selected_project), selected_project)
+    st.rerun()
+
+new_project = st.sidebar.text_input("Yeni proje adı")
+if st.sidebar.button("➕ Proje Oluştur", disabled=not new_project.strip()):
+    load_project(get_point_store().open_project(APP_NAME, net_digest, new_project.strip()), new_project.strip())
+    st.rerun()
+st.sidebar.markdown("---")
+
 # Harita yenileme butonu
 if st.sidebar.button("🔄 Haritayı Yenile"):
     st.session_state.map_key += 1
@@ -118,16 +269,12 @@ if st.sidebar.button("🔄 Haritayı Yenile"):
 
 # Seçilen noktaları temizle
 if st.sidebar.button("🗑️ Tüm Noktaları Temizle"):
-    st.session_state.selected_points = []
-    st.session_state.point_counter = 0
-    st.session_state.map_key += 1
+    set_points([])
     st.rerun()
 
 # Tıklama geçmişini temizle
 if st.sidebar.button("🧹 Tıklama Geçmişini Temizle"):
-    st.session_state.clicked_history = []
-    st.session_state.last_clicked_coords = None
-    st.session_state.map_key += 1
+    clear_click_history()
     st.rerun()
 
 # Nokta türü seçimi
@@ -136,11 +283,14 @@ point_type = st.sidebar.selectbox(
     ["containerStop", "chargingStation"],
     key="point_type"
 )
+# Durak, türünün araç sınıfına (containerStop: truck, chargingStation: evehicle) izin veren şeride eşlenir
+stop_vclass = sumo_network.STOP_VEHICLE_CLASSES.get(point_type)
 
 # Zoom kontrolü
 new_zoom = st.sidebar.slider("🔍 Zoom Seviyesi", min_value=12, max_value=18, value=st.session_state.zoom_level)
 if new_zoom != st.session_state.zoom_level:
     st.session_state.zoom_level = new_zoom
+    st.session_state.viewport = None
     st.session_state.map_key += 1
     st.rerun()
 
@@ -164,100 +314,82 @@ if st.session_state.clicked_history:
     st.sidebar.subheader("🎯 Tıklama Geçmişi")
     st.sidebar.metric("Toplam Tıklama", len(st.session_state.clicked_history))
 
-# Harita oluşturma fonksiyonu - cache'li
-@st.cache_data
-def get_sumo_edges():
-    """SUMO kenarlarını cache'le"""
-    edges_data = []
-    for edge in net.getEdges():
-        try:
-            shape = edge.getShape()
-            if len(shape) > 1:
-                coords = []
-                for coord in shape:
-                    lat, lon = net.convertXY2LonLat(coord[0], coord[1])
-                    coords.append([lat, lon])
-                if coords:
-                    edges_data.append({
-                        'id': edge.getID(),
-                        'coords': coords
-                    })
-        except Exception:
-            continue
-    return edges_data
-
-# Harita oluşturma fonksiyonu - Seçilen noktaları ekle
-@st.cache_data
-def create_map_with_points():
-    m = folium.Map(
-        location=st.session_state.map_center, 
-        zoom_start=st.session_state.zoom_level,
-        tiles="OpenStreetMap",
-        prefer_canvas=True  # Performans için
-    )
-
-    # Harita sınırlarını kısıtla
-    if restrict_bounds and network_bounds:
-        # Ağ sınırlarının dışına çıkılmasını engelle
-        bounds = [
-            [network_bounds['min_lat'] - 0.005, network_bounds['min_lon'] - 0.005],  # SW
-            [network_bounds['max_lat'] + 0.005, network_bounds['max_lon'] + 0.005]   # NE
-        ]
-        m.fit_bounds(bounds)
-        
-        # Sınır çizgisi çiz
-        folium.Rectangle(
-            bounds=bounds,
-            color='red',
-            fill=False,
-            weight=2,
-            opacity=0.8,
-            popup="SUMO Ağ Sınırları"
-        ).add_to(m)
+# Kenar geometrisi: tek düz lon/lat dizisi + offsetler + ID tablosu (CSR düzeni).
+# Kaynak olarak cache'lenir; her çalıştırmada pickle'lanıp kopyalanmaz.
+@st.cache_resource(max_entries=len(map_layers.LOD_LEVELS) * 2)
+def get_sumo_edges(net_digest, tolerance=0.0, min_length=0.0):
+    """SUMO kenarlarının (isteğe bağlı olarak sadeleştirilmiş) geometrisi"""
+    return net.edge_geometry(tolerance, min_length)
+
+# Kenar ağı tek bir GeoJSON katmanı olarak (ağ hash'i ve detay seviyesi ile cache'li, kopyalanmaz)
+@st.cache_resource(max_entries=len(map_layers.LOD_LEVELS) * 2)
+def get_edges_geojson(net_digest, tolerance, min_length):
+    """SUMO kenarlarını tek bir GeoJSON FeatureCollection olarak hazırla"""
+    return map_layers.edges_to_geojson(get_sumo_edges(net_digest, tolerance, min_length))
+
+def get_render_region():
+    """Haritada çizilecek bölge: görünür alan (bilinmiyorsa tahmini) + kenar payı"""
+    viewport = st.session_state.viewport
+    if viewport is None and restrict_bounds and network_bounds:
+        # Harita ağ sınırlarına sığdırılacak (fit_bounds)
+        viewport = (network_bounds['min_lon'], network_bounds['min_lat'],
+                    network_bounds['max_lon'], network_bounds['max_lat'])
+    elif viewport is None:
+        viewport = map_layers.estimate_viewport(st.session_state.map_center, st.session_state.zoom_level)
+    return map_layers.expand_viewport(viewport)
+
+def get_fit_bounds():
+    """Haritanın sığdırılacağı ağ sınırları (küçük bir payla); sınırlandırma kapalıysa None"""
+    if not (restrict_bounds and network_bounds):
+        return None
+    return [
+        [network_bounds['min_lat'] - 0.005, network_bounds['min_lon'] - 0.005],  # SW
+        [network_bounds['max_lat'] + 0.005, network_bounds['max_lon'] + 0.005]   # NE
+    ]
+
+def get_render_zoom(fit_to_network):
+    """Kenar detayının seçildiği zoom: harita ağa sığdırılıyorsa fit_bounds'un vereceği zoom"""
+    bounds = get_fit_bounds()
+    if fit_to_network and bounds:
+        (min_lat, min_lon), (max_lat, max_lon) = bounds
+        return map_layers.zoom_for_bounds((min_lon, min_lat, max_lon, max_lat))
+    return st.session_state.zoom_level
+
+def add_network_layer(m, region, render_zoom):
+    """Kenar ağının yalnızca bölgeyle kesişen kısmını, zoom seviyesine uygun detayla haritaya ekle"""
+    tolerance, min_length = map_layers.lod_for_zoom(render_zoom)
+    with timer.stage("edges"):
+        edges_geojson = get_edges_geojson(net.digest, tolerance, min_length)
     
-    # SUMO kenarlarını haritaya ekle
-    edges_data = get_sumo_edges()
-    for edge_data in edges_data:
-        folium.PolyLine(
-            edge_data['coords'], 
-            color="blue", 
-            weight=1.5,
-            opacity=0.6,
-            popup=f"Edge ID: {edge_data['id']}"
-        ).add_to(m)
+    # Uzamsal indeksten görünür kenarları sorgula
+    visible = net.edges_in_lonlat_bbox(*region)
+    map_layers.add_edge_layer(m, map_layers.subset_geojson(edges_geojson, net.edge_ids[visible].tolist()))
 
-    # Seçilen noktaları haritaya ekle
-    for i, point in enumerate(st.session_state.selected_points):
-        lat, lon = net.convertXY2LonLat(point['x'], point['y'])
-        color = "red" if point['type'] == "containerStop" else "green"
-        icon = "truck" if point['type'] == "containerStop" else "bolt"
-
-        folium.Marker(
-            [lat, lon],
-            popup=f"{point['type']} #{i+1}: Edge ID: {point['edge_id']}, Position: {point['position']:.2f}",
-            tooltip=f"{point['type']} #{i+1}",
-            icon=folium.Icon(color=color, icon=icon, prefix='fa')
-        ).add_to(m)
+# Harita ve nokta katmanları için içerik anahtarlı render önbelleği (süreç genelinde paylaşılır)
+@st.cache_resource
+def get_render_cache():
+    return map_layers.RenderCache(max_entries=RENDER_CACHE_ENTRIES)
 
-    return m
+def cached_layer(key, add_layers):
+    """Katmanın önceden üretilmiş betiği; önbellekte yoksa add_layers(parent) ile bir kez üretilir"""
+    return render_cache.get_or_build(key, lambda: map_layers.prerender(add_layers))
 
-def create_map():
-    # Harita merkezi ve zoom seviyesi
+# Statik harita: altlık, ağ sınırları ve kenar ağı (noktalar ayrı katmanlarda gönderilir).
+# Harita her çalıştırmada yeniden kurulur (ucuzdur); kenar ağı önbellekteki betikten eklenir.
+def create_base_map(center, zoom, fit_to_network, edge_layer):
     m = folium.Map(
-        location=st.session_state.map_center, 
-        zoom_start=st.session_state.zoom_level,
+        location=center, 
+        zoom_start=zoom,
         tiles="OpenStreetMap",
         prefer_canvas=True  # Performans için
     )
-    
+
     # Harita sınırlarını kısıtla
-    if restrict_bounds and network_bounds:
+    bounds = get_fit_bounds()
+    if bounds:
         # Ağ sınırlarının dışına çıkılmasını engelle
-        bounds = [
-            [network_bounds['min_lat'] - 0.005, network_bounds['min_lon'] - 0.005],  # SW
-            [network_bounds['max_lat'] + 0.005, network_bounds['max_lon'] + 0.005]   # NE
-        ]
-        m.fit_bounds(bounds)
+        if fit_to_network:
+            m.fit_bounds(bounds)
         
         # Sınır çizgisi çiz
         folium.Rectangle(
@@ -269,23 +401,28 @@ def create_map():
             popup="SUMO Ağ Sınırları"
         ).add_to(m)
     
-    # SUMO kenarlarını cache'den al
-    edges_data = get_sumo_edges()
+    # SUMO kenarlarını ekle (ağ henüz yükleniyorsa yalnızca altlık)
+    if edge_layer is not None:
+        map_layers.PrerenderedLayer(edge_layer).add_to(m)
     
-    # Kenarları haritaya ekle
-    for edge_data in edges_data:
-        folium.PolyLine(
-            edge_data['coords'], 
-            color="blue", 
-            weight=1.5,
-            opacity=0.6,
-            popup=f"Edge ID: {edge_data['id']}"
-        ).add_to(m)
+    return m
+
+def add_points_layer(layer, selected_points):
+    """Seçilen noktaları katmana ekle (harita yeniden kurulmadan güncellenir)"""
+    # Çok sayıda nokta: kümelenmiş, canvas üzerinde çizilen katman (popup'lar tarayıcıda üretilir)
+    if len(selected_points) > map_layers.CLUSTER_THRESHOLD:
+        rows = [
+            [point['lat'], point['lon'],
+             "red" if point['type'] == "containerStop" else "green",
+             f"{'🚚' if point['type'] == 'containerStop' else '⚡'} {point['type']} #{i+1}",
+             point['edge_id'], f"{point['position']:.2f}m", f"({point['x']:.1f}, {point['y']:.1f})"]
+            for i, point in enumerate(selected_points)
+        ]
+        return map_layers.add_point_cluster(layer, rows, ["Edge", "Position", "Koordinat"])
     
-    # Seçilen noktaları haritaya ekle
-    for i, point in enumerate(st.session_state.selected_points):
+    for i, point in enumerate(selected_points):
         try:
-            lat, lon = net.convertXY2LonLat(point['x'], point['y'])
+            lat, lon = point['lat'], point['lon']
             
             # Nokta türüne göre renk ve ikon
             if point['type'] == "containerStop":
@@ -319,7 +456,7 @@ def create_map():
                     icon=icon,
                     prefix='fa'
                 )
-            ).add_to(m)
+            ).add_to(layer)
             
             # Etki alanı çemberi
             folium.Circle(
@@ -331,61 +468,76 @@ def create_map():
                 fillOpacity=0.2,
                 weight=2,
                 opacity=0.8
-            ).add_to(m)
+            ).add_to(layer)
             
         except Exception as e:
             continue
     
-    # Tüm tıklanan noktaları göster
-    for i, clicked_point in enumerate(st.session_state.clicked_history):
-        # Son tıklanan farklı renkte
-        if i == len(st.session_state.clicked_history) - 1:
-            color = 'orange'
-            icon = 'crosshairs'
-            tooltip = f"🎯 Son Tıklanan (#{i+1})"
-        else:
-            color = 'purple'
-            icon = 'circle'
-            tooltip = f"📍 Tıklama #{i+1}"
+    return layer
+
+def add_clicks_layer(layer, clicked_history):
+    """Tıklama geçmişini katmana ekle (harita yeniden kurulmadan güncellenir)"""
+    if len(clicked_history) > map_layers.CLUSTER_THRESHOLD:
+        rows = [
+            [click['lat'], click['lon'],
+             'orange' if i == len(clicked_history) - 1 else 'purple',
+             f"🎯 Son Tıklanan (#{i+1})" if i == len(clicked_history) - 1 else f"📍 Tıklama #{i+1}",
+             f"({click['lat']:.6f}, {click['lon']:.6f})", click.get('timestamp', 'N/A')]
+            for i, click in enumerate(clicked_history)
+        ]
+        map_layers.add_point_cluster(layer, rows, ["Koordinat", "Zaman"])
+    else:
+        # Tüm tıklanan noktaları göster
+        for i, clicked_point in enumerate(clicked_history):
+            # Son tıklanan farklı renkte
+            if i == len(clicked_history) - 1:
+                color = 'orange'
+                icon = 'crosshairs'
+                tooltip = f"🎯 Son Tıklanan (#{i+1})"
+            else:
+                color = 'purple'
+                icon = 'circle'
+                tooltip = f"📍 Tıklama #{i+1}"
         
-        folium.Marker(
-            [clicked_point['lat'], clicked_point['lon']],
-            popup=folium.Popup(
-                f"""
-                <div style="width: 200px; font-family: Arial;">
-                    <h4 style="margin: 0; color: {color};">
-                        {tooltip}
-                    </h4>
-                    <hr style="margin: 5px 0;">
-                    <p style="margin: 2px 0;"><b>Koordinat:</b> ({clicked_point['lat']:.6f}, {clicked_point['lon']:.6f})</p>
-                    <p style="margin: 2px 0;"><b>Zaman:</b> {clicked_point.get('timestamp', 'N/A')}</p>
-                </div>
-                """,
-                max_width=250
-            ),
-            tooltip=tooltip,
-            icon=folium.Icon(
-                color=color, 
-                icon=icon,
-                prefix='fa'
-            )
-        ).add_to(m)
+            folium.Marker(
+                [clicked_point['lat'], clicked_point['lon']],
+                popup=folium.Popup(
+                    f"""
+                    <div style="width: 200px; font-family: Arial;">
+                        <h4 style="margin: 0; color: {color};">
+                            {tooltip}
+                        </h4>
+                        <hr style="margin: 5px 0;">
+                        <p style="margin: 2px 0;"><b>Koordinat:</b> ({clicked_point['lat']:.6f}, {clicked_point['lon']:.6f})</p>
+                        <p style="margin: 2px 0;"><b>Zaman:</b> {clicked_point.get('timestamp', 'N/A')}</p>
+                    </div>
+                    """,
+                    max_width=250
+                ),
+                tooltip=tooltip,
+                icon=folium.Icon(
+                    color=color, 
+                    icon=icon,
+                    prefix='fa'
+                )
+            ).add_to(layer)
         
-        # Tıklama sırası için küçük çember
-        folium.Circle(
-            [clicked_point['lat'], clicked_point['lon']],
-            radius=8,
-            color=color,
-            fill=True,
-            fillColor=color,
-            fillOpacity=0.3,
-            weight=1,
-            opacity=0.6
-        ).add_to(m)
+            # Tıklama sırası için küçük çember
+            folium.Circle(
+                [clicked_point['lat'], clicked_point['lon']],
+                radius=8,
+                color=color,
+                fill=True,
+                fillColor=color,
+                fillOpacity=0.3,
+                weight=1,
+                opacity=0.6
+            ).add_to(layer)
+    
     
     # Tıklama geçmişini çizgi ile bağla
-    if len(st.session_state.clicked_history) > 1:
-        coords = [[point['lat'], point['lon']] for point in st.session_state.clicked_history]
+    if len(clicked_history) > 1:
+        coords = [[point['lat'], point['lon']] for point in clicked_history]
         folium.PolyLine(
             coords,
             color='purple',
@@ -393,9 +545,9 @@ def create_map():
             opacity=0.5,
             dash_array='5, 5',
             popup="Tıklama Geçmişi Rotası"
-        ).add_to(m)
+        ).add_to(layer)
     
-    return m
+    return layer
 
 # Ana harita gösterimi
 st.subheader("🗺️ SUMO Ağ Haritası")
@@ -404,18 +556,88 @@ if restrict_bounds and network_bounds:
 else:
     st.info("💡 Mavi çizgiler üzerine tıklayarak nokta ekleyebilirsiniz. Tıklama geçmişi mor işaretlerle gösterilir.")
 
-# Haritayı oluştur
-map_obj = create_map_with_points()
-
-# Haritayı tam ekran boyutunda göster
-map_data = st_folium(
-    map_obj,
-    key=f"map_{st.session_state.map_key}",
-    width="100%",
-    height=600,
-    returned_objects=["last_clicked", "last_object_clicked"],
-    use_container_width=True
-)
+# Ağ arka planda yükleniyorsa ilerlemeyi göster; bitince sayfa ağla birlikte yeniden çalışır
+if net is None:
+    @st.fragment(run_every=0.5)
+    def network_progress():
+        loader = start_network_load(net_digest)
+        if loader.done():
+            st.rerun()
+        st.progress(loader.fraction, text=f"⏳ {loader.message}... Eşleme ağ hazır olduğunda etkinleşir.")
+    network_progress()
+
+# Statik haritayı oluştur (yalnızca görünür bölgedeki kenarlarla); noktalar ve tıklamalar
+# ayrı katmanlar olarak gönderilir, böylece nokta eklemek ağı yeniden aktarmaz
+render_region = get_render_region()
+render_cache = get_render_cache()
+fit_to_network = st.session_state.viewport is None
+# Kenar detayı bu zoom'a göre seçilir (ağa sığdırılan ilk görünümde fit_bounds'un zoom'u)
+render_zoom = get_render_zoom(fit_to_network)
+# Kenar katmanının anahtarı; ağın içerik hash'i, bölge ve detay seviyesinden üretilir
+edge_key = map_layers.content_key("edges", net_digest, render_region, map_layers.lod_for_zoom(render_zoom))
+with timer.stage("base_map"):
+    edge_layer = None
+    if net is not None:
+        edge_layer = cached_layer(edge_key, lambda parent: add_network_layer(parent, render_region, render_zoom))
+    map_obj = create_base_map(
+        st.session_state.map_center,
+        st.session_state.zoom_level,
+        fit_to_network,
+        edge_layer
+    )
+with timer.stage("point_layers"):
+    points_layer = folium.FeatureGroup(name="Seçilen Noktalar")
+    map_layers.PrerenderedLayer(cached_layer(
+        map_layers.content_key("points", st.session_state.selected_points),
+        lambda parent: add_points_layer(parent, st.session_state.selected_points)
+    )).add_to(points_layer)
+    clicks_layer = folium.FeatureGroup(name="Tıklama Geçmişi")
+    map_layers.PrerenderedLayer(cached_layer(
+        map_layers.content_key("clicks", st.session_state.clicked_history),
+        lambda parent: add_clicks_layer(parent, st.session_state.clicked_history)
+    )).add_to(clicks_layer)
+    point_layers = [points_layer, clicks_layer]
+
+with st.sidebar.expander("🧠 Eşleme Önbelleği"):
+    snap_stats = snap_memo.snap_memo.stats()
+    st.write(f"**İsabet (bellek / disk):** {snap_stats['memory_hits']} / {snap_stats['disk_hits']}")
+    st.write(f"**Iska:** {snap_stats['misses']} (isabet oranı %{snap_stats['hit_rate'] * 100:.0f})")
+
+with st.sidebar.expander("🗄️ Render Önbelleği"):
+    cache_stats = render_cache.stats()
+    st.write(f"**İsabet / Iska:** {cache_stats['hits']} / {cache_stats['misses']} "
+             f"(%{cache_stats['hit_rate'] * 100:.0f})")
+    st.write(f"**Kayıt:** {cache_stats['entries']} / {RENDER_CACHE_ENTRIES} "
+             f"({cache_stats['bytes'] / 1024 / 1024:.1f} MB)")
+
+# Haritayı tam ekran boyutunda göster (HTML üretimi ve bileşene aktarım)
+with timer.stage("st_folium"):
+    map_data = st_folium(
+        map_obj,
+        key=f"map_{st.session_state.map_key}",
+        feature_group_to_add=point_layers,
+        width="100%",
+        height=600,
+        returned_objects=["last_clicked", "last_object_clicked", "bounds", "zoom", "center"],
+        use_container_width=True
+    )
+
+# Görünür alan çizilen bölgenin dışına taştıysa (kaydırma/zoom) veya zoom farklı bir kenar
+# detay seviyesine geçtiyse haritayı yeni görünüm için yenile
+if map_data:
+    viewport = map_layers.viewport_from_bounds(map_data.get("bounds"))
+    # Yalnızca kullanıcı haritada zoom yaptıysa (bileşen bir önceki değeri döndürebilir; ör. kaydırıcıdan sonra)
+    reported_zoom = map_data.get("zoom")
+    zoomed = reported_zoom is not None and reported_zoom != st.session_state.reported_zoom
+    st.session_state.reported_zoom = reported_zoom
+    lod_changed = zoomed and map_layers.lod_for_zoom(int(reported_zoom)) != map_layers.lod_for_zoom(render_zoom)
+    if viewport and (lod_changed or not map_layers.viewport_contains(render_region, viewport)):
+        st.session_state.viewport = viewport
+        if map_data.get("center"):
+            st.session_state.map_center = [map_data["center"]["lat"], map_data["center"]["lng"]]
+        if map_data.get("zoom"):
+            st.session_state.zoom_level = min(max(int(map_data["zoom"]), 12), 18)
+        st.rerun()
 
 # Seçilen noktaları göster
 st.subheader("📍 Seçilen Noktalar")
@@ -424,7 +646,8 @@ col1, col2 = st.columns([2, 1])
 
 with col1:
     if st.session_state.selected_points:
-        for i, point in enumerate(st.session_state.selected_points):
+        for i in page_range(len(st.session_state.selected_points), "points_page"):
+            point = st.session_state.selected_points[i]
             with st.expander(f"{'🚚' if point['type'] == 'containerStop' else '⚡'} {point['type']} #{i+1}", expanded=False):
                 col_a, col_b = st.columns(2)
                 with col_a:
@@ -435,8 +658,7 @@ with col1:
                     st.write(f"**Y:** {point['y']:.2f}")
                 
                 if st.button(f"🗑️ Sil", key=f"delete_{i}"):
-                    st.session_state.selected_points.pop(i)
-                    st.session_state.map_key += 1
+                    remove_point(i)
                     st.rerun()
     else:
         st.info("Henüz nokta seçilmedi. Harita üzerine tıklayarak nokta ekleyebilirsiniz.")
@@ -447,14 +669,14 @@ with col2:
     
     if st.button("🎯 Son Noktayı Sil", disabled=len(st.session_state.selected_points) == 0):
         if st.session_state.selected_points:
-            st.session_state.selected_points.pop()
-            st.session_state.map_key += 1
+            remove_point(-1)
             st.rerun()
     
     if st.button("📍 Ağ Merkezine Git"):
         if network_bounds:
             st.session_state.map_center = [network_bounds['center_lat'], network_bounds['center_lon']]
             st.session_state.zoom_level = 16
+            st.session_state.viewport = None
             st.session_state.map_key += 1
             st.rerun()
         else:
@@ -464,11 +686,15 @@ with col2:
         if network_bounds:
             st.session_state.map_center = [network_bounds['center_lat'], network_bounds['center_lon']]
             st.session_state.zoom_level = 14
+            st.session_state.viewport = None
             st.session_state.map_key += 1
             st.rerun()
 
-# Tıklama kontrolü
-if map_data and "last_clicked" in map_data and map_data["last_clicked"]:
+# Tıklama kontrolü (ağ yüklenirken tıklama bekletilir, ağ hazır olunca işlenir)
+if net is None and map_data and map_data.get("last_clicked"):
+    st.info("⏳ Ağ yükleniyor; tıklanan nokta ağ hazır olduğunda eşlenecek.")
+elif (map_data and "last_clicked" in map_data and map_data["last_clicked"] and
+        [map_data["last_clicked"]["lat"], map_data["last_clicked"]["lng"]] != st.session_state.handled_click):
     clicked_lat = map_data["last_clicked"]["lat"]
     clicked_lon = map_data["last_clicked"]["lng"]
     
@@ -484,7 +710,7 @@ if map_data and "last_clicked" in map_data and map_data["last_clicked"]:
     if (not st.session_state.clicked_history or 
         abs(st.session_state.clicked_history[-1]['lat'] - clicked_lat) > 0.00001 or
         abs(st.session_state.clicked_history[-1]['lon'] - clicked_lon) > 0.00001):
-        st.session_state.clicked_history.append(click_info)
+        add_click(click_info)
         st.session_state.last_clicked_coords = [clicked_lat, clicked_lon]
     
     # Tıklama bilgilerini göster
@@ -502,16 +728,17 @@ if map_data and "last_clicked" in map_data and map_data["last_clicked"]:
         # Folium koordinatlarını SUMO koordinatlarına çevir
         x, y = net.convertLonLat2XY(clicked_lon, clicked_lat)
         
-        # En yakın kenarı bul
-        edges = net.getNeighboringEdges(x, y, 100)  # 100 metre yarıçap
+        # Nokta türünün araç sınıfına izin veren en yakın şerit; aynı koordinat
+        # daha önce eşlendiyse kalıcı önbellekten gelir
+        with timer.stage("snap"):
+            lane = snap_memo.snap_memo.nearest_lane(net, clicked_lon, clicked_lat, stop_vclass)
         
-        if edges:
-            closest_edge = edges[0][0]
-            edge_id = closest_edge.getID()
-            distance = edges[0][1]
+        if lane:
+            edge_id = lane['edge_id']
+            distance = lane['distance']
             
-            # Kenardaki en yakın pozisyonu hesapla
-            closest_pos = closest_edge.getClosestLanePosDist((x, y))[1]
+            # Şerit üzerindeki en yakın pozisyon
+            closest_pos = lane['pos']
             
             # Bilgileri göster
             col1, col2, col3 = st.columns([1, 1, 1])
@@ -526,6 +753,7 @@ if map_data and "last_clicked" in map_data and map_data["last_clicked"]:
             new_point = {
                 "type": point_type,
                 "edge_id": edge_id,
+                "lane": lane['lane_id'],
                 "position": closest_pos,
                 "x": x,
                 "y": y,
@@ -533,22 +761,17 @@ if map_data and "last_clicked" in map_data and map_data["last_clicked"]:
                 "lon": clicked_lon
             }
             
-            # Duplikat kontrolü
-            duplicate = False
-            for existing_point in st.session_state.selected_points:
-                if (existing_point["edge_id"] == edge_id and 
-                    abs(existing_point["position"] - closest_pos) < 10):
-                    duplicate = True
-                    break
+            # Duplikat kontrolü (aynı edge üzerinde 10 m içinde durak var mı)
+            duplicate = get_stop_index().has_near(edge_id, closest_pos)
             
             # Ekleme butonu
             col1, col2 = st.columns([1, 1])
             with col1:
                 if not duplicate:
                     if st.button(f"➕ **{point_type}** Ekle", key=f"add_point_{st.session_state.map_key}", type="primary"):
-                        st.session_state.selected_points.append(new_point)
-                        st.session_state.point_counter += 1
-                        st.session_state.map_key += 1
+                        get_stop_index().add(edge_id, closest_pos)
+                        add_points([new_point])
+                        st.session_state.handled_click = [clicked_lat, clicked_lon]
                         st.success(f"✅ {point_type} başarıyla eklendi!")
                         st.rerun()
                 else:
@@ -557,7 +780,7 @@ if map_data and "last_clicked" in map_data and map_data["last_clicked"]:
             with col2:
                 if st.button("❌ İptal Et", key=f"cancel_{st.session_state.map_key}"):
                     st.session_state.last_clicked_coords = None
-                    st.session_state.map_key += 1
+                    st.session_state.handled_click = [clicked_lat, clicked_lon]
                     st.rerun()
         else:
             st.error("❌ **Bu konumda SUMO ağı bulunamadı.** Lütfen mavi çizgiler üzerine tıklayın.")
@@ -572,16 +795,15 @@ if st.session_state.clicked_history:
     
     col1, col2 = st.columns([3, 1])
     with col1:
-        for i, click in enumerate(st.session_state.clicked_history):
+        for i in page_range(len(st.session_state.clicked_history), "clicks_page"):
+            click = st.session_state.clicked_history[i]
             is_last = i == len(st.session_state.clicked_history) - 1
             icon = "🎯" if is_last else "📍"
             st.write(f"{icon} **#{i+1}** - {click['lat']:.6f}, {click['lon']:.6f} - {click['timestamp']}")
     
     with col2:
         if st.button("🗑️ Geçmişi Temizle"):
-            st.session_state.clicked_history = []
-            st.session_state.last_clicked_coords = None
-            st.session_state.map_key += 1
+            clear_click_history()
             st.rerun()
 
 # Alternatif: Manuel koordinat girişi
@@ -598,19 +820,20 @@ with manual_col2:
     manual_lon = st.number_input("Longitude", value=default_lon, format="%.6f")
     
 with manual_col3:
-    if st.button("📍 Bu Koordinata Nokta Ekle"):
+    if st.button("📍 Bu Koordinata Nokta Ekle", disabled=net is None):
         try:
             x, y = net.convertLonLat2XY(manual_lon, manual_lat)
-            edges = net.getNeighboringEdges(x, y, 100)
+            with timer.stage("snap"):
+                lane = snap_memo.snap_memo.nearest_lane(net, manual_lon, manual_lat, stop_vclass)
             
-            if edges:
-                closest_edge = edges[0][0]
-                edge_id = closest_edge.getID()
-                closest_pos = closest_edge.getClosestLanePosDist((x, y))[1]
+            if lane:
+                edge_id = lane['edge_id']
+                closest_pos = lane['pos']
                 
                 new_point = {
                     "type": point_type,
                     "edge_id": edge_id,
+                    "lane": lane['lane_id'],
                     "position": closest_pos,
                     "x": x,
                     "y": y,
@@ -618,15 +841,69 @@ with manual_col3:
                     "lon": manual_lon
                 }
                 
-                st.session_state.selected_points.append(new_point)
-                st.session_state.map_key += 1
-                st.success(f"✅ {point_type} eklendi!")
-                st.rerun()
+                if get_stop_index().has_near(edge_id, closest_pos):
+                    st.warning("⚠️ Bu konuma zaten bir nokta eklenmiş!")
+                else:
+                    get_stop_index().add(edge_id, closest_pos)
+                    add_points([new_point])
+                    st.success(f"✅ {point_type} eklendi!")
+                    st.rerun()
             else:
                 st.error("❌ Bu konumda SUMO ağı bulunamadı.")
         except Exception as e:
             st.error(f"❌ Hata: {e}")
 
+# Toplu nokta içe aktarma
+st.markdown("---")
+st.subheader("📥 Toplu Nokta İçe Aktar")
+st.caption("CSV (`lat`, `lon`, isteğe bağlı `type`, `name` kolonları), GeoJSON (Point) veya NDJSON dosyası. "
+           "Noktalar parçalar halinde okunup toplu olarak en yakın şeritlere eşlenir; ağ sınırları dışındakiler reddedilir.")
+
+bulk_file = st.file_uploader("Aday nokta dosyası", type=point_import.SUPPORTED_EXTENSIONS, key="bulk_file")
+if bulk_file is not None and st.button("📥 Noktaları İçe Aktar", disabled=net is None):
+    progress = st.progress(0.0, text="Noktalar eşleniyor...")
+    
+    def on_progress(fraction, count):
+        progress.progress(fraction or 0.0, text=f"{count} nokta işlendi")
+    
+    try:
+        with timer.stage("bulk_import"):
+            results, stats = point_import.bulk_import(
+                bulk_file, bulk_file.name, net,
+                bounds=network_bounds,
+                default_type=point_type,
+                total_bytes=bulk_file.size,
+                on_progress=on_progress
+            )
+        new_points = [{
+            "type": result['type'],
+            "edge_id": result['edge_id'],
+            "lane": result['lane'],
+            "position": result['pos'],
+            "x": result['x'],
+            "y": result['y'],
+            "lat": result['lat'],
+            "lon": result['lon']
+        } for result in results]
+        # Mevcut noktalara (ve dosyadaki öncekilere) 10 m'den yakın olanları atla
+        unique_points = sumo_stops.add_unique(get_stop_index(), new_points, "edge_id", "position")
+        stats['duplicates'] = len(new_points) - len(unique_points)
+        stats['imported'] = len(unique_points)
+        
+        # Tüm noktaları tek seferde ekle
+        add_points(unique_points)
+        st.session_state.bulk_import_stats = stats
+        st.rerun()
+    except Exception as e:
+        st.error(f"❌ Toplu içe aktarma hatası: {e}")
+
+if st.session_state.get("bulk_import_stats"):
+    stats = st.session_state.bulk_import_stats
+    st.success(f"✅ {stats['imported']} / {stats['total']} nokta eklendi")
+    if stats['invalid'] or stats['out_of_bounds'] or stats['unsnapped'] or stats.get('duplicates'):
+        st.warning(f"⚠️ Geçersiz satır: {stats['invalid']}, ağ sınırları dışında: {stats['out_of_bounds']}, "
+                   f"eşlenemeyen: {stats['unsnapped']}, duplikat: {stats.get('duplicates', 0)}")
+
 # Alt kısım - Dosya oluşturma
 st.markdown("---")
 st.subheader("📁 Dosya Oluşturma")
@@ -634,21 +911,15 @@ st.subheader("📁 Dosya Oluşturma")
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    if st.button("💾 cs.add.xml Oluştur", disabled=len(st.session_state.selected_points) == 0):
+    compress_output = st.checkbox("gzip ile sıkıştır (.gz)", value=False)
+    output_name = "cs.add.xml.gz" if compress_output else "cs.add.xml"
+    if st.button(f"💾 {output_name} Oluştur", disabled=len(st.session_state.selected_points) == 0):
         try:
-            with open("cs.add.xml", "w", encoding="utf-8") as f:
-                f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-                f.write('<additional xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:noNamespaceSchemaLocation="http://sumo.dlr.de/xsd/additional_file.xsd">\n')
-                
-                for i, point in enumerate(st.session_state.selected_points, start=1):
-                    if point['type'] == 'containerStop':
-                        f.write(f'    <containerStop id="cs_{i}" lane="{point["edge_id"]}_0" startPos="{point["position"]:.2f}" endPos="{point["position"] + 5:.2f}"/>\n')
-                    elif point['type'] == 'chargingStation':
-                        f.write(f'    <chargingStation id="cs_{i}" lane="{point["edge_id"]}_0" startPos="{point["position"]:.2f}" endPos="{point["position"] + 5:.2f}" power="50000"/>\n')
-                
-                f.write('</additional>\n')
+            # Noktalar dosyaya tek tek yazılır; belge bellekte kurulmaz
+            with timer.stage("xml_export"), sumo_stops.open_output(output_name) as f:
+                sumo_stops.write_cs_add_xml(f, st.session_state.selected_points)
             
-            st.success("✅ cs.add.xml dosyası başarıyla oluşturuldu!")
+            st.success(f"✅ {output_name} dosyası başarıyla oluşturuldu!")
             
         except Exception as e:
             st.error(f"❌ Dosya oluşturma hatası: {e}")
@@ -669,14 +940,26 @@ with col2:
 
 with col3:
     uploaded_file = st.file_uploader("📁 JSON İçe Aktar", type="json")
-    if uploaded_file is not None:
+    # Aynı dosya seçili kaldıkça her yeniden çalıştırmada tekrar yüklenmesin
+    if uploaded_file is not None and st.session_state.get("imported_json_id") != uploaded_file.file_id:
         try:
             data = json.load(uploaded_file)
+            if not isinstance(data, dict):
+                raise ValueError("Beklenen biçim: selected_points / clicked_history alanlarını içeren bir nesne")
+            skipped = 0
             if "selected_points" in data:
-                st.session_state.selected_points = data["selected_points"]
+                points = data["selected_points"] if isinstance(data["selected_points"], list) else []
+                valid_points = [p for p in points if is_valid_point(p)]
+                skipped += len(points) - len(valid_points)
+                set_points(valid_points)
             if "clicked_history" in data:
-                st.session_state.clicked_history = data["clicked_history"]
-            st.session_state.map_key += 1
+                clicks = data["clicked_history"] if isinstance(data["clicked_history"], list) else []
+                valid_clicks = [c for c in clicks if is_valid_click(c)]
+                skipped += len(clicks) - len(valid_clicks)
+                set_clicks(valid_clicks)
+            st.session_state.imported_json_id = uploaded_file.file_id
+            if skipped:
+                st.warning(f"⚠️ {skipped} geçersiz kayıt atlandı")
             st.success("✅ JSON dosyası yüklendi!")
             st.rerun()
         except Exception as e:
@@ -696,4 +979,8 @@ if st.session_state.selected_points:
     with col2:
         st.metric("Charging Stations", charging_stations)
     with col3:
-        st.metric("Toplam Nokta", len(st.session_state.selected_points))
\ No newline at end of file
+        st.metric("Toplam Nokta", len(st.session_state.selected_points))
+
+# Aşama süreleri paneli ve günlük kaydı (çalıştırmanın sonunda)
+perf.render_panel(timer, st.session_state)
+perf.finish_rerun(timer, st.session_state)
@@ -0,0 +1,70 @@
+"""Kenar katmanının harita HTML boyutunu ve oluşturma süresini karşılaştırır
+
+Her kenar için ayrı folium.PolyLine (eski yöntem) ile tek GeoJSON katmanı
+(yeni yöntem) üretilen HTML boyutu ve render süresi açısından ölçülür.
+
+Kullanım:
+    python benchmarks/bench_map_render.py [ağ_dosyası]
+"""
+import os
+import sys
+import time
+
+import folium
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import map_layers  # noqa: E402
+import sumo_network  # noqa: E402
+
+DEFAULT_NET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "sumo_configs_emek", "osm.net.xml.gz")
+
+
+def edge_coords(net, tolerance=0.0, min_length=0.0):
+    """addition-app.py'deki get_sumo_edges() ile aynı çıktı (her çağrıda yeniden hesaplanır)"""
+    return sumo_network.EdgeGeometry.from_snapshot(net, tolerance, min_length)
+
+
+def polyline_map(edges, center):
+    m = folium.Map(location=center, zoom_start=15, prefer_canvas=True)
+    for edge_id, lonlat in edges:
+        folium.PolyLine(lonlat[:, ::-1].tolist(), color="blue", weight=1.5, opacity=0.6,
+                        popup=f"Edge ID: {edge_id}").add_to(m)
+    return m
+
+
+def geojson_map(edges, center):
+    m = folium.Map(location=center, zoom_start=15, prefer_canvas=True)
+    return map_layers.add_edge_layer(m, map_layers.edges_to_geojson(edges))
+
+
+def measure(build, edges, center):
+    start = time.perf_counter()
+    html = build(edges, center).get_root().render()
+    return time.perf_counter() - start, len(html.encode("utf-8"))
+
+
+def main():
+    net_file = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_NET
+    net = sumo_network.load_network(net_file)
+    bounds = sumo_network.header_bounds(net_file)
+    center = [bounds['center_lat'], bounds['center_lon']]
+    edges = edge_coords(net)
+    print(f"Ağ: {net_file} ({len(edges)} kenar)")
+
+    t_old, size_old = measure(polyline_map, edges, center)
+    t_new, size_new = measure(geojson_map, edges, center)
+    print(f"PolyLine/kenar : {size_old / 1e6:7.2f} MB  {t_old * 1000:9.1f} ms")
+    print(f"GeoJSON katmanı: {size_new / 1e6:7.2f} MB  {t_new * 1000:9.1f} ms")
+    print(f"Boyut oranı    : {size_old / size_new:7.1f}x, süre oranı: {t_old / t_new:.1f}x")
+
+    print("\nZoom bazlı detay seviyeleri (GeoJSON katmanı):")
+    for zoom in range(18, 11, -1):
+        tolerance, min_length = map_layers.lod_for_zoom(zoom)
+        lod_edges = edge_coords(net, tolerance, min_length)
+        t_lod, size_lod = measure(geojson_map, lod_edges, center)
+        print(f"  zoom {zoom:2d}: {len(lod_edges):6d} kenar  {size_lod / 1e6:6.2f} MB  {t_lod * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
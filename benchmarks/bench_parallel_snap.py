@@ -0,0 +1,47 @@
+"""Toplu eşlemenin seri ve karo tabanlı paralel sürümlerini karşılaştırır
+
+Ağın sınırları içinde rastgele noktalar üretilir; her işçi sayısı için süre
+ve sonuçların seri eşlemeyle birebir aynı olup olmadığı raporlanır.
+
+Kullanım:
+    python benchmarks/bench_parallel_snap.py [ağ_dosyası] [nokta_sayısı]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import parallel_snap  # noqa: E402
+import sumo_network  # noqa: E402
+
+DEFAULT_NET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "sumo_configs_emek", "osm.net.xml.gz")
+
+
+def main():
+    net_file = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] else DEFAULT_NET
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    net = sumo_network.load_network(net_file)
+    x_min, y_min, x_max, y_max = net.getBoundary()
+    xy = np.random.default_rng(0).uniform([x_min, y_min], [x_max, y_max], (count, 2))
+    index = net.get_lane_index()
+
+    start = time.perf_counter()
+    serial = index.nearest_many(xy)
+    serial_time = time.perf_counter() - start
+    print(f"seri: {serial_time:.2f} s ({count / serial_time:,.0f} nokta/s)")
+
+    workers = 2
+    while workers <= max(2, os.cpu_count() or 1):
+        start = time.perf_counter()
+        result = parallel_snap.snap_xy_parallel(index, xy, workers=workers)
+        elapsed = time.perf_counter() - start
+        same = all(np.array_equal(a, b) for a, b in zip(serial, result))
+        print(f"{workers} işçi: {elapsed:.2f} s (hızlanma {serial_time / elapsed:.2f}x, sonuçlar {'aynı' if same else 'FARKLI'})")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Tekil ve toplu XY -> lon/lat projeksiyonunu Emek ağı üzerinde karşılaştırır
+
+Kullanım:
+    python benchmarks/bench_projection.py [ağ_dosyası]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sumo_network  # noqa: E402
+
+DEFAULT_NET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "sumo_configs_emek", "osm.net.xml.gz")
+
+
+def per_vertex(net):
+    """Eski yöntem: her şekil noktası için ayrı convertXY2LonLat çağrısı"""
+    coords = []
+    for edge_id, shape in net.iter_edge_shapes():
+        for x, y in shape:
+            coords.append(net.convertXY2LonLat(x, y))
+    return np.array(coords)
+
+
+def batch(net):
+    """Yeni yöntem: tüm noktalar tek çağrıda"""
+    return net.xy_to_lonlat(net.edge_shape_coords)
+
+
+def best_of(func, net, repeat=5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(net)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    net_file = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_NET
+    net = sumo_network.load_network(net_file)
+    print(f"Ağ: {net_file} ({net.edge_count()} kenar, {len(net.edge_shape_coords)} şekil noktası)")
+
+    t_loop, loop_result = best_of(per_vertex, net, repeat=3)
+    t_batch, batch_result = best_of(batch, net)
+
+    assert np.allclose(loop_result, batch_result), "Toplu projeksiyon sonuçları farklı!"
+    print(f"Tekil döngü : {t_loop * 1000:9.2f} ms")
+    print(f"Toplu       : {t_batch * 1000:9.2f} ms")
+    print(f"Hızlanma    : {t_loop / t_batch:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""addition-app'teki render önbelleğinde isabet ile yeniden oluşturmayı karşılaştırır
+
+Her zoom seviyesi için bir yeniden çalıştırmanın harita kısmı ölçülür:
+
+    yeniden oluştur  GeoJSON (önbellekte) -> görünür alt küme -> folium katmanı,
+                     ardından st_folium'un yaptığı gibi render + Leaflet betiği
+    isabet           önbellekteki betikten yeni folium.Map + PrerenderedLayer,
+                     ardından aynı render + Leaflet betiği
+
+Kullanım:
+    python benchmarks/bench_render_cache.py [ağ_dosyası] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import folium
+from streamlit_folium import generate_leaflet_string
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import map_layers  # noqa: E402
+import sumo_network  # noqa: E402
+
+DEFAULT_NET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "sumo_configs_emek", "osm.net.xml.gz")
+
+
+def best_time(fn, repeat):
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def send(m):
+    """st_folium'un her çalıştırmada yaptığı render ve betik üretimi"""
+    m.get_root().render()
+    m.render()
+    return generate_leaflet_string(m)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render önbelleği: isabet ve yeniden oluşturma süreleri")
+    parser.add_argument("net", nargs="?", default=DEFAULT_NET)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    net = sumo_network.load_network(args.net)
+    bounds = sumo_network.header_bounds(args.net)
+    center = [bounds['center_lat'], bounds['center_lon']]
+    region = map_layers.expand_viewport((bounds['min_lon'], bounds['min_lat'], bounds['max_lon'], bounds['max_lat']))
+    visible = net.edge_ids[net.edges_in_lonlat_bbox(*region)].tolist()
+    visible_set = set(visible)
+
+    print(f"Ağ: {args.net}")
+    print(f"{'zoom':>4s} {'kenar':>7s} {'yeniden oluştur':>16s} {'isabet':>10s} {'oran':>6s}")
+    for zoom in (12, 14, 16):
+        tolerance, min_length = map_layers.lod_for_zoom(zoom)
+        edges_geojson = map_layers.edges_to_geojson(net.edge_geometry(tolerance, min_length))
+
+        def add_edges(parent):
+            map_layers.add_edge_layer(parent, map_layers.subset_geojson(edges_geojson, visible))
+
+        def rebuild():
+            m = folium.Map(location=center, zoom_start=zoom, prefer_canvas=True)
+            add_edges(m)
+            return send(m)
+
+        prerendered = map_layers.prerender(add_edges)
+
+        def hit():
+            m = folium.Map(location=center, zoom_start=zoom, prefer_canvas=True)
+            map_layers.PrerenderedLayer(prerendered).add_to(m)
+            return send(m)
+
+        t_rebuild = best_time(rebuild, args.repeat)
+        t_hit = best_time(hit, args.repeat)
+        features = sum(1 for feature in edges_geojson['features'] if feature['id'] in visible_set)
+        print(f"{zoom:4d} {features:7d} {t_rebuild * 1000:13.1f} ms {t_hit * 1000:7.1f} ms {t_rebuild / t_hit:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
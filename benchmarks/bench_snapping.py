@@ -0,0 +1,49 @@
+"""En yakın şerit sorgularının süresini ölçer
+
+Ağın sınırları içinde (ve biraz dışında) rastgele noktalar üretilir ve
+NetworkSnapshot.nearest_lanes() ile eşlenir.
+
+Kullanım:
+    python benchmarks/bench_snapping.py [ağ_dosyası] [nokta_sayısı]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sumo_network  # noqa: E402
+
+DEFAULT_NET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "sumo_configs_emek", "osm.net.xml.gz")
+
+
+def random_points(net, count, seed=0):
+    x_min, y_min, x_max, y_max = net.getBoundary()
+    pad_x, pad_y = (x_max - x_min) * 0.1, (y_max - y_min) * 0.1
+    rng = np.random.default_rng(seed)
+    return rng.uniform([x_min - pad_x, y_min - pad_y], [x_max + pad_x, y_max + pad_y], (count, 2))
+
+
+def main():
+    net_file = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_NET
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    net = sumo_network.load_network(net_file)
+    points = random_points(net, count)
+
+    start = time.perf_counter()
+    net.nearest_lanes(*points[0])
+    build = time.perf_counter() - start
+
+    for k in (1, 5):
+        start = time.perf_counter()
+        for x, y in points:
+            net.nearest_lanes(x, y, k=k)
+        elapsed = time.perf_counter() - start
+        print(f"k={k}: {elapsed / count * 1000:.3f} ms/sorgu ({count / elapsed:,.0f} sorgu/s)")
+    print(f"İndeks oluşturma: {build * 1000:.1f} ms ({len(net.lane_ids)} şerit)")
+
+
+if __name__ == "__main__":
+    main()
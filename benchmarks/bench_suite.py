@@ -0,0 +1,258 @@
+"""Sıcak yolların sentetik ve gerçek ağlar üzerinde toplu ölçümü
+
+Artan boyutlarda ızgara/radyal `.net.xml.gz` ağları (bkz. synthetic_nets.py)
+ve `sumo_configs_emek/osm.net.xml.gz` üzerinde şu aşamalar ölçülür:
+
+    load_cold   ağ dosyasını akış halinde okuma + snapshot yazma
+    load_warm   snapshot'tan yükleme
+    bounds      başlıktan sınır hesabı (get_network_bounds)
+    edges       kenar koordinatları (get_sumo_edges)
+    snap_single tekil en yakın şerit sorgusu (tıklama/manuel giriş yolu)
+    snap_batch  toplu eşleme (NetworkSnapshot.snap_points)
+    map_html    kenar katmanı + nokta kümesi ile harita HTML'i
+    xml_export  additional dosyası yazımı
+
+Her aşama için en iyi süre, verim ve tepe bellek (tracemalloc) raporlanır.
+Sonuçlar JSON olarak kaydedilip sonraki çalıştırmalarla karşılaştırılabilir.
+
+Kullanım:
+    python benchmarks/bench_suite.py                                 # varsayılan boyutlar
+    python benchmarks/bench_suite.py --sizes 20 50 100 --repeat 5
+    python benchmarks/bench_suite.py --save benchmarks/baselines/reference.json
+    python benchmarks/bench_suite.py --compare benchmarks/baselines/reference.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import folium
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+import map_layers  # noqa: E402
+import snap_memo  # noqa: E402
+import sumo_network  # noqa: E402
+import sumo_stops  # noqa: E402
+from bench_map_render import edge_coords  # noqa: E402
+from synthetic_nets import GENERATORS  # noqa: E402
+
+DEFAULT_NET = os.path.join(os.path.dirname(BENCH_DIR), "sumo_configs_emek", "osm.net.xml.gz")
+# Üretilen ağlar önbellek klasöründe tutulur ve sonraki çalıştırmalarda yeniden kullanılır
+NET_DIR = os.path.join(sumo_network.DEFAULT_CACHE_DIR, "bench_nets")
+
+DEFAULT_SIZES = (20, 50)
+SINGLE_POINTS = 500
+BATCH_POINTS = 50000
+MAP_POINTS = 2000
+
+# Karşılaştırmada bu orandan fazla yavaşlama gerileme sayılır
+DEFAULT_THRESHOLD = 0.25
+# Birkaç milisaniyelik aşamalardaki gürültü gerileme sayılmasın (saniye)
+MIN_DELTA = 0.005
+
+
+def prepare_networks(sizes, include_real=True):
+    """(ad, dosya yolu) listesi; eksik sentetik ağları üretir"""
+    os.makedirs(NET_DIR, exist_ok=True)
+    networks = []
+    for size in sizes:
+        for kind, generate in GENERATORS.items():
+            path = os.path.join(NET_DIR, f"{kind}_{size}.net.xml.gz")
+            if not os.path.exists(path):
+                generate(path, size)
+            networks.append((f"{kind}_{size}", path))
+    if include_real and os.path.exists(DEFAULT_NET):
+        networks.append(("emek", DEFAULT_NET))
+    return networks
+
+
+def random_lonlat(bounds, count, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform([bounds['min_lon'], bounds['min_lat']], [bounds['max_lon'], bounds['max_lat']], (count, 2))
+
+
+def measure(stage, repeat):
+    """İlk çalıştırma tracemalloc altında (ısınma + tepe bellek), sonrakiler süre için
+
+    Dönüş: (en iyi süre s, tepe bellek bayt, aşamanın döndürdüğü iş miktarı)
+    """
+    tracemalloc.start()
+    try:
+        items = stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage()
+        times.append(time.perf_counter() - start)
+    return min(times), peak, items
+
+
+def network_stages(net_file):
+    """Ağ için (aşama adı, birim, fonksiyon) listesi; fonksiyonlar işlenen öğe sayısını döndürür"""
+    net = sumo_network.load_network(net_file)
+    bounds = sumo_network.header_bounds(net_file)
+    digest = net.digest
+
+    def load_cold():
+        cache_dir = tempfile.mkdtemp(prefix="bench_snapshot_")
+        try:
+            return sumo_network.load_network(net_file, cache_dir, digest).edge_count()
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def load_warm():
+        return sumo_network.load_network(net_file, digest=digest).edge_count()
+
+    def get_bounds():
+        sumo_network.header_bounds(net_file)
+        return 1
+
+    def edges():
+        return len(edge_coords(net))
+
+    single = random_lonlat(bounds, SINGLE_POINTS, seed=1)
+
+    def snap_single():
+        for lon, lat in single:
+            snap_memo.nearest_lane(net, lon, lat)
+        return len(single)
+
+    batch = random_lonlat(bounds, BATCH_POINTS, seed=2)
+
+    def snap_batch():
+        net.snap_points(batch)
+        return len(batch)
+
+    snapped = net.snap_points(batch)
+    found = np.flatnonzero(snapped['lane'] >= 0)
+    stops = []
+    for i in found:
+        lane = snapped['lane'][i]
+        stop = sumo_stops.stop_from_snap(str(net.lane_ids[lane]), str(net.edge_ids[net.lane_edge[lane]]),
+                                         snapped['pos'][i], net.lane_length[lane], snapped['distance'][i])
+        stop.update(lat=batch[i, 1], lon=batch[i, 0], type=sumo_stops.POINT_TYPES[i % 2], name=f"p{i}")
+        stops.append(stop)
+
+    edge_list = edge_coords(net)
+    rows = [[stop['lat'], stop['lon'], "red", stop['name'], stop['edge_id']] for stop in stops[:MAP_POINTS]]
+
+    def map_html():
+        m = folium.Map(location=[bounds['center_lat'], bounds['center_lon']], zoom_start=15, prefer_canvas=True)
+        map_layers.add_edge_layer(m, map_layers.edges_to_geojson(edge_list))
+        map_layers.add_point_cluster(m, rows, ["Edge"])
+        m.get_root().render()
+        return len(edge_list)
+
+    def xml_export():
+        sumo_stops.write_additional(io.StringIO(), sumo_stops.stop_elements(stops))
+        return len(stops)
+
+    return [
+        ("load_cold", "edge", load_cold),
+        ("load_warm", "edge", load_warm),
+        ("bounds", "çağrı", get_bounds),
+        ("edges", "edge", edges),
+        ("snap_single", "nokta", snap_single),
+        ("snap_batch", "nokta", snap_batch),
+        ("map_html", "edge", map_html),
+        ("xml_export", "durak", xml_export),
+    ]
+
+
+def run(networks, repeat, stages=None):
+    results = {}
+    for name, path in networks:
+        for stage, unit, fn in network_stages(path):
+            if stages and stage not in stages:
+                continue
+            seconds, peak, items = measure(fn, repeat)
+            results[f"{name}/{stage}"] = {
+                'seconds': seconds,
+                'throughput': items / seconds if seconds else None,
+                'unit': unit,
+                'peak_mb': peak / 1e6
+            }
+            print(f"{name:12s} {stage:12s} {seconds * 1000:10.2f} ms  "
+                  f"{items / seconds if seconds else 0:14,.0f} {unit}/s  {peak / 1e6:8.1f} MB", flush=True)
+    return results
+
+
+def environment():
+    return {
+        'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'folium': folium.__version__
+    }
+
+
+def compare(results, baseline, threshold):
+    """Ortak aşamaları karşılaştırır; gerileme sayısını döndürür"""
+    regressions = 0
+    print(f"\nKarşılaştırma ({baseline['environment']['date']}, eşik %{threshold * 100:.0f}):")
+    for key, current in results.items():
+        reference = baseline['results'].get(key)
+        if reference is None:
+            continue
+        ratio = current['seconds'] / reference['seconds']
+        flag = ""
+        significant = abs(current['seconds'] - reference['seconds']) >= MIN_DELTA
+        if significant and ratio > 1 + threshold:
+            flag = "  GERİLEME"
+            regressions += 1
+        elif significant and ratio < 1 - threshold:
+            flag = "  iyileşme"
+        print(f"  {key:26s} {reference['seconds'] * 1000:10.2f} -> {current['seconds'] * 1000:10.2f} ms  "
+              f"{ratio:5.2f}x  bellek {reference['peak_mb']:.1f} -> {current['peak_mb']:.1f} MB{flag}")
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Sentetik ve gerçek ağlarda sıcak yol ölçümleri")
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(DEFAULT_SIZES),
+                        help="Sentetik ağ boyutları (ızgara kenarı / halka sayısı)")
+    parser.add_argument("--no-real", action="store_true", help="Emek ağını ölçme")
+    parser.add_argument("--stages", nargs="*", help="Yalnızca bu aşamaları ölç")
+    parser.add_argument("--repeat", type=int, default=3, help="Süre ölçümü tekrar sayısı (en iyisi raporlanır)")
+    parser.add_argument("--save", help="Sonuçları JSON temel çizgisi olarak kaydet")
+    parser.add_argument("--compare", help="Sonuçları bu JSON temel çizgisiyle karşılaştır")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Gerileme eşiği (oran, varsayılan 0.25)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    networks = prepare_networks(args.sizes, include_real=not args.no_real)
+    results = run(networks, args.repeat, args.stages)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2, ensure_ascii=False)
+        print(f"\nTemel çizgi kaydedildi: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        # Gerileme varsa sıfırdan farklı çıkış kodu (CI'da kullanılabilir)
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Ölçümler için sentetik SUMO ağları (ızgara ve radyal) üretir
+
+Üretilen `.net.xml.gz` dosyaları sumolib ile okunabilecek kadar eksiksizdir:
+<location> başlığı (UTM projeksiyonu, Eskişehir merkezli), şeritli edge'ler ve
+junction'lar içerir. Bağlantı (connection) ve trafik ışığı yazılmaz; eşleme ve
+görselleştirme için gerekmez.
+
+Kullanım:
+    python benchmarks/synthetic_nets.py grid 50 grid_50.net.xml.gz
+    python benchmarks/synthetic_nets.py radial 40 radial_40.net.xml.gz
+"""
+import gzip
+import math
+import os
+import sys
+
+from pyproj import Proj
+
+# Ağların yerleştirileceği coğrafi merkez ve projeksiyon
+CENTER_LON, CENTER_LAT = 30.5206, 39.7767
+PROJ_PARAMETER = "+proj=utm +zone=36 +ellps=WGS84 +datum=WGS84 +units=m +no_defs"
+
+LANE_WIDTH = 3.2
+DEFAULT_SPACING = 100.0
+
+
+def _fmt(x, y):
+    return f"{x:.2f},{y:.2f}"
+
+
+def _offset_shape(shape, offset):
+    """Çoklu çizgiyi yön vektörünün sağına `offset` metre kaydırır"""
+    result = []
+    for i, (x, y) in enumerate(shape):
+        (x0, y0), (x1, y1) = (shape[i - 1], shape[i]) if i else (shape[0], shape[1])
+        length = math.hypot(x1 - x0, y1 - y0) or 1.0
+        result.append((x + (y1 - y0) / length * offset, y - (x1 - x0) / length * offset))
+    return result
+
+
+def _length(shape):
+    return sum(math.hypot(x1 - x0, y1 - y0) for (x0, y0), (x1, y1) in zip(shape, shape[1:]))
+
+
+def write_net(path, nodes, edges):
+    """nodes: {id: (x, y)}, edges: [(id, from, to, şerit sayısı, ara noktalar)] -> .net.xml(.gz)
+
+    Koordinatlar ağın yerel sisteminde (sol alt köşe 0,0) verilir.
+    """
+    xs = [x for x, _ in nodes.values()]
+    ys = [y for _, y in nodes.values()]
+    width, height = max(xs), max(ys)
+    # Ağ merkezi CENTER_LON/LAT'e denk gelecek şekilde ofset
+    center_x, center_y = Proj(PROJ_PARAMETER)(CENTER_LON, CENTER_LAT)
+    off_x, off_y = width / 2 - center_x, height / 2 - center_y
+    proj = Proj(PROJ_PARAMETER)
+    lons, lats = proj([min(xs) - off_x, width - off_x], [min(ys) - off_y, height - off_y], inverse=True)
+
+    incoming = {node_id: [] for node_id in nodes}
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<net version="1.20" junctionCornerDetail="5" limitTurnSpeed="5.50">\n')
+        f.write(f'    <location netOffset="{_fmt(off_x, off_y)}" convBoundary="{min(xs):.2f},{min(ys):.2f},{width:.2f},{height:.2f}" '
+                f'origBoundary="{lons[0]:.6f},{lats[0]:.6f},{lons[1]:.6f},{lats[1]:.6f}" projParameter="{PROJ_PARAMETER}"/>\n')
+        for edge_id, from_id, to_id, lane_count, via in edges:
+            shape = [nodes[from_id]] + list(via) + [nodes[to_id]]
+            f.write(f'    <edge id="{edge_id}" from="{from_id}" to="{to_id}" priority="1">\n')
+            for index in range(lane_count):
+                lane_shape = _offset_shape(shape, LANE_WIDTH * (lane_count - index - 0.5))
+                lane_id = f"{edge_id}_{index}"
+                incoming[to_id].append(lane_id)
+                # En sağdaki şerit yaya, diğerleri tüm araçlar (sınıf filtresi de ölçülsün)
+                allow = ' allow="pedestrian"' if lane_count > 1 and index == 0 else ""
+                f.write(f'        <lane id="{lane_id}" index="{index}"{allow} speed="13.89" length="{_length(lane_shape):.2f}" '
+                        f'shape="{" ".join(_fmt(x, y) for x, y in lane_shape)}"/>\n')
+            f.write('    </edge>\n')
+        for node_id, (x, y) in nodes.items():
+            f.write(f'    <junction id="{node_id}" type="priority" x="{x:.2f}" y="{y:.2f}" '
+                    f'incLanes="{" ".join(incoming[node_id])}" intLanes="" shape="{_fmt(x - 5, y - 5)} {_fmt(x + 5, y + 5)}"/>\n')
+        f.write('</net>\n')
+    return path
+
+
+def grid_net(path, size, spacing=DEFAULT_SPACING):
+    """size x size düğümlü, çift yönlü ızgara; her ikinci sokak iki şeritli"""
+    nodes = {f"n{i}_{j}": (i * spacing, j * spacing) for i in range(size) for j in range(size)}
+    edges = []
+    for i in range(size):
+        for j in range(size):
+            for di, dj in ((1, 0), (0, 1)):
+                if i + di < size and j + dj < size:
+                    a, b = f"n{i}_{j}", f"n{i + di}_{j + dj}"
+                    lanes = 2 if (j if di else i) % 2 == 0 else 1
+                    edges.append((f"{a}-{b}", a, b, lanes, ()))
+                    edges.append((f"{b}-{a}", b, a, lanes, ()))
+    return write_net(path, nodes, edges)
+
+
+def radial_net(path, rings, spokes=None, spacing=DEFAULT_SPACING, arc_points=4):
+    """Merkezden çıkan `spokes` ışın ve `rings` halkalı ağ; halka edge'leri eğri geometrilidir"""
+    spokes = spokes or max(8, rings * 2)
+    radius = rings * spacing
+    nodes = {"c": (radius, radius)}
+    for r in range(1, rings + 1):
+        for s in range(spokes):
+            angle = 2 * math.pi * s / spokes
+            nodes[f"r{r}_{s}"] = (radius + r * spacing * math.cos(angle), radius + r * spacing * math.sin(angle))
+
+    edges = []
+    for s in range(spokes):
+        previous = "c"
+        for r in range(1, rings + 1):
+            node = f"r{r}_{s}"
+            edges.append((f"{previous}-{node}", previous, node, 2, ()))
+            edges.append((f"{node}-{previous}", node, previous, 2, ()))
+            previous = node
+    for r in range(1, rings + 1):
+        for s in range(spokes):
+            a, b = f"r{r}_{s}", f"r{r}_{(s + 1) % spokes}"
+            start, step = 2 * math.pi * s / spokes, 2 * math.pi / spokes
+            via = [(radius + r * spacing * math.cos(start + step * k / (arc_points + 1)),
+                    radius + r * spacing * math.sin(start + step * k / (arc_points + 1)))
+                   for k in range(1, arc_points + 1)]
+            edges.append((f"{a}-{b}", a, b, 1, via))
+            edges.append((f"{b}-{a}", b, a, 1, via[::-1]))
+    return write_net(path, nodes, edges)
+
+
+GENERATORS = {'grid': grid_net, 'radial': radial_net}
+
+
+def main():
+    kind, size, path = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+    GENERATORS[kind](path, size)
+    print(f"{path}: {os.path.getsize(path) / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
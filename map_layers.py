@@ -0,0 +1,318 @@
+import hashlib
+import json
+import math
+import pickle
+import threading
+from collections import OrderedDict
+
+import folium
+import numpy as np
+from branca.element import CssLink, Element, JavascriptLink
+from folium.elements import JSCSSMixin
+from folium.plugins import FastMarkerCluster
+from folium.template import Template
+
+# Zoom seviyesine göre kenar geometrisi detay seviyesi:
+# (en küçük zoom, Douglas–Peucker toleransı [m], en kısa gösterilen kenar [m])
+# Yakın zoomlarda tüm noktalar, geniş görünümlerde sadeleştirilmiş geometri gönderilir.
+LOD_LEVELS = [
+    (16, 0.0, 0.0),
+    (15, 1.0, 0.0),
+    (14, 2.5, 10.0),
+    (13, 5.0, 25.0),
+    (0, 10.0, 50.0),
+]
+
+
+def lod_for_zoom(zoom):
+    """Zoom seviyesi için (tolerans, en kısa kenar uzunluğu) döndürür"""
+    for min_zoom, tolerance, min_length in LOD_LEVELS:
+        if zoom >= min_zoom:
+            return tolerance, min_length
+    return LOD_LEVELS[-1][1:]
+
+
+def edge_style(feature):
+    """Kenar katmanı çizgi stili"""
+    return {'color': 'blue', 'weight': 1.5, 'opacity': 0.6}
+
+
+def edge_highlight(feature):
+    """Fare üzerine gelince kenar stili"""
+    return {'weight': 4, 'opacity': 1.0}
+
+
+# Görünür alanın her yönüne eklenen pay (görünüm boyutunun oranı olarak);
+# bu pay içinde kalan kaydırmalar haritanın yeniden oluşturulmasını gerektirmez
+VIEWPORT_MARGIN = 0.5
+
+
+def estimate_viewport(center, zoom, width_px=1200, height_px=600):
+    """Merkez ve zoom seviyesinden görünür alanı (min_lon, min_lat, max_lon, max_lat) tahmin eder"""
+    # Web Mercator'da zoom z'de dünya 256 * 2^z piksel genişliğindedir
+    deg_per_px = 360.0 / (256 * 2 ** zoom)
+    half_lon = width_px / 2 * deg_per_px
+    half_lat = height_px / 2 * deg_per_px * math.cos(math.radians(center[0]))
+    return (center[1] - half_lon, center[0] - half_lat, center[1] + half_lon, center[0] + half_lat)
+
+
+def zoom_for_bounds(viewport, width_px=1200, height_px=600):
+    """Leaflet fitBounds'un (min_lon, min_lat, max_lon, max_lat) bölgesi için seçeceği tam sayı zoom"""
+    min_lon, min_lat, max_lon, max_lat = viewport
+
+    def mercator_y(lat):
+        return math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+
+    span_lon = max(max_lon - min_lon, 1e-9)
+    span_y = max(abs(mercator_y(max_lat) - mercator_y(min_lat)), 1e-9)
+    zoom_x = math.log2(width_px * 360.0 / (256 * span_lon))
+    zoom_y = math.log2(height_px * 2 * math.pi / (256 * span_y))
+    return max(0, min(18, math.floor(min(zoom_x, zoom_y))))
+
+
+def viewport_from_bounds(map_bounds):
+    """st_folium'un döndürdüğü bounds sözlüğünü (min_lon, min_lat, max_lon, max_lat) demetine çevirir"""
+    if not map_bounds or not map_bounds.get('_southWest') or not map_bounds.get('_northEast'):
+        return None
+    south_west = map_bounds['_southWest']
+    north_east = map_bounds['_northEast']
+    if south_west.get('lat') is None or north_east.get('lat') is None:
+        return None
+    return (south_west['lng'], south_west['lat'], north_east['lng'], north_east['lat'])
+
+
+def expand_viewport(viewport, margin=VIEWPORT_MARGIN):
+    """Görünür alanı her yönde `margin` oranında genişletir"""
+    min_lon, min_lat, max_lon, max_lat = viewport
+    pad_lon = (max_lon - min_lon) * margin
+    pad_lat = (max_lat - min_lat) * margin
+    return (min_lon - pad_lon, min_lat - pad_lat, max_lon + pad_lon, max_lat + pad_lat)
+
+
+def viewport_contains(outer, inner):
+    """inner görünümü tamamen outer bölgesinin içinde mi?"""
+    return (outer[0] <= inner[0] and outer[1] <= inner[1] and
+            outer[2] >= inner[2] and outer[3] >= inner[3])
+
+
+def subset_geojson(edges_geojson, edge_ids):
+    """FeatureCollection'dan yalnızca verilen kenarları içeren yeni bir koleksiyon üretir (özellikler kopyalanmaz)"""
+    edge_ids = set(edge_ids)
+    return {
+        'type': 'FeatureCollection',
+        'features': [feature for feature in edges_geojson['features'] if feature['id'] in edge_ids]
+    }
+
+
+def edges_to_geojson(geometry):
+    """Kenar geometrisini (sumo_network.EdgeGeometry) tek bir GeoJSON FeatureCollection'a dönüştürür"""
+    # GeoJSON [lon, lat] sırası; 6 basamak ~10 cm hassasiyet. Yuvarlama tek seferde
+    # tüm dizi üzerinde yapılır, kenarlar düz dizinin dilimleridir.
+    rounded = np.round(geometry.coords, 6)
+    offsets = geometry.offsets.tolist()
+    features = []
+    for i, edge_id in enumerate(geometry.ids.tolist()):
+        features.append({
+            'type': 'Feature',
+            'id': edge_id,
+            'properties': {'id': edge_id},
+            'geometry': {
+                'type': 'LineString',
+                'coordinates': rounded[offsets[i]:offsets[i + 1]].tolist()
+            }
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def add_edge_layer(m, edges_geojson):
+    """Kenar ağını haritaya tek bir GeoJSON katmanı olarak ekler (her kenar için ayrı PolyLine yerine)
+
+    Edge ID'si özellik (properties) olarak taşınır; tooltip ve popup bu alandan
+    tarayıcıda üretilir, her kenar için ayrı HTML gömülmez.
+    """
+    folium.GeoJson(
+        edges_geojson,
+        name="SUMO Kenarları",
+        style_function=edge_style,
+        highlight_function=edge_highlight,
+        tooltip=folium.GeoJsonTooltip(fields=['id'], aliases=['Edge ID:']),
+        popup=folium.GeoJsonPopup(fields=['id'], aliases=['Edge ID:'])
+    ).add_to(m)
+    return m
+
+
+# Bu sayıdan fazla nokta, tek tek Marker yerine kümelenmiş katman olarak çizilir
+CLUSTER_THRESHOLD = 300
+
+# Kümelenmiş katmanda her satır: [lat, lon, renk, başlık, değer1, değer2, ...].
+# Noktalar canvas üzerinde CircleMarker olarak çizilir; tooltip ve popup HTML'i
+# nokta başına gömülmez, yalnızca açıldığında tarayıcıda üretilir.
+_LAZY_MARKER_CALLBACK = """function (row) {
+    var labels = %s;
+    var escape = function (value) {
+        return String(value).replace(/[&<>"]/g, function (c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+        });
+    };
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 6, color: row[2], fillColor: row[2], fillOpacity: 0.5, weight: 2
+    });
+    marker.bindTooltip(function () { return escape(row[3]); });
+    marker.bindPopup(function () {
+        var html = '<div style="font-family: Arial;"><b>' + escape(row[3]) + '</b><hr style="margin: 5px 0;">';
+        for (var i = 0; i < labels.length; i++) {
+            html += '<p style="margin: 2px 0;"><b>' + escape(labels[i]) + ':</b> ' + escape(row[4 + i]) + '</p>';
+        }
+        return html + '</div>';
+    });
+    return marker;
+}"""
+
+
+def add_point_cluster(parent, rows, labels, name=None):
+    """Çok sayıda noktayı zoom seviyesine göre kümelenen tek bir katman olarak ekler
+
+    Kümeler tarayıcıda hesaplanır; yalnızca görünür alandaki kümeler açılır ve
+    noktalar parça parça yüklenir, böylece binlerce nokta haritayı kilitlemez.
+    """
+    FastMarkerCluster(
+        rows,
+        callback=_LAZY_MARKER_CALLBACK % json.dumps(labels),
+        name=name,
+        chunkedLoading=True,
+        removeOutsideVisibleBounds=True,
+        disableClusteringAtZoom=18,
+        spiderfyOnMaxZoom=False
+    ).add_to(parent)
+    return parent
+
+
+def content_key(*parts):
+    """Parçaların içeriğinden (nokta listeleri dahil) kararlı bir önbellek anahtarı üretir"""
+    return hashlib.blake2b(pickle.dumps(parts, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).hexdigest()
+
+
+class _RawScript(Element):
+    """Jinja şablonundan geçirilmeden olduğu gibi yazılan betik"""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = script
+
+    def render(self, **kwargs):
+        return self.script
+
+
+def prerender(add_layers):
+    """add_layers(parent) ile eklenen folium öğelerini bir kez render edip JavaScript'ini döndürür
+
+    Öğeler geçici bir haritaya eklenip render edilir (GeoJSON stil eşlemesi ve
+    JSON'a dönüştürme gibi pahalı adımlar burada bir kez yapılır). Dönüş:
+    (parent adından bölünmüş betik parçaları, JS bağlantıları, CSS bağlantıları);
+    yalnızca değiştirilemez dizgelerden oluştuğu için oturumlar arasında
+    kopyalanmadan paylaşılabilir. Haritaya PrerenderedLayer ile eklenir.
+    """
+    parent = folium.Map()
+    existing = set(parent._children)
+    add_layers(parent)
+    stack = [child for name, child in parent._children.items() if name not in existing]
+    figure = parent.get_root()
+    figure.render()
+
+    elements = []
+    while stack:
+        element = stack.pop()
+        elements.append(element)
+        stack.extend(element._children.values())
+    names = {element.get_name() for element in elements}
+    script = "\n".join(child.render() for name, child in figure.script._children.items() if name in names)
+    js_links = {}
+    css_links = {}
+    for element in elements:
+        js_links.update(getattr(element, "default_js", []))
+        css_links.update(getattr(element, "default_css", []))
+    return tuple(script.split(parent.get_name())), tuple(js_links.items()), tuple(css_links.items())
+
+
+class PrerenderedLayer(JSCSSMixin):
+    """prerender() çıktısını haritaya veya bir FeatureGroup'a ekleyen hafif öğe
+
+    Betik parçaları yalnızca yeni parent adıyla birleştirilir; folium öğeleri
+    yeniden kurulmaz ve büyük betik şablon motorundan geçirilmez.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}{{ this.script() }}{% endmacro %}
+    """)
+
+    def __init__(self, prerendered):
+        super().__init__()
+        self._name = "PrerenderedLayer"
+        self.parts, js_links, css_links = prerendered
+        self.default_js = list(js_links)
+        self.default_css = list(css_links)
+
+    def script(self):
+        return self._parent.get_name().join(self.parts)
+
+    def render(self, **kwargs):
+        figure = self.get_root()
+        for name, url in self.default_js:
+            figure.header.add_child(JavascriptLink(url), name=name)
+        for name, url in self.default_css:
+            figure.header.add_child(CssLink(url), name=name)
+        figure.script.add_child(_RawScript(self.script()), name=self.get_name())
+
+
+class RenderCache:
+    """İçerik anahtarlı, boyutu sınırlı LRU katman önbelleği
+
+    Katmanlar prerender() çıktısı olarak saklanır ve kopyalanmadan döndürülür;
+    her çalıştırmada yalnızca hafif folium nesneleri (harita, FeatureGroup,
+    PrerenderedLayer) yeniden kurulur, böylece st_folium'un nesneler üzerinde
+    yaptığı değişiklikler önbelleğe ve diğer oturumlara sızmaz.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Anahtar önbellekteyse kaydı döndürür; değilse build() ile üretip ekler"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = build()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._entries),
+            'bytes': sum(sum(len(part) for part in parts) for parts, _, _ in self._entries.values())
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
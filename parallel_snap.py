@@ -0,0 +1,96 @@
+"""Çok sayıda noktanın süreç havuzunda paralel olarak şeritlere eşlenmesi
+
+Noktalar sabit boyutlu uzamsal karolara bölünür. Her işçiye yalnızca kendi
+karosunu `margin` kadar genişleten kutuyla kesişen şerit segmentleri
+gönderilir; karo içindeki bir nokta için `margin` mesafesindeki tüm
+segmentler bu alt kümede olduğundan, o mesafe içinde bulunan sonuç tüm
+ağla yapılan eşlemeyle aynıdır. Daha uzakta kalan (nadir) noktalar ana
+süreçte tüm indeksle çözülür. Sonuçlar nokta sırasına göre birleştirilir,
+bu yüzden çıktı işçi sayısından bağımsızdır.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sumo_network import LaneIndex
+
+# Karo kenar uzunluğu ve karo çevresinde işçiye gönderilen segment payı (metre)
+DEFAULT_TILE_SIZE = 2000.0
+DEFAULT_MARGIN = 250.0
+
+# Bu sayının altındaki nokta kümeleri için süreç başlatmaya değmez
+MIN_PARALLEL_POINTS = 20000
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def plan_tiles(xy, tile_size):
+    """Noktaları karolara böler; (karo anahtarı, nokta indeksleri) listesini karo sırasıyla döndürür"""
+    keys = np.floor(xy / tile_size).astype(np.int64)
+    order = np.lexsort((keys[:, 1], keys[:, 0]))
+    sorted_keys = keys[order]
+    boundaries = np.flatnonzero((sorted_keys[1:] != sorted_keys[:-1]).any(axis=1)) + 1
+    return [(tuple(sorted_keys[group[0]].tolist()), np.sort(order[group]))
+            for group in np.split(np.arange(len(order)), boundaries)]
+
+
+def _snap_tile(task):
+    """İşçi: karonun segment alt kümesinden indeks kurup noktalarını eşler"""
+    arrays, xy = task
+    if not len(arrays['lane']):
+        count = len(xy)
+        return np.full(count, -1, dtype=np.int64), np.zeros(count), np.full(count, np.inf)
+    return LaneIndex.from_segments(**arrays).nearest_many(xy)
+
+
+def _iter_tasks(index, xy, tiles, tile_size, margin, lane_mask):
+    for (tile_x, tile_y), members in tiles:
+        bbox = (tile_x * tile_size - margin, tile_y * tile_size - margin,
+                (tile_x + 1) * tile_size + margin, (tile_y + 1) * tile_size + margin)
+        arrays, global_lanes = index.segment_subset(bbox, lane_mask)
+        yield (arrays, xy[members]), members, global_lanes
+
+
+def snap_xy_parallel(index, xy, lane_mask=None, workers=None, tile_size=DEFAULT_TILE_SIZE, margin=DEFAULT_MARGIN):
+    """LaneIndex.nearest_many ile aynı sonucu veren karo tabanlı paralel eşleme
+
+    Dönüş: (şerit indeksleri, konumlar, mesafeler); şerit bulunamazsa indeks -1.
+    """
+    xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    workers = workers or default_workers()
+    if workers <= 1 or len(xy) < MIN_PARALLEL_POINTS:
+        return index.nearest_many(xy, lane_mask)
+
+    count = len(xy)
+    lanes = np.full(count, -1, dtype=np.int64)
+    positions = np.zeros(count)
+    distances = np.full(count, np.inf)
+
+    tiles = plan_tiles(xy, tile_size)
+    tasks = list(_iter_tasks(index, xy, tiles, tile_size, margin, lane_mask))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map sonuçları görev sırasıyla döndürür; birleştirme deterministiktir
+        results = executor.map(_snap_tile, [task for task, _, _ in tasks], chunksize=max(1, len(tasks) // (workers * 4)))
+        for (_, members, global_lanes), (tile_lanes, tile_pos, tile_dist) in zip(tasks, results):
+            exact = (tile_lanes >= 0) & (tile_dist <= margin)
+            done = members[exact]
+            lanes[done] = global_lanes[tile_lanes[exact]]
+            positions[done] = tile_pos[exact]
+            distances[done] = tile_dist[exact]
+
+    # Karo payının dışında kalan noktalar tüm indeksle
+    pending = np.flatnonzero(lanes < 0)
+    if len(pending):
+        lanes[pending], positions[pending], distances[pending] = index.nearest_many(xy[pending], lane_mask)
+    return lanes, positions, distances
+
+
+def snap_points_parallel(net, lonlat, vclass=None, workers=None, tile_size=DEFAULT_TILE_SIZE, margin=DEFAULT_MARGIN):
+    """NetworkSnapshot.snap_points'in paralel karşılığı (aynı dönüş sözlüğü)"""
+    xy = net.lonlat_to_xy(lonlat)
+    lane_mask = net.lanes_allowing(vclass) if vclass else None
+    lanes, positions, distances = snap_xy_parallel(net.get_lane_index(), xy, lane_mask, workers, tile_size, margin)
+    return {'x': xy[:, 0], 'y': xy[:, 1], 'lane': lanes, 'pos': positions, 'distance': distances}
@@ -0,0 +1,292 @@
+"""Streamlit yeniden çalıştırmaları için aşama bazlı süre/bellek ölçümü
+
+Her yeniden çalıştırmada (rerun) uygulama aşamaları `timer.stage("ad")` ile
+sarılır; süreler ve RSS değişimi kaydedilir, kenar çubuğunda gösterilir ve
+`.sumo_cache/timings.jsonl` dosyasına satır başına bir JSON kayıt olarak
+yazılır. İstenirse bir etkileşim cProfile ile profillenir.
+
+st.rerun()/st.stop() çalıştırmayı istisna ile kestiğinden, bitirilemeyen
+ölçüm bir sonraki çalıştırmanın başında "interrupted" durumuyla yazılır.
+
+Günlük özeti:
+    python perf.py [.sumo_cache/timings.jsonl] [--app addition-app]
+"""
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from sumo_network import DEFAULT_CACHE_DIR
+
+# resource yalnızca Unix'te var; Windows'ta bellek psutil ile (kuruluysa) okunur
+try:
+    import resource
+except ImportError:
+    resource = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_LOG_PATH = os.environ.get("SUMO_TIMING_LOG", os.path.join(DEFAULT_CACHE_DIR, "timings.jsonl"))
+PROFILE_DIR = os.path.join(DEFAULT_CACHE_DIR, "profiles")
+# Günlük bu boyutu aşınca .1 uzantısıyla döndürülür
+MAX_LOG_BYTES = 20 * 1024 * 1024
+# Kenar çubuğunda ortalaması gösterilen son çalıştırma sayısı
+HISTORY_SIZE = 20
+PROFILE_LINES = 25
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_mb():
+    """Sürecin anlık bellek kullanımı (MB); /proc yoksa psutil, o da yoksa tepe değer (ölçülemezse None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1e6
+    except OSError:
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1e6
+    return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """Sürecin tepe bellek kullanımı (MB); ölçülemezse None"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux'ta KB, macOS'ta bayt
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+    if psutil is not None:
+        # Windows'ta tepe çalışma kümesi
+        peak = getattr(psutil.Process().memory_info(), "peak_wset", None)
+        return peak / 1e6 if peak is not None else None
+    return None
+
+
+def _delta(after, before):
+    return None if after is None or before is None else after - before
+
+
+def _mb(value, fmt=".0f"):
+    return "?" if value is None else format(value, fmt)
+
+
+class RerunTimer:
+    """Bir yeniden çalıştırmanın aşamalarını ölçer
+
+    Aşamalar iç içe olabilir; iç aşamanın süresi dıştakine de dahildir
+    (panelde girintiyle gösterilir).
+    """
+
+    def __init__(self, app, session_id, run, log_path=DEFAULT_LOG_PATH, profile=False):
+        self.app = app
+        self.session_id = session_id
+        self.run = run
+        self.log_path = log_path
+        self.stages = []
+        self.finished = False
+        self.profile_path = None
+        self._depth = 0
+        self._start = time.perf_counter()
+        self._rss_start = rss_mb()
+        self._profiler = None
+        if profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    @contextmanager
+    def stage(self, name):
+        record = {'name': name, 'depth': self._depth, 'seconds': None, 'rss_delta_mb': None}
+        self.stages.append(record)
+        self._depth += 1
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            record['rss_delta_mb'] = _delta(rss_mb(), rss_before)
+            self._depth -= 1
+
+    @property
+    def total(self):
+        return time.perf_counter() - self._start
+
+    def finish(self, status="ok"):
+        """Ölçümü bitirir, profili döker ve kaydı günlüğe yazar (bir kez)"""
+        if self.finished:
+            return None
+        self.finished = True
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.profile_path = dump_profile(self._profiler, f"{self.app}_{self.session_id}_{self.run}")
+            self._profiler = None
+        record = {
+            'ts': datetime.now().isoformat(timespec="seconds"),
+            'app': self.app,
+            'session': self.session_id,
+            'run': self.run,
+            'status': status,
+            'total': self.total,
+            'rss_mb': rss_mb(),
+            'rss_delta_mb': _delta(rss_mb(), self._rss_start),
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': [stage for stage in self.stages if stage['seconds'] is not None],
+            'profile': self.profile_path
+        }
+        write_record(record, self.log_path)
+        return record
+
+
+def dump_profile(profiler, name):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{name}.prof")
+    profiler.dump_stats(path)
+    return path
+
+
+def profile_summary(path, lines=PROFILE_LINES):
+    """Profil dosyasının kümülatif süreye göre ilk satırları"""
+    output = io.StringIO()
+    pstats.Stats(path, stream=output).sort_stats("cumulative").print_stats(lines)
+    return output.getvalue()
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def write_record(record, log_path=DEFAULT_LOG_PATH):
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        if os.path.exists(log_path) and os.path.getsize(log_path) > MAX_LOG_BYTES:
+            os.replace(log_path, f"{log_path}.1")
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError:
+        # Günlük yazılamıyorsa uygulama etkilenmesin
+        pass
+
+
+# --- Streamlit entegrasyonu ---
+
+def start_rerun(app, session_state):
+    """Çalıştırmanın başında çağrılır; önceki bitmemiş ölçümü kapatıp yenisini başlatır"""
+    previous = session_state.get("perf_timer")
+    if previous is not None and not previous.finished:
+        _remember(session_state, previous.finish("interrupted"), previous)
+    if "perf_session" not in session_state:
+        session_state.perf_session = uuid.uuid4().hex[:12]
+    run = session_state.get("perf_run", 0) + 1
+    session_state.perf_run = run
+    profile = session_state.get("perf_profile_next", False)
+    session_state.perf_profile_next = False
+    timer = RerunTimer(app, session_state.perf_session, run, profile=profile)
+    session_state.perf_timer = timer
+    return timer
+
+
+def finish_rerun(timer, session_state):
+    _remember(session_state, timer.finish(), timer)
+
+
+def _remember(session_state, record, timer):
+    if record is None:
+        return
+    history = session_state.setdefault("perf_history", [])
+    history.append(record)
+    del history[:-HISTORY_SIZE]
+    if timer.profile_path:
+        # Özet profil yazıldığında bir kez çıkarılır; panel her çalıştırmada yeniden ayrıştırmaz
+        session_state.perf_last_profile = timer.profile_path
+        session_state.perf_profile_summary = profile_summary(timer.profile_path)
+
+
+def render_panel(timer, session_state):
+    """Kenar çubuğunda bu çalıştırmanın aşama süreleri, son çalıştırmaların ortalaması ve profil"""
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Performans"):
+        st.caption(f"Çalıştırma #{timer.run}: {timer.total * 1000:.0f} ms, "
+                   f"RSS {_mb(rss_mb())} MB (tepe {_mb(peak_rss_mb())} MB)")
+        lines = [f"{'  ' * stage['depth']}{stage['name']}: {stage['seconds'] * 1000:.1f} ms"
+                 f" ({_mb(stage['rss_delta_mb'], '+.1f')} MB)"
+                 for stage in timer.stages if stage['seconds'] is not None]
+        if lines:
+            st.code("\n".join(lines), language=None)
+
+        history = session_state.get("perf_history", [])
+        if history:
+            totals = {}
+            for record in history:
+                for stage in record['stages']:
+                    totals.setdefault(stage['name'], []).append(stage['seconds'])
+            st.caption(f"Son {len(history)} çalıştırmada ortalama / en kötü:")
+            st.code("\n".join(f"{name}: {sum(values) / len(values) * 1000:.1f} / {max(values) * 1000:.1f} ms"
+                              for name, values in totals.items()), language=None)
+
+        if st.button("🔬 Sonraki Etkileşimi Profille", key="perf_profile_button"):
+            session_state.perf_profile_next = True
+            st.info("Bir sonraki etkileşim cProfile ile ölçülecek")
+
+        profile_path = session_state.get("perf_last_profile")
+        if profile_path and os.path.exists(profile_path):
+            st.caption(f"Son profil: `{profile_path}`")
+            # Dosya yalnızca indirme butonuna basıldığında okunur
+            st.download_button("📥 Profili İndir (.prof)", lambda: _read_bytes(profile_path),
+                               file_name=os.path.basename(profile_path), key="perf_profile_download")
+            st.code(session_state.get("perf_profile_summary", ""), language=None)
+
+
+# --- Günlük özeti ---
+
+def summarize(records):
+    """{(uygulama, aşama): [süreler]} -> sayı, ortalama, p50, p95, en kötü (ms)"""
+    values = {}
+    for record in records:
+        values.setdefault((record['app'], "total"), []).append(record['total'])
+        for stage in record['stages']:
+            values.setdefault((record['app'], stage['name']), []).append(stage['seconds'])
+    summary = {}
+    for key, seconds in values.items():
+        seconds = sorted(seconds)
+        count = len(seconds)
+        summary[key] = {
+            'count': count,
+            'mean_ms': sum(seconds) / count * 1000,
+            'p50_ms': seconds[count // 2] * 1000,
+            'p95_ms': seconds[min(count - 1, int(count * 0.95))] * 1000,
+            'max_ms': seconds[-1] * 1000
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aşama süresi günlüğünün özeti")
+    parser.add_argument("log", nargs="?", default=DEFAULT_LOG_PATH)
+    parser.add_argument("--app", help="Yalnızca bu uygulamanın kayıtları")
+    args = parser.parse_args(argv)
+
+    with open(args.log, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if args.app:
+        records = [record for record in records if record['app'] == args.app]
+    print(f"{len(records)} çalıştırma")
+    print(f"{'uygulama':16s} {'aşama':16s} {'sayı':>6s} {'ort.':>9s} {'p50':>9s} {'p95':>9s} {'en kötü':>9s}")
+    for (app, stage), row in sorted(summarize(records).items()):
+        print(f"{app:16s} {stage:16s} {row['count']:6d} {row['mean_ms']:9.1f} {row['p50_ms']:9.1f} "
+              f"{row['p95_ms']:9.1f} {row['max_ms']:9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
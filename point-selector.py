@@ -1,15 +1,24 @@
 import streamlit as st
 import folium
 from streamlit_folium import st_folium
-import pandas as pd
-import xml.etree.ElementTree as ET
-import xml.dom.minidom
 import math
-import json
 from datetime import datetime
-import io
 import os
-import sumolib
+import sumo_network
+import map_layers
+import perf
+import point_import
+import point_store
+import snap_memo
+import sumo_stops
+import upload_cache
+
+# Nokta listesinde sayfa başına gösterilecek kayıt sayısı
+LIST_PAGE_SIZE = 50
+# XML önizlemesinde gösterilecek en fazla nokta sayısı
+PREVIEW_POINTS = 50
+# Kalıcı nokta deposundaki projeler uygulama ve ağ hash'i ile ayrılır
+APP_NAME = "point-selector"
 
 # Sayfa konfigürasyonu
 st.set_page_config(
@@ -18,9 +27,11 @@ st.set_page_config(
     layout="wide"
 )
 
-# Session state başlatma
+# Session state başlatma (noktalar ağ belirlendikten sonra projeden yüklenir)
 if 'points' not in st.session_state:
     st.session_state.points = []
+if 'project_net' not in st.session_state:
+    st.session_state.project_net = None
 if 'bounds' not in st.session_state:
     st.session_state.bounds = None
 if 'map_center' not in st.session_state:
@@ -32,6 +43,51 @@ if 'show_add_form' not in st.session_state:
 if 'net_file_path' not in st.session_state:
     st.session_state.net_file_path = None
 
+@st.cache_resource
+def get_point_store():
+    """Süreç genelinde paylaşılan kalıcı nokta deposu"""
+    return point_store.PointStore()
+
+def load_project(net_key, project_id, name):
+    """Projenin noktalarını depodan oturuma yükle"""
+    st.session_state.project_net = net_key
+    st.session_state.project_id = project_id
+    st.session_state.project_name = name
+    st.session_state.points = get_point_store().load(project_id)
+
+def ensure_project(net_key):
+    """Ağ değiştiyse o ağın son kullanılan (yoksa varsayılan) projesine geç"""
+    if st.session_state.project_net == net_key:
+        return
+    projects = get_point_store().list_projects(APP_NAME, net_key)
+    if projects:
+        load_project(net_key, projects[0]['id'], projects[0]['name'])
+    else:
+        load_project(net_key, get_point_store().open_project(APP_NAME, net_key), point_store.DEFAULT_PROJECT)
+
+# Nokta listesi yalnızca aşağıdaki fonksiyonlarla değiştirilir; her değişiklik depoya artımlı olarak yazılır
+
+def add_points(points):
+    get_point_store().add(st.session_state.project_id, points)
+    st.session_state.points.extend(points)
+
+def remove_point(i):
+    point = st.session_state.points.pop(i)
+    get_point_store().delete(st.session_state.project_id, [point.get('uid')])
+
+def clear_points():
+    get_point_store().clear(st.session_state.project_id)
+    st.session_state.points = []
+
+def page_range(total, key):
+    """Uzun listeler için sayfa seçici; gösterilecek indeks aralığını döndürür"""
+    pages = max(1, math.ceil(total / LIST_PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Sayfa (1-{pages})", min_value=1, max_value=pages, value=1, key=key)
+    start = (page - 1) * LIST_PAGE_SIZE
+    return range(start, min(total, start + LIST_PAGE_SIZE))
+
 def calculate_distance(lat1, lon1, lat2, lon2):
     """İki nokta arasındaki mesafeyi hesaplar (Haversine formülü)"""
     R = 6371000  # Dünya yarıçapı (metre)
@@ -49,78 +105,38 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     
     return R * c
 
-def get_nearest_edge_from_sumo(lat, lon, net_file_path):
-    """SUMO ağ dosyasından en yakın edge'i bulur"""
+@st.cache_resource(max_entries=4)
+def start_network_load(net_file_path, net_digest):
+    """Ağı arka planda paylaşılan önbelleğe yükle (aynı içerik için bir kez)"""
+    return sumo_network.NetworkLoader(net_file_path)
+
+def get_nearest_edge_from_sumo(lat, lon, net_file_path, point_type=None):
+    """SUMO ağ dosyasından en yakın edge'i bulur
+
+    Nokta, durak türünün araç sınıfına (containerStop: truck, chargingStation:
+    evehicle) izin veren en yakın şeride eşlenir; konum, şerit segmentine tam
+    izdüşüm ile hesaplanır.
+    """
     try:
         if not os.path.exists(net_file_path):
             return None
             
-        # SUMO ağını yükle
-        net = sumolib.net.readNet(net_file_path)
-        
-        # Lat/Lon'u UTM koordinatlarına dönüştür
-        x, y = net.convertLonLat2XY(lon, lat)
-        
-        # En yakın edge'i bul
-        edges = net.getNeighboringEdges(x, y, r=100)  # 100 metre yarıçap
-        
-        if not edges:
-            # Daha geniş arama yap
-            edges = net.getNeighboringEdges(x, y, r=500)
-        
-        if edges:
-            # En yakın edge'i seç
-            closest_edge = min(edges, key=lambda edge_dist: edge_dist[1])
-            edge = closest_edge[0]
-            
-            # Lane ID oluştur (ilk lane'i seç)
-            lane_id = edge.getID() + "_0"
-            
-            # Edge üzerindeki pozisyonu hesapla
-            edge_shape = edge.getShape()
-            min_dist = float('inf')
-            best_pos = 0.0
-            
-            for i, point in enumerate(edge_shape):
-                dist = math.sqrt((point[0] - x)**2 + (point[1] - y)**2)
-                if dist < min_dist:
-                    min_dist = dist
-                    # Pozisyonu edge başlangıcından mesafe olarak hesapla
-                    if i == 0:
-                        best_pos = 0.0
-                    else:
-                        # Edge başlangıcından bu noktaya kadar olan mesafe
-                        total_dist = 0.0
-                        for j in range(i):
-                            p1 = edge_shape[j]
-                            p2 = edge_shape[j + 1]
-                            total_dist += math.sqrt((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)
-                        best_pos = total_dist
-            
-            # StartPos ve EndPos hesapla
-            start_pos = max(0.0, best_pos - 5.0)  # 5 metre öncesinden
-            end_pos = min(edge.getLength(), best_pos + 5.0)  # 5 metre sonrasına kadar
-            
-            return {
-                'lane': lane_id,
-                'edge_id': edge.getID(),
-                'startPos': round(start_pos, 2),
-                'endPos': round(end_pos, 2),
-                'edge_length': edge.getLength(),
-                'distance_to_edge': round(min_dist, 2)
-            }
+        # SUMO ağını paylaşılan önbellekten al (dosya içeriği değişmedikçe yeniden okunmaz;
+        # arka planda yükleniyorsa yüklemenin bitmesi beklenir)
+        net = sumo_network.get_network(net_file_path)
         
-        return None
+        # Aynı (veya ~0.1 m yakın) koordinat daha önce eşlendiyse sonuç kalıcı önbellekten gelir
+        return sumo_stops.nearest_stop_location(net, lat, lon, point_type, memo=snap_memo.snap_memo)
         
     except Exception as e:
         st.error(f"SUMO ağ dosyası işlenirken hata: {str(e)}")
         return None
 
-def get_nearest_road(lat, lon):
+def get_nearest_road(lat, lon, point_type=None):
     """Koordinatlar için en yakın yol bilgisini bulur"""
     # SUMO ağ dosyası yolunu session state'den al
     if 'net_file_path' in st.session_state and st.session_state.net_file_path:
-        sumo_result = get_nearest_edge_from_sumo(lat, lon, st.session_state.net_file_path)
+        sumo_result = get_nearest_edge_from_sumo(lat, lon, st.session_state.net_file_path, point_type)
         if sumo_result:
             return sumo_result
     
@@ -134,46 +150,6 @@ def get_nearest_road(lat, lon):
         'distance_to_edge': 0.0
     }
 
-def create_sumo_xml(points_list):
-    """SUMO XML formatında dosya oluşturur"""
-    root = ET.Element("additional")
-    root.set("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
-    root.set("xsi:noNamespaceSchemaLocation", "http://sumo.dlr.de/xsd/additional_file.xsd")
-    
-    # Yorum ekle
-    comment = ET.Comment(f" Generated by SUMO Point Mapper on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ")
-    root.insert(0, comment)
-    
-    container_id = 1
-    charging_id = 1
-    
-    for point in points_list:
-        if point['type'] == 'containerStop':
-            element = ET.SubElement(root, "containerStop")
-            element.set("id", str(container_id))
-            if point['name']:
-                element.set("name", point['name'])
-            element.set("lane", point['lane'])
-            element.set("startPos", str(point['startPos']))
-            element.set("endPos", str(point['endPos']))
-            container_id += 1
-            
-        elif point['type'] == 'chargingStation':
-            element = ET.SubElement(root, "chargingStation")
-            element.set("id", f"cs{charging_id}")
-            if point['name']:
-                element.set("name", point['name'])
-            element.set("lane", point['lane'])
-            element.set("startPos", str(point['startPos']))
-            element.set("endPos", str(point['endPos']))
-            element.set("power", "200000.00")
-            charging_id += 1
-    
-    # XML'i güzel formatla
-    rough_string = ET.tostring(root, encoding='unicode')
-    reparsed = xml.dom.minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent="    ")
-
 def create_map():
     """Harita oluşturur"""
     m = folium.Map(
@@ -192,6 +168,18 @@ def create_map():
             popup="Çalışma Alanı Sınırları"
         ).add_to(m)
     
+    # Çok sayıda nokta kümelenerek çizilir; popup'lar yalnızca açıldığında üretilir
+    if len(st.session_state.points) > map_layers.CLUSTER_THRESHOLD:
+        rows = [
+            [point['lat'], point['lon'],
+             'blue' if point['type'] == 'containerStop' else 'green',
+             f"{point['name'] or 'İsimsiz'} ({point['type']})",
+             i + 1, point['type']]
+            for i, point in enumerate(st.session_state.points)
+        ]
+        map_layers.add_point_cluster(m, rows, ["ID", "Type"])
+        return m
+    
     # Mevcut noktaları haritaya ekle
     for i, point in enumerate(st.session_state.points):
         color = 'blue' if point['type'] == 'containerStop' else 'green'
@@ -219,38 +207,88 @@ def main():
         st.subheader("📁 SUMO Ağ Dosyası")
         
         uploaded_net = st.file_uploader(
-            "SUMO .net.xml dosyası seçin",
-            type=['xml'],
-            help="SUMO ağ dosyası yükleyerek doğru edge ID ve pozisyon bilgilerini alın"
+            "SUMO ağ dosyası seçin (.net.xml / .net.xml.gz)",
+            type=['xml', 'gz'],
+            help=f"SUMO ağ dosyası yükleyerek doğru edge ID ve pozisyon bilgilerini alın (en fazla {upload_cache.MAX_UPLOAD_MB} MB)"
         )
         
-        if uploaded_net is not None:
-            # Geçici dosya oluştur
-            temp_net_path = f"temp_net_{uploaded_net.name}"
-            with open(temp_net_path, "wb") as f:
-                f.write(uploaded_net.getbuffer())
-            
-            st.session_state.net_file_path = temp_net_path
-            st.success(f"Ağ dosyası yüklendi: {uploaded_net.name}")
-            
-            # Dosya bilgilerini göster
+        # Dosya seçildiğinde bir kez, içerik hash'iyle adlandırılarak paylaşılan önbelleğe yazılır;
+        # aynı ağ başka bir adla ya da başka bir kullanıcı tarafından yüklenmişse yeniden yazılmaz
+        if uploaded_net is not None and st.session_state.get('uploaded_net_id') != uploaded_net.file_id:
+            st.session_state.uploaded_net_id = uploaded_net.file_id
             try:
-                net = sumolib.net.readNet(temp_net_path)
-                st.info(f"📊 Ağ İstatistikleri:\n- Edge sayısı: {len(net.getEdges())}\n- Intersection sayısı: {len(net.getNodes())}")
-            except Exception as e:
-                st.error(f"Ağ dosyası okunamadı: {str(e)}")
+                with timer.stage("upload"):
+                    st.session_state.net_file_path, _ = upload_cache.store_upload(uploaded_net, uploaded_net.size)
+                st.session_state.net_file_name = uploaded_net.name
+            except ValueError as e:
+                st.error(f"Ağ dosyası yüklenemedi: {e}")
                 st.session_state.net_file_path = None
         
-        elif st.session_state.net_file_path:
-            st.info("✅ Ağ dosyası yüklü")
-            if st.button("🗑️ Ağ Dosyasını Kaldır"):
-                if os.path.exists(st.session_state.net_file_path):
-                    os.remove(st.session_state.net_file_path)
+        # Önbellek temizliğinde silinmiş olabilir
+        if st.session_state.net_file_path and not os.path.exists(st.session_state.net_file_path):
+            st.warning("⚠️ Ağ dosyası önbellekten silinmiş, lütfen yeniden yükleyin.")
+            st.session_state.net_file_path = None
+            st.session_state.uploaded_net_id = None
+        
+        if st.session_state.net_file_path:
+            upload_cache.touch(st.session_state.net_file_path)
+            st.success(f"Ağ dosyası yüklendi: {st.session_state.get('net_file_name', '')}")
+            
+            # Ağ arka planda yüklenir (önbellekte varsa yeniden okunmaz); arayüz bu sırada kullanılabilir
+            with timer.stage("network_load"):
+                net_digest = sumo_network.file_sha256(st.session_state.net_file_path)
+                loader = start_network_load(st.session_state.net_file_path, net_digest)
+            if loader.done():
+                try:
+                    net = loader.result()
+                    st.info(f"📊 Ağ İstatistikleri:\n- Edge sayısı: {net.edge_count()}\n- Intersection sayısı: {net.node_count()}")
+                except Exception as e:
+                    st.error(f"Ağ dosyası okunamadı: {str(e)}")
+                    # Başarısız yükleyici önbellekte kalmasın; dosya yeniden seçilince (veya aynı
+                    # içerik yeniden yüklenince) yükleme baştan denenir
+                    start_network_load.clear(st.session_state.net_file_path, net_digest)
+                    st.session_state.net_file_path = None
+                    st.session_state.uploaded_net_id = None
+            else:
+                @st.fragment(run_every=0.5)
+                def network_progress():
+                    if loader.done():
+                        st.rerun()
+                    st.progress(loader.fraction, text=f"⏳ {loader.message}...")
+                network_progress()
+            
+            # Dosya önbellekte paylaşıldığından silinmez, yalnızca bu oturumdan kaldırılır
+            if uploaded_net is None and st.button("🗑️ Ağ Dosyasını Kaldır"):
                 st.session_state.net_file_path = None
                 st.rerun()
         else:
             st.warning("⚠️ SUMO ağ dosyası yüklenmedi. Varsayılan değerler kullanılacak.")
         
+        # Projeler ağ içeriğine göre ayrılır; ağ yoksa ortak "none" anahtarı kullanılır
+        net_key = "none"
+        if st.session_state.net_file_path:
+            net_key = sumo_network.file_sha256(st.session_state.net_file_path)
+        ensure_project(net_key)
+        
+        # Proje seçimi (noktalar otomatik olarak kaydedilir)
+        st.subheader("💾 Proje")
+        projects = get_point_store().list_projects(APP_NAME, net_key)
+        project_names = [project['name'] for project in projects]
+        selected_project = st.selectbox(
+            "Proje",
+            project_names,
+            index=project_names.index(st.session_state.project_name) if st.session_state.project_name in project_names else 0,
+            format_func=lambda name: f"{name} ({next(p['points'] for p in projects if p['name'] == name)} nokta)"
+        )
+        if selected_project != st.session_state.project_name:
+            load_project(net_key, next(p['id'] for p in projects if p['name'] == selected_project), selected_project)
+            st.rerun()
+        
+        new_project = st.text_input("Yeni proje adı")
+        if st.button("➕ Proje Oluştur", disabled=not new_project.strip()):
+            load_project(net_key, get_point_store().open_project(APP_NAME, net_key, new_project.strip()), new_project.strip())
+            st.rerun()
+        
         st.markdown("---")
         
         # Sınır belirleme
@@ -295,8 +333,8 @@ def main():
                     return
             
             # Yol bilgisi al
-            with st.spinner("SUMO ağından edge bilgisi alınıyor..."):
-                road_info = get_nearest_road(manual_lat, manual_lon)
+            with st.spinner("SUMO ağından edge bilgisi alınıyor..."), timer.stage("snap"):
+                road_info = get_nearest_road(manual_lat, manual_lon, point_type)
             
             # Nokta ekle
             new_point = {
@@ -312,7 +350,7 @@ def main():
                 'distance_to_edge': road_info.get('distance_to_edge', 0)
             }
             
-            st.session_state.points.append(new_point)
+            add_points([new_point])
             
             # Detaylı bilgi göster
             if st.session_state.net_file_path:
@@ -321,11 +359,58 @@ def main():
             else:
                 st.success(f"Nokta eklendi: {new_point['name']} (Varsayılan değerlerle)")
         
+        # Eşleme önbelleği istatistikleri
+        if st.session_state.net_file_path:
+            snap_stats = snap_memo.snap_memo.stats()
+            st.caption(f"🧠 Eşleme önbelleği: {snap_stats['memory_hits'] + snap_stats['disk_hits']} isabet, "
+                       f"{snap_stats['misses']} ıska (%{snap_stats['hit_rate'] * 100:.0f})")
+        
+        # Toplu içe aktarma
+        st.subheader("📥 Toplu İçe Aktar")
+        bulk_file = st.file_uploader(
+            "CSV / GeoJSON / NDJSON",
+            type=point_import.SUPPORTED_EXTENSIONS,
+            help="CSV için lat, lon ve isteğe bağlı type, name kolonları; GeoJSON için Point özellikleri"
+        )
+        
+        if bulk_file is not None and st.button("Noktaları İçe Aktar"):
+            if not st.session_state.net_file_path:
+                st.warning("Toplu içe aktarma için önce SUMO ağ dosyası yükleyin")
+            else:
+                net = sumo_network.get_network(st.session_state.net_file_path)
+                # Çalışma alanı tanımlıysa onu, değilse ağ sınırlarını kullan
+                if st.session_state.bounds:
+                    (min_lat, min_lon), (max_lat, max_lon) = st.session_state.bounds
+                    bounds = {'min_lat': min_lat, 'max_lat': max_lat, 'min_lon': min_lon, 'max_lon': max_lon}
+                else:
+                    bounds = sumo_network.header_bounds(st.session_state.net_file_path)
+                
+                progress = st.progress(0.0, text="Noktalar eşleniyor...")
+                try:
+                    with timer.stage("bulk_import"):
+                        imported, stats = sumo_stops.import_points(
+                            net, bulk_file, bulk_file.name,
+                            default_type=point_type,
+                            bounds=bounds,
+                            total_bytes=bulk_file.size,
+                            on_progress=lambda fraction, count: progress.progress(
+                                fraction or 0.0, text=f"{count} nokta işlendi")
+                        )
+                    add_points(sumo_stops.name_points(imported, start=len(st.session_state.points) + 1))
+                    
+                    st.success(f"✅ {stats['imported']} / {stats['total']} nokta eklendi")
+                    if stats['invalid'] or stats['out_of_bounds'] or stats['unsnapped']:
+                        st.warning(f"Geçersiz: {stats['invalid']}, sınır dışı: {stats['out_of_bounds']}, "
+                                   f"eşlenemeyen: {stats['unsnapped']}")
+                except Exception as e:
+                    st.error(f"Toplu içe aktarma hatası: {str(e)}")
+        
         # Mevcut noktalar
         st.subheader("📋 Mevcut Noktalar")
         
         if st.session_state.points:
-            for i, point in enumerate(st.session_state.points):
+            for i in page_range(len(st.session_state.points), "points_page"):
+                point = st.session_state.points[i]
                 with st.expander(f"{'🚏' if point['type'] == 'containerStop' else '🔌'} {point['name']}"):
                     st.write(f"**Koordinatlar:** {point['lat']:.6f}, {point['lon']:.6f}")
                     st.write(f"**Edge ID:** {point.get('edge_id', 'N/A')}")
@@ -335,34 +420,45 @@ def main():
                         st.write(f"**Edge'e mesafe:** {point['distance_to_edge']:.2f}m")
                     
                     if st.button("🗑️ Sil", key=f"del_{i}"):
-                        st.session_state.points.pop(i)
+                        remove_point(i)
                         st.rerun()
             
             # Tümünü temizle
             if st.button("🗑️ Tümünü Temizle"):
-                st.session_state.points = []
+                clear_points()
                 st.rerun()
             
             # XML oluştur ve indir
             st.subheader("💾 XML Kaydet")
             
+            compress_xml = st.checkbox("gzip ile sıkıştır (.gz)")
+            
             if st.button("SUMO XML Oluştur"):
                 try:
-                    xml_content = create_sumo_xml(st.session_state.points)
+                    with timer.stage("xml_export"):
+                        xml_bytes = sumo_stops.additional_bytes(
+                            sumo_stops.stop_elements(st.session_state.points),
+                            compress=compress_xml,
+                            comment=sumo_stops.generated_comment()
+                        )
+                    file_name = f"sumo_points_{datetime.now().strftime('%Y%m%d_%H%M%S')}.add.xml"
                     
                     # İndirme butonu
                     st.download_button(
                         label="📥 XML Dosyasını İndir",
-                        data=xml_content,
-                        file_name=f"sumo_points_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xml",
-                        mime="application/xml"
+                        data=xml_bytes,
+                        file_name=file_name + ".gz" if compress_xml else file_name,
+                        mime="application/gzip" if compress_xml else "application/xml"
                     )
                     
                     st.success("XML dosyası hazırlandı!")
                     
-                    # Önizleme
+                    # Önizleme (büyük dosyalarda yalnızca ilk noktalar)
                     with st.expander("XML Önizleme"):
-                        st.code(xml_content, language="xml")
+                        preview_points = st.session_state.points[:PREVIEW_POINTS]
+                        st.code(sumo_stops.create_sumo_xml(preview_points), language="xml")
+                        if len(st.session_state.points) > PREVIEW_POINTS:
+                            st.caption(f"İlk {PREVIEW_POINTS} nokta gösteriliyor")
                 
                 except Exception as e:
                     st.error(f"XML oluşturulurken hata: {str(e)}")
@@ -374,15 +470,17 @@ def main():
     st.header("🗺️ Harita")
     
     # Harita oluştur ve göster
-    map_obj = create_map()
+    with timer.stage("map"):
+        map_obj = create_map()
     
-    # Harita etkileşimi
-    map_data = st_folium(
-        map_obj,
-        key="main_map",
-        use_container_width=True,
-        returned_objects=["last_clicked"]
-    )
+    # Harita etkileşimi (HTML üretimi ve bileşene aktarım)
+    with timer.stage("st_folium"):
+        map_data = st_folium(
+            map_obj,
+            key="main_map",
+            use_container_width=True,
+            returned_objects=["last_clicked"]
+        )
     
     # Tıklama session state'ini kontrol et
     if 'last_clicked_coords' not in st.session_state:
@@ -437,8 +535,8 @@ def main():
             col3a, col3b = st.columns(2)
             with col3a:
                 if st.button("✅ Ekle", key="add_clicked_point"):
-                    with st.spinner("SUMO ağından edge bilgisi alınıyor..."):
-                        road_info = get_nearest_road(st.session_state.clicked_lat, st.session_state.clicked_lon)
+                    with st.spinner("SUMO ağından edge bilgisi alınıyor..."), timer.stage("snap"):
+                        road_info = get_nearest_road(st.session_state.clicked_lat, st.session_state.clicked_lon, form_type)
                     
                     new_point = {
                         'lat': st.session_state.clicked_lat,
@@ -453,7 +551,7 @@ def main():
                         'distance_to_edge': road_info.get('distance_to_edge', 0)
                     }
                     
-                    st.session_state.points.append(new_point)
+                    add_points([new_point])
                     
                     # Detaylı bilgi göster
                     if st.session_state.net_file_path:
@@ -513,16 +611,10 @@ def main():
         - Edge'e olan mesafe bilgisi gösterilir
         - Koordinatlar UTM formatına dönüştürülür
         """)
-        
-        # Temizlik işlemi
-        if st.button("🧹 Geçici Dosyaları Temizle"):
-            temp_files = [f for f in os.listdir('.') if f.startswith('temp_net_')]
-            for temp_file in temp_files:
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
-            st.success("Geçici dosyalar temizlendi!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Bu çalıştırmanın aşama süreleri (kenar çubuğundaki "⏱️ Performans" paneli ve günlük)
+    timer = perf.start_rerun(APP_NAME, st.session_state)
+    main()
+    perf.render_panel(timer, st.session_state)
+    perf.finish_rerun(timer, st.session_state)
\ No newline at end of file
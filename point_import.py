@@ -0,0 +1,269 @@
+import csv
+import io
+import json
+import os
+
+import numpy as np
+
+import sumo_network
+
+POINT_TYPES = ('containerStop', 'chargingStation')
+
+# CSV / NDJSON / GeoJSON özelliklerinde tanınan kolon adları
+LAT_KEYS = ('lat', 'latitude', 'enlem')
+LON_KEYS = ('lon', 'lng', 'long', 'longitude', 'boylam')
+
+# Desteklenen dosya uzantıları
+SUPPORTED_EXTENSIONS = ['csv', 'geojson', 'json', 'ndjson', 'jsonl']
+
+DEFAULT_BATCH_SIZE = 5000
+# Paralel eşlemede süreç başlatma maliyetini karşılamak için daha büyük parçalar
+# (eşleme belleği LaneIndex.MAX_BLOCK_PAIRS ile sınırlı, parça boyutuyla büyümez)
+PARALLEL_BATCH_SIZE = 200000
+
+
+def _first_key(record, keys):
+    """Kayıtta (büyük/küçük harf duyarsız) ilk bulunan anahtarın değerini döndürür"""
+    lowered = {str(key).strip().lower(): value for key, value in record.items()}
+    for key in keys:
+        if key in lowered and lowered[key] not in (None, ''):
+            return lowered[key]
+    return None
+
+
+def _candidate(lat, lon, properties):
+    """Ham değerlerden aday nokta üretir; geçersizse None döndürür"""
+    try:
+        lat = float(lat)
+        lon = float(lon)
+    except (TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        return None
+    point_type = _first_key(properties, ('type', 'tip'))
+    name = _first_key(properties, ('name', 'ad', 'isim'))
+    return {
+        'lat': lat,
+        'lon': lon,
+        'type': point_type if point_type in POINT_TYPES else None,
+        'name': str(name) if name is not None else ''
+    }
+
+
+def _from_record(record):
+    """Düz bir sözlükten (CSV satırı, NDJSON nesnesi) veya GeoJSON Feature'dan aday üretir"""
+    if not isinstance(record, dict):
+        return None
+    if record.get('type') == 'Feature':
+        geometry = record.get('geometry') or {}
+        coordinates = geometry.get('coordinates')
+        if geometry.get('type') != 'Point' or not isinstance(coordinates, list) or len(coordinates) < 2:
+            return None
+        return _candidate(coordinates[1], coordinates[0], record.get('properties') or {})
+    return _candidate(_first_key(record, LAT_KEYS), _first_key(record, LON_KEYS), record)
+
+
+def iter_csv(text_stream):
+    """CSV dosyasını satır satır okuyup aday noktalar üretir (geçersiz satırlar için None)"""
+    for row in csv.DictReader(text_stream):
+        yield _from_record(row)
+
+
+def iter_ndjson(text_stream):
+    """Her satırında bir JSON nesnesi olan dosyayı satır satır okur"""
+    for line in text_stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield _from_record(json.loads(line))
+        except json.JSONDecodeError:
+            yield None
+
+
+def iter_geojson(text_stream, chunk_size=1 << 16):
+    """GeoJSON FeatureCollection'ın 'features' dizisini, tüm dosyayı belleğe almadan öğe öğe çözer"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+
+    def fill():
+        nonlocal buffer, eof
+        chunk = text_stream.read(chunk_size)
+        if chunk:
+            buffer += chunk
+        else:
+            eof = True
+
+    # "features": [ başlangıcını bul
+    start = -1
+    while start < 0:
+        key = buffer.find('"features"')
+        if key >= 0:
+            start = buffer.find('[', key)
+        if start < 0:
+            if eof:
+                raise ValueError("GeoJSON dosyasında 'features' dizisi bulunamadı")
+            fill()
+    buffer = buffer[start + 1:]
+
+    while True:
+        # Virgül ve boşlukları atla
+        index = 0
+        while index < len(buffer) and buffer[index] in ' \t\r\n,':
+            index += 1
+        buffer = buffer[index:]
+        if not buffer:
+            if eof:
+                raise ValueError("GeoJSON dosyası beklenmedik şekilde bitti")
+            fill()
+            continue
+        if buffer[0] == ']':
+            return
+        try:
+            feature, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("GeoJSON dosyası bozuk")
+            # Nesne henüz tamamlanmadı: daha fazla oku
+            fill()
+            continue
+        buffer = buffer[end:]
+        yield _from_record(feature)
+
+
+def detect_format(file_name):
+    """Dosya uzantısından biçimi belirler"""
+    extension = os.path.splitext(file_name.lower())[1].lstrip('.')
+    if extension == 'csv':
+        return 'csv'
+    if extension in ('ndjson', 'jsonl'):
+        return 'ndjson'
+    if extension in ('geojson', 'json'):
+        return 'geojson'
+    raise ValueError(f"Desteklenmeyen dosya türü: {file_name}")
+
+
+def iter_candidates(binary_stream, file_name):
+    """İkili dosya akışından, biçime göre aday noktaları akış halinde üretir"""
+    file_format = detect_format(file_name)
+    readers = {'csv': iter_csv, 'ndjson': iter_ndjson, 'geojson': iter_geojson}
+    text_stream = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+    try:
+        yield from readers[file_format](text_stream)
+    finally:
+        # Alttaki akışı kapatmadan sarmalayıcıyı ayır
+        text_stream.detach()
+
+
+def iter_batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def in_bounds(lat, lon, bounds):
+    """bounds: min_lat/max_lat/min_lon/max_lon anahtarlı sözlük"""
+    return ((lat >= bounds['min_lat']) & (lat <= bounds['max_lat']) &
+            (lon >= bounds['min_lon']) & (lon <= bounds['max_lon']))
+
+
+def snap_candidates(net, candidates, default_type, workers=1):
+    """Aday noktaları vektörel olarak eşler; her aday için sonuç sözlüğü (eşlenemezse None) döndürür
+
+    workers > 1 ise eşleme karolara bölünüp süreç havuzunda yapılır.
+    """
+    if workers > 1:
+        import parallel_snap
+
+        def snap_points(lonlat, vclass):
+            return parallel_snap.snap_points_parallel(net, lonlat, vclass, workers=workers)
+    else:
+        snap_points = net.snap_points
+
+    results = [None] * len(candidates)
+    types = [candidate['type'] or default_type for candidate in candidates]
+    lonlat = np.array([(candidate['lon'], candidate['lat']) for candidate in candidates], dtype=np.float64)
+
+    # Her durak türü kendi araç sınıfına izin veren şeritlere eşlenir
+    for point_type in set(types):
+        members = np.array([i for i, t in enumerate(types) if t == point_type])
+        vclass = sumo_network.STOP_VEHICLE_CLASSES.get(point_type)
+        snapped = snap_points(lonlat[members], vclass)
+        if vclass and (snapped['lane'] < 0).any():
+            # Bu sınıfa izin veren şerit yoksa herhangi bir şerit
+            fallback = snap_points(lonlat[members], None)
+            for key in snapped:
+                snapped[key] = np.where(snapped['lane'] < 0, fallback[key], snapped[key])
+
+        for j, i in enumerate(members.tolist()):
+            lane = int(snapped['lane'][j])
+            if lane < 0:
+                continue
+            results[i] = {
+                'lat': candidates[i]['lat'],
+                'lon': candidates[i]['lon'],
+                'type': point_type,
+                'name': candidates[i]['name'],
+                'x': float(snapped['x'][j]),
+                'y': float(snapped['y'][j]),
+                'lane': str(net.lane_ids[lane]),
+                'edge_id': str(net.edge_ids[net.lane_edge[lane]]),
+                'pos': float(snapped['pos'][j]),
+                'lane_length': float(net.lane_length[lane]),
+                'distance': float(snapped['distance'][j])
+            }
+    return results
+
+
+def bulk_import(binary_stream, file_name, net, bounds=None, default_type='containerStop',
+                batch_size=None, total_bytes=None, on_progress=None, workers=1):
+    """Büyük aday nokta dosyasını akış halinde okuyup toplu olarak ağa eşler
+
+    Dosya `batch_size` büyüklüğünde parçalar halinde okunur ve her parça tek
+    seferde eşlenir. `bounds` verilirse dışında kalan noktalar reddedilir.
+    `on_progress(oran, işlenen_sayısı)` her parçadan sonra çağrılır.
+    `workers` > 1 ise her parça parallel_snap ile süreç havuzunda eşlenir.
+
+    Dönüş: (eşlenen noktalar listesi, istatistik sözlüğü)
+    """
+    if batch_size is None:
+        batch_size = PARALLEL_BATCH_SIZE if workers > 1 else DEFAULT_BATCH_SIZE
+    stats = {'total': 0, 'invalid': 0, 'out_of_bounds': 0, 'unsnapped': 0, 'imported': 0}
+    imported = []
+
+    for batch in iter_batches(iter_candidates(binary_stream, file_name), batch_size):
+        stats['total'] += len(batch)
+        candidates = [candidate for candidate in batch if candidate is not None]
+        stats['invalid'] += len(batch) - len(candidates)
+
+        if bounds and candidates:
+            lat = np.array([candidate['lat'] for candidate in candidates])
+            lon = np.array([candidate['lon'] for candidate in candidates])
+            inside = in_bounds(lat, lon, bounds)
+            stats['out_of_bounds'] += int((~inside).sum())
+            candidates = [candidate for candidate, ok in zip(candidates, inside.tolist()) if ok]
+
+        if candidates:
+            for result in snap_candidates(net, candidates, default_type, workers):
+                if result is None:
+                    stats['unsnapped'] += 1
+                else:
+                    imported.append(result)
+
+        if on_progress:
+            fraction = None
+            if total_bytes:
+                try:
+                    fraction = min(binary_stream.tell() / total_bytes, 1.0)
+                except (OSError, ValueError):
+                    fraction = None
+            on_progress(fraction, stats['total'])
+
+    stats['imported'] = len(imported)
+    return imported, stats
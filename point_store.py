@@ -0,0 +1,160 @@
+"""Seçilen noktalar için kalıcı, artımlı yazılan SQLite deposu
+
+Her ağ (içerik hash'i) için birden fazla adlandırılmış proje tutulur. Noktalar
+ve tıklama geçmişi ayrı satırlarda saklanır; ekleme ve silme yalnızca ilgili
+satırlara dokunur, böylece binlerce noktalı oturumlar her değişiklikte baştan
+yazılmaz ve sunucu yeniden başlasa da kaybolmaz.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_STORE_PATH = os.environ.get(
+    "SUMO_POINT_STORE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "sumo_points.sqlite")
+)
+DEFAULT_PROJECT = "varsayılan"
+
+# Satır türleri
+POINT = "point"
+CLICK = "click"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    app TEXT NOT NULL,
+    net TEXT NOT NULL,
+    name TEXT NOT NULL,
+    created TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    UNIQUE (app, net, name)
+);
+CREATE TABLE IF NOT EXISTS points (
+    uid INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS points_by_project ON points (project_id, kind, uid);
+"""
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class PointStore:
+    """Proje ve nokta tabloları üzerinde ince bir katman
+
+    Noktalar sözlük olarak saklanır; depoya eklenen her sözlüğe satır kimliği
+    'uid' anahtarıyla yazılır ve silme bu kimlikle yapılır.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(_SCHEMA)
+
+    def _write(self, sql_statements):
+        """(sql, parametreler) listesini tek bir işlemde çalıştırır"""
+        with self._lock, self._db:
+            cursor = self._db.cursor()
+            for sql, params in sql_statements:
+                cursor.execute(sql, params)
+            return cursor
+
+    # Projeler
+
+    def open_project(self, app, net, name=DEFAULT_PROJECT):
+        """Projeyi döndürür; yoksa oluşturur. Dönüş: proje kimliği"""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO projects (app, net, name, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (app, net, name, _now(), _now())
+            )
+            return self._db.execute(
+                "SELECT id FROM projects WHERE app = ? AND net = ? AND name = ?", (app, net, name)
+            ).fetchone()[0]
+
+    def list_projects(self, app, net):
+        """Ağa ait projeler: [{'id', 'name', 'updated', 'points'}] (son güncellenen önce)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT p.id, p.name, p.updated, "
+                "(SELECT COUNT(*) FROM points WHERE project_id = p.id AND kind = ?) "
+                "FROM projects p WHERE app = ? AND net = ? ORDER BY p.updated DESC",
+                (POINT, app, net)
+            ).fetchall()
+        return [{'id': row[0], 'name': row[1], 'updated': row[2], 'points': row[3]} for row in rows]
+
+    def _touch(self, project_id):
+        return ("UPDATE projects SET updated = ? WHERE id = ?", (_now(), project_id))
+
+    # Noktalar
+
+    def load(self, project_id, kind=POINT):
+        """Projedeki noktaları ekleme sırasıyla (uid ile) döndürür"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT uid, data FROM points WHERE project_id = ? AND kind = ? ORDER BY uid",
+                (project_id, kind)
+            ).fetchall()
+        points = []
+        for uid, data in rows:
+            point = json.loads(data)
+            point['uid'] = uid
+            points.append(point)
+        return points
+
+    def _insert(self, cursor, project_id, points, kind):
+        # Tek işlem içinde ardışık eklemeler en büyük uid'den başlayarak sırayla numaralanır
+        first_uid = cursor.execute("SELECT COALESCE(MAX(uid), 0) + 1 FROM points").fetchone()[0]
+        rows = []
+        for uid, point in enumerate(points, start=first_uid):
+            data = json.dumps({key: value for key, value in point.items() if key != 'uid'}, ensure_ascii=False)
+            rows.append((uid, project_id, kind, data))
+            point['uid'] = uid
+        cursor.executemany("INSERT INTO points (uid, project_id, kind, data) VALUES (?, ?, ?, ?)", rows)
+        cursor.execute(*self._touch(project_id))
+
+    def add(self, project_id, points, kind=POINT):
+        """Noktaları tek işlemde ekler ve her sözlüğe 'uid' yazar"""
+        if points:
+            with self._lock, self._db:
+                self._insert(self._db.cursor(), project_id, points, kind)
+        return points
+
+    def delete(self, project_id, uids):
+        uids = [uid for uid in uids if uid is not None]
+        if not uids:
+            return
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM points WHERE uid = ? AND project_id = ?", [(uid, project_id) for uid in uids]
+            )
+            self._db.execute(*self._touch(project_id))
+
+    def clear(self, project_id, kind=POINT):
+        self._write([
+            ("DELETE FROM points WHERE project_id = ? AND kind = ?", (project_id, kind)),
+            self._touch(project_id)
+        ])
+
+    def replace(self, project_id, points, kind=POINT):
+        """Projedeki tüm noktaları tek işlemde verilenlerle değiştirir (JSON içe aktarma gibi)"""
+        with self._lock, self._db:
+            cursor = self._db.cursor()
+            cursor.execute("DELETE FROM points WHERE project_id = ? AND kind = ?", (project_id, kind))
+            self._insert(cursor, project_id, points, kind)
+        return points
+
+    def close(self):
+        with self._lock:
+            self._db.close()
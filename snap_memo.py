@@ -0,0 +1,147 @@
+"""Nokta -> şerit eşleme sonuçları için kalıcı önbellek
+
+Anahtar: (ağ içerik hash'i, kuantalanmış lon/lat, araç sınıfı). Tablo adı
+eşleme sürümünü (SNAP_VERSION) içerir; eşleme davranışı değişince eski
+sonuçlar okunmaz ve eski tablolar silinir. Sonuçlar
+bellekteki bir LRU'da ve `.sumo_cache/snap_memo.sqlite` dosyasında tutulur;
+böylece yeniden yüklenen oturumlar ve tekrar içe aktarılan nokta listeleri
+aynı koordinatları yeniden eşlemez. Bulunamayan eşlemeler de saklanır.
+"""
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from sumo_network import DEFAULT_CACHE_DIR
+
+# Eşleme algoritması veya parametreleri (şerit seçimi, araç sınıfı geri dönüşü,
+# arama yarıçapı, kuantalama) değiştiğinde artırılır
+SNAP_VERSION = 2
+SNAP_TABLE = f"snaps_v{SNAP_VERSION}"
+
+# Koordinatlar bu adımla (derece) kuantalanır; 1e-6° ≈ 0.1 m
+DEFAULT_QUANTUM = 1e-6
+DEFAULT_MEMORY_ENTRIES = 100000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    net TEXT NOT NULL,
+    qlon INTEGER NOT NULL,
+    qlat INTEGER NOT NULL,
+    vclass TEXT NOT NULL,
+    lane_id TEXT,
+    edge_id TEXT,
+    pos REAL,
+    lane_length REAL,
+    distance REAL,
+    PRIMARY KEY (net, qlon, qlat, vclass)
+) WITHOUT ROWID
+""".format(table=SNAP_TABLE)
+
+_FIELDS = ('lane_id', 'edge_id', 'pos', 'lane_length', 'distance')
+
+
+def nearest_lane(net, lon, lat, vclass=None):
+    """Noktaya en yakın şerit (vclass'a izin veren yoksa herhangi biri); bulunamazsa None"""
+    x, y = net.convertLonLat2XY(lon, lat)
+    lanes = net.nearest_lanes(x, y, k=1, vclass=vclass)
+    if not lanes and vclass:
+        lanes = net.nearest_lanes(x, y, k=1)
+    return lanes[0] if lanes else None
+
+
+class SnapMemo:
+    """SQLite destekli, önünde bellek içi LRU bulunan eşleme önbelleği"""
+
+    def __init__(self, path=None, quantum=DEFAULT_QUANTUM, max_entries=DEFAULT_MEMORY_ENTRIES):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "snap_memo.sqlite")
+        self.quantum = quantum
+        self.max_entries = max_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connection(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            # Önceki eşleme sürümlerinin tabloları (sürümsüz "snaps" dahil)
+            for (table,) in self._db.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'snaps%'").fetchall():
+                if table != SNAP_TABLE:
+                    self._db.execute(f'DROP TABLE "{table}"')
+            self._db.execute(_SCHEMA)
+        return self._db
+
+    def key(self, digest, lon, lat, vclass=None):
+        return (digest, round(lon / self.quantum), round(lat / self.quantum), vclass or "")
+
+    def nearest_lane(self, net, lon, lat, vclass=None):
+        """nearest_lane() ile aynı sonucu önbellekten (yoksa hesaplayıp kaydederek) döndürür"""
+        key = self.key(net.digest, lon, lat, vclass)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._copy(self._entries[key])
+
+            row = self._connection().execute(
+                f"SELECT lane_id, edge_id, pos, lane_length, distance FROM {SNAP_TABLE} "
+                "WHERE net = ? AND qlon = ? AND qlat = ? AND vclass = ?", key
+            ).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                lane = dict(zip(_FIELDS, row)) if row[0] is not None else None
+                self._remember(key, lane)
+                return self._copy(lane)
+
+        lane = nearest_lane(net, lon, lat, vclass)
+        values = tuple(lane[field] for field in _FIELDS) if lane else (None,) * len(_FIELDS)
+        lane = dict(zip(_FIELDS, values)) if lane else None
+        with self._lock:
+            self.misses += 1
+            self._connection().execute(
+                f"INSERT OR REPLACE INTO {SNAP_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", key + values
+            )
+            self._remember(key, lane)
+        return self._copy(lane)
+
+    def _remember(self, key, lane):
+        self._entries[key] = lane
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _copy(lane):
+        return dict(lane) if lane else None
+
+    def stats(self):
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': hits / total if total else 0.0,
+            'memory_entries': len(self._entries)
+        }
+
+    def clear(self, digest=None):
+        """Önbelleği (yalnızca bir ağa ait kayıtları da) temizler"""
+        with self._lock:
+            if digest is None:
+                self._entries.clear()
+                self._connection().execute(f"DELETE FROM {SNAP_TABLE}")
+            else:
+                for key in [key for key in self._entries if key[0] == digest]:
+                    del self._entries[key]
+                self._connection().execute(f"DELETE FROM {SNAP_TABLE} WHERE net = ?", (digest,))
+
+
+# Süreç genelinde paylaşılan önbellek
+snap_memo = SnapMemo()
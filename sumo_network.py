@@ -0,0 +1,1147 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+import numpy as np
+
+# Snapshot formatı değiştiğinde eski önbellek dosyalarının geçersiz sayılması için artırılır
+SNAPSHOT_VERSION = 2
+
+# Varsayılan önbellek klasörü (proje kökünde)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sumo_cache")
+
+# Durak türlerinin hizmet ettiği araç sınıfları; nokta, bu sınıfa izin veren en yakın şeride eşlenir
+STOP_VEHICLE_CLASSES = {
+    'containerStop': 'truck',
+    'chargingStation': 'evehicle',
+}
+
+# Bellekte aynı anda tutulan ağlar için varsayılan bellek bütçesi (MB)
+DEFAULT_CACHE_BUDGET_MB = int(os.environ.get("SUMO_NET_CACHE_MB", "512"))
+
+
+_hash_memo = {}
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Dosyanın içerik hash'ini (sha256) parça parça okuyarak hesaplar
+
+    Dosya yolu, boyutu ve değişiklik zamanı aynı kaldığı sürece hash yeniden
+    hesaplanmaz.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _hash_memo:
+        return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+def remember_sha256(path, digest):
+    """Başka yoldan (ör. yükleme sırasında) hesaplanmış hash'i file_sha256 için kaydeder"""
+    stat = os.stat(path)
+    _hash_memo[(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)] = digest
+
+
+def open_net_file(net_file_path):
+    """Ağ dosyasını açar; gzip ile sıkıştırılmışsa (.gz veya gzip imzası) şeffaf olarak açar"""
+    with open(net_file_path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(net_file_path, "rb")
+    return open(net_file_path, "rb")
+
+
+class _ProgressReader:
+    """Okunan (sıkıştırılmış) bayt oranını geri çağırımla bildiren dosya sarmalayıcısı"""
+
+    def __init__(self, raw, total, on_progress, step=0.01):
+        self._raw = raw
+        self._total = total
+        self._on_progress = on_progress
+        self._step = max(1, int(total * step))
+        self._reported = 0
+        self.done = 0
+
+    def read(self, size=-1):
+        data = self._raw.read(size)
+        self.done += len(data)
+        if self._on_progress and self._total and (self.done - self._reported >= self._step or not data):
+            self._reported = self.done
+            self._on_progress(min(1.0, self.done / self._total))
+        return data
+
+    def seek(self, offset, whence=0):
+        return self._raw.seek(offset, whence)
+
+    def tell(self):
+        return self._raw.tell()
+
+
+def _allowed_classes(allow, disallow):
+    """allow/disallow özniteliklerinden izin verilen araç sınıfları (sumolib get_allowed ile aynı)"""
+    from sumolib.net.lane import SUMO_VEHICLE_CLASSES
+
+    if allow is None and disallow is None:
+        allowed = SUMO_VEHICLE_CLASSES
+    elif disallow is None:
+        allowed = set(allow.split())
+    elif disallow == "all":
+        allowed = set()
+    else:
+        allowed = SUMO_VEHICLE_CLASSES.difference(disallow.split())
+    return " ".join(sorted(allowed))
+
+
+def _parse_shapes(shapes):
+    """Şekil öznitelik metinlerini tek geçişte (offsetler, (N, 2) x/y dizisi) olarak ayrıştırır
+
+    3 boyutlu noktaların z bileşeni atılır.
+    """
+    counts = np.zeros(len(shapes) + 1, dtype=np.int64)
+    parts = []
+    for i, shape in enumerate(shapes):
+        points = shape.split()
+        if points and points[0].count(",") == 2:
+            points = [point.rsplit(",", 1)[0] for point in points]
+        counts[i + 1] = len(points)
+        parts.append(" ".join(points))
+    text = " ".join(parts).replace(",", " ")
+    coords = np.array(text.split(), dtype=np.float64).reshape(-1, 2)
+    return np.cumsum(counts), coords
+
+
+def _edge_shapes(lane_offsets, lane_coords, edge_lane_offsets):
+    """Kenar şekilleri şeritlerden türetilir (sumolib Edge.rebuildShape ile aynı)
+
+    Tek sayıda şeritte ortadaki şeridin şekli, çift sayıda şeritte şeritlerin
+    nokta nokta ortalaması (en kısa şerit kadar nokta) kullanılır.
+    """
+    shapes = []
+    for first, last in zip(edge_lane_offsets[:-1], edge_lane_offsets[1:]):
+        count = last - first
+        if count % 2 == 1:
+            middle = first + count // 2
+            shapes.append(lane_coords[lane_offsets[middle]:lane_offsets[middle + 1]])
+            continue
+        points = min((lane_offsets[lane + 1] - lane_offsets[lane] for lane in range(first, last)), default=0)
+        total = np.zeros((points, 2))
+        for lane in range(first, last):
+            total = total + lane_coords[lane_offsets[lane]:lane_offsets[lane] + points]
+        shapes.append(total / float(count) if count else total)
+    offsets = np.zeros(len(shapes) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(shape) for shape in shapes])
+    coords = np.concatenate(shapes) if shapes else np.zeros((0, 2))
+    return offsets, coords.reshape(-1, 2)
+
+
+class _NetColumnsTarget:
+    """XMLParser hedefi: ağaç kurmadan yalnızca gereken özniteliklerden sütun listeleri toplar"""
+
+    def __init__(self):
+        self.location = {}
+        self.edge_ids = []
+        self.edge_nodes = []
+        # Her kenarın ilk şeridinin indeksi (son eleman toplam şerit sayısı)
+        self.edge_lane_offsets = [0]
+        self.lane_ids = []
+        self.lane_edge = []
+        self.lane_index = []
+        self.lane_length = []
+        self.lane_speed = []
+        self.lane_allowed = []
+        # Farklı izin kümeleri az sayıdadır; şeritler bu tablodaki indeksi tutar
+        self.allowed_classes = []
+        self.lane_shapes = []
+        # Düğümler sumolib'deki sırayla: önce kenarlarda geçtikleri sırada, sonra kalan kavşaklar
+        self.node_index = {}
+        self.node_types = {}
+        self.node_coords = {}
+        self._allowed_memo = {}
+        self._in_edge = False
+
+    def _node(self, node_id):
+        if node_id not in self.node_index:
+            self.node_index[node_id] = len(self.node_index)
+        return self.node_index[node_id]
+
+    def start(self, tag, attrib):
+        if tag == "lane":
+            if not self._in_edge:
+                return
+            self.lane_ids.append(attrib["id"])
+            self.lane_edge.append(len(self.edge_ids) - 1)
+            self.lane_index.append(len(self.lane_ids) - 1 - self.edge_lane_offsets[-1])
+            self.lane_length.append(float(attrib["length"]))
+            self.lane_speed.append(float(attrib["speed"]))
+            key = (attrib.get("allow"), attrib.get("disallow"))
+            if key not in self._allowed_memo:
+                allowed = _allowed_classes(*key)
+                if allowed not in self.allowed_classes:
+                    self.allowed_classes.append(allowed)
+                self._allowed_memo[key] = self.allowed_classes.index(allowed)
+            self.lane_allowed.append(self._allowed_memo[key])
+            self.lane_shapes.append(attrib.get("shape", ""))
+        elif tag == "edge":
+            self._close_edge()
+            # Kavşak içi, yaya geçidi vb. kenarlar sumolib'in varsayılanı gibi atlanır
+            self._in_edge = attrib.get("function", "") == ""
+            if self._in_edge:
+                self.edge_ids.append(attrib["id"])
+                self.edge_nodes.append((self._node(attrib.get("from")), self._node(attrib.get("to"))))
+        elif tag == "junction":
+            self._close_edge()
+            node_id = attrib["id"]
+            if node_id[0] != ":":
+                self._node(node_id)
+                self.node_types[node_id] = attrib.get("type")
+                self.node_coords[node_id] = (float(attrib["x"]), float(attrib["y"]))
+        elif tag == "location":
+            for name in ("netOffset", "convBoundary", "origBoundary", "projParameter"):
+                self.location[name] = attrib[name]
+
+    def _close_edge(self):
+        if self._in_edge:
+            self.edge_lane_offsets.append(len(self.lane_ids))
+            self._in_edge = False
+
+    def close(self):
+        self._close_edge()
+        return self
+
+
+def read_net_columns(net_file_path, on_progress=None, chunk_size=1 << 20):
+    """Ağ dosyasını tek geçişte akış halinde okuyup snapshot dizilerini üretir
+
+    sumolib.net.readNet'in aksine bağlantılar, trafik ışıkları ve nesne grafiği
+    oluşturulmaz, XML ağacı da kurulmaz; yalnızca harita ve eşleme için gereken
+    kenar, şerit ve düğüm alanları okunur. Kenarlar, şeritler, şekiller ve
+    izinler sumolib.net.readNet'in verdiğiyle aynıdır (kavşak içi kenarlar
+    hariç tutulur). on_progress(oran) dosyanın okunan kısmını bildirir.
+
+    Dönüş: (location, {dizi adı: dizi})
+    """
+    parser = ET.XMLParser(target=_NetColumnsTarget())
+    with open(net_file_path, "rb") as raw:
+        compressed = raw.read(2) == b"\x1f\x8b"
+        raw.seek(0)
+        reader = _ProgressReader(raw, os.path.getsize(net_file_path), on_progress)
+        source = gzip.GzipFile(fileobj=reader) if compressed else reader
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            parser.feed(chunk)
+    net = parser.close()
+
+    lane_shape_offsets, lane_shape_coords = _parse_shapes(net.lane_shapes)
+    net.lane_shapes = None
+    edge_shape_offsets, edge_shape_coords = _edge_shapes(lane_shape_offsets, lane_shape_coords, net.edge_lane_offsets)
+    node_ids = list(net.node_index)
+    edge_nodes = np.array(net.edge_nodes, dtype=np.int32).reshape(-1, 2)
+
+    arrays = {
+        'edge_ids': np.array(net.edge_ids, dtype=str),
+        'edge_functions': np.full(len(net.edge_ids), "", dtype=str),
+        'edge_from': edge_nodes[:, 0].copy(),
+        'edge_to': edge_nodes[:, 1].copy(),
+        'edge_shape_offsets': edge_shape_offsets,
+        'edge_shape_coords': edge_shape_coords,
+        'lane_ids': np.array(net.lane_ids, dtype=str),
+        'lane_edge': np.array(net.lane_edge, dtype=np.int32),
+        'lane_index': np.array(net.lane_index, dtype=np.int16),
+        'lane_length': np.array(net.lane_length, dtype=np.float64),
+        'lane_speed': np.array(net.lane_speed, dtype=np.float64),
+        'lane_allowed': np.array(net.lane_allowed, dtype=np.int32),
+        'allowed_classes': np.array(net.allowed_classes, dtype=str),
+        'lane_shape_offsets': lane_shape_offsets,
+        'lane_shape_coords': lane_shape_coords,
+        'node_ids': np.array(node_ids, dtype=str),
+        'node_types': np.array([net.node_types.get(node_id) or "" for node_id in node_ids], dtype=str),
+        'node_coords': np.array([net.node_coords[node_id] for node_id in node_ids], dtype=np.float64).reshape(-1, 2),
+    }
+    return net.location, arrays
+
+
+def read_location(net_file_path):
+    """Ağ dosyasının yalnızca başlığını okuyup <location> özniteliklerini döndürür
+
+    Dosya akış halinde okunur ve <location> bulunduğu anda durulur; ağın geri
+    kalanı (kenarlar, kavşaklar) hiç okunmaz.
+    """
+    with open_net_file(net_file_path) as f:
+        for event, elem in ET.iterparse(f, events=("start",)):
+            if elem.tag == "location":
+                return dict(elem.attrib)
+            if elem.tag in ("edge", "junction"):
+                # location her zaman kenarlardan önce gelir
+                break
+    return None
+
+
+def _make_proj(proj_parameter):
+    import pyproj
+    return pyproj.Proj(projparams=proj_parameter)
+
+
+def header_bounds(net_file_path):
+    """Ağın coğrafi sınırlarını ve merkezini ağı yüklemeden, başlıktaki convBoundary'den hesaplar"""
+    location = read_location(net_file_path)
+    if not location or location.get("projParameter", "!") == "!":
+        return None
+
+    x_min, y_min, x_max, y_max = map(float, location["convBoundary"].split(","))
+    x_off, y_off = map(float, location["netOffset"].split(","))
+    # UTM gibi projeksiyonlarda x/y kutusunun köşeleri lon/lat'te dikdörtgen
+    # oluşturmaz; dört köşenin hepsi projekte edilip en dış değerler alınır
+    xs = np.array([x_min, x_max, x_min, x_max]) - x_off
+    ys = np.array([y_min, y_min, y_max, y_max]) - y_off
+    lons, lats = _make_proj(location["projParameter"])(xs, ys, inverse=True)
+    min_lon, max_lon = float(np.min(lons)), float(np.max(lons))
+    min_lat, max_lat = float(np.min(lats)), float(np.max(lats))
+    return {
+        'min_lat': min_lat,
+        'max_lat': max_lat,
+        'min_lon': min_lon,
+        'max_lon': max_lon,
+        'center_lat': (min_lat + max_lat) / 2,
+        'center_lon': (min_lon + max_lon) / 2
+    }
+
+
+def simplify_polyline(coords, tolerance):
+    """Douglas–Peucker ile polyline'ı sadeleştirir; korunan noktaların indekslerini döndürür"""
+    n = len(coords)
+    if n <= 2 or tolerance <= 0:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start = coords[first]
+        seg = coords[last] - start
+        seg_len = np.hypot(seg[0], seg[1])
+        inner = coords[first + 1:last] - start
+        if seg_len > 0:
+            dist = np.abs(seg[0] * inner[:, 1] - seg[1] * inner[:, 0]) / seg_len
+        else:
+            dist = np.hypot(inner[:, 0], inner[:, 1])
+        farthest = int(np.argmax(dist))
+        if dist[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.nonzero(keep)[0]
+
+
+class GridIndex:
+    """Sınırlayıcı kutular (bbox) üzerinde düzgün ızgara tabanlı uzamsal indeks
+
+    Her kutu kesiştiği ızgara hücrelerine kaydedilir; hücre -> kutu eşlemesi düz
+    diziler (CSR) olarak tutulur. Bir bölge sorgusu yalnızca o bölgenin
+    hücrelerindeki adayları inceler.
+    """
+
+    def __init__(self, bboxes, cell_size=None):
+        self.bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        if len(self.bboxes):
+            self.origin = self.bboxes[:, :2].min(axis=0)
+            extent = self.bboxes[:, 2:].max(axis=0) - self.origin
+        else:
+            self.origin = np.zeros(2)
+            extent = np.ones(2)
+        if cell_size is None:
+            # Hücre başına ortalama birkaç kutu düşecek şekilde
+            cell_size = max(float(np.sqrt(extent[0] * extent[1] / max(len(self.bboxes), 1))) * 2, 1.0)
+        self.cell_size = cell_size
+        self.shape = (np.maximum(np.ceil(extent / cell_size).astype(np.int64), 1) + 1)
+
+        lo = self._cell(self.bboxes[:, :2])
+        hi = self._cell(self.bboxes[:, 2:])
+        spans = (hi - lo + 1)
+        counts = spans[:, 0] * spans[:, 1]
+
+        # Her (kutu, hücre) çiftini üret
+        box_ids = np.repeat(np.arange(len(self.bboxes)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        span_y = np.repeat(spans[:, 1], counts)
+        cx = np.repeat(lo[:, 0], counts) + local // span_y
+        cy = np.repeat(lo[:, 1], counts) + local % span_y
+        cell_ids = cx * self.shape[1] + cy
+
+        order = np.argsort(cell_ids, kind="stable")
+        self.cell_items = box_ids[order]
+        self.cell_offsets = np.searchsorted(cell_ids[order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    def _cell(self, xy):
+        cell = np.floor((np.asarray(xy) - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cell, 0, self.shape - 1)
+
+    def candidates(self, bbox):
+        """bbox ile aynı hücrelere düşen kutuların indeksleri (tekrarsız)"""
+        (x0, y0), (x1, y1) = self._cell([bbox[:2], bbox[2:]])
+        cells = (np.arange(x0, x1 + 1)[:, None] * self.shape[1] + np.arange(y0, y1 + 1)[None, :]).ravel()
+        starts = self.cell_offsets[cells]
+        ends = self.cell_offsets[cells + 1]
+        if not len(cells) or (ends - starts).sum() == 0:
+            return np.zeros(0, dtype=np.int64)
+        items = np.concatenate([self.cell_items[a:b] for a, b in zip(starts, ends) if b > a])
+        return np.unique(items)
+
+    def query(self, bbox):
+        """bbox ile kesişen kutuların indeksleri"""
+        items = self.candidates(bbox)
+        boxes = self.bboxes[items]
+        hit = ((boxes[:, 0] <= bbox[2]) & (boxes[:, 2] >= bbox[0]) &
+               (boxes[:, 1] <= bbox[3]) & (boxes[:, 3] >= bbox[1]))
+        return items[hit]
+
+    def nbytes(self):
+        return self.bboxes.nbytes + self.cell_items.nbytes + self.cell_offsets.nbytes
+
+
+class LaneIndex:
+    """Şerit segmentleri üzerinde en yakın şerit sorguları için uzamsal indeks
+
+    Tüm şerit şekilleri segmentlere ayrılıp düz dizilerde (başlangıç noktası,
+    segment vektörü, şerit indeksi, şerit başından uzaklık) tutulur ve
+    segment kutuları bir GridIndex'e yerleştirilir. Sorgular küçük bir
+    yarıçapla başlar ve k farklı şerit bulunana kadar yarıçapı büyütür; bu
+    nedenle sabit bir arama yarıçapı yoktur.
+    """
+
+    # Toplu sorguda tek seferde oluşturulan en fazla (nokta, hücre) ve (nokta, segment) çifti;
+    # aşılırsa noktalar bölünür, böylece bellek parça boyutundan bağımsız kalır
+    MAX_BLOCK_PAIRS = 100000
+
+    def __init__(self, net):
+        coords = net.lane_shape_coords
+        point_lane = np.repeat(np.arange(len(net.lane_ids)), np.diff(net.lane_shape_offsets))
+
+        # Bir şeridin son noktasından sonrakinin ilk noktasına giden sahte segmentleri ele
+        valid = point_lane[:-1] == point_lane[1:]
+        self.start = coords[:-1][valid]
+        self.vector = coords[1:][valid] - self.start
+        self.lane = point_lane[:-1][valid]
+        self.length = np.hypot(self.vector[:, 0], self.vector[:, 1])
+
+        # Her segmentin şerit başından itibaren başlangıç konumu (şerit başına önceden hesaplanmış kümülatif uzunluk)
+        cumulative = np.cumsum(self.length)
+        lane_first_seg = np.searchsorted(self.lane, self.lane, side="left")
+        self.start_pos = cumulative - self.length - (cumulative[lane_first_seg] - self.length[lane_first_seg])
+
+        # SUMO konumları şeridin 'length' özniteliği cinsindendir; geometrik uzunluk farklı
+        # olabilir (lengthGeometryFactor), bu yüzden konumlar şerit başına ölçeklenir
+        geometry_length = np.bincount(self.lane, weights=self.length, minlength=len(net.lane_ids))
+        self.lane_length = net.lane_length
+        self.lane_scale = np.where(geometry_length > 0, net.lane_length / np.where(geometry_length > 0, geometry_length, 1.0), 1.0)
+        self._build_grid()
+
+    @classmethod
+    def from_segments(cls, start, vector, lane, start_pos, lane_length, lane_scale):
+        """Hazır segment dizilerinden indeks oluşturur (paralel eşlemede işçi süreçler için)"""
+        index = cls.__new__(cls)
+        index.start = start
+        index.vector = vector
+        index.lane = lane
+        index.length = np.hypot(vector[:, 0], vector[:, 1])
+        index.start_pos = start_pos
+        index.lane_length = lane_length
+        index.lane_scale = lane_scale
+        index._build_grid()
+        return index
+
+    def segment_subset(self, bbox, lane_mask=None):
+        """Kutuyla kesişen segmentleri, şeritleri yerel olarak numaralanmış diziler halinde döndürür
+
+        Dönüş: (from_segments argümanları sözlüğü, yerel -> global şerit indeksi dizisi)
+        """
+        min_x, min_y, max_x, max_y = bbox
+        segments = self.grid.candidates(bbox)
+        start = self.start[segments]
+        end = start + self.vector[segments]
+        keep = ((np.minimum(start[:, 0], end[:, 0]) <= max_x) & (np.maximum(start[:, 0], end[:, 0]) >= min_x) &
+                (np.minimum(start[:, 1], end[:, 1]) <= max_y) & (np.maximum(start[:, 1], end[:, 1]) >= min_y))
+        if lane_mask is not None:
+            keep &= lane_mask[self.lane[segments]]
+        segments = np.sort(segments[keep])
+
+        global_lanes, local_lane = np.unique(self.lane[segments], return_inverse=True)
+        arrays = {
+            'start': self.start[segments],
+            'vector': self.vector[segments],
+            'lane': local_lane.astype(np.int64),
+            'start_pos': self.start_pos[segments],
+            'lane_length': self.lane_length[global_lanes],
+            'lane_scale': self.lane_scale[global_lanes],
+        }
+        return arrays, global_lanes
+
+    def nbytes(self):
+        """Segment dizileri ve ızgaranın bayt cinsinden boyutu (şerit uzunlukları snapshot'la paylaşılır)"""
+        arrays = (self.start, self.vector, self.lane, self.length, self.start_pos, self.lane_scale)
+        return sum(array.nbytes for array in arrays) + self.grid.nbytes()
+
+    def _build_grid(self):
+        end = self.start + self.vector
+        bboxes = np.column_stack((np.minimum(self.start, end), np.maximum(self.start, end)))
+        self.grid = GridIndex(bboxes)
+        # Tüm ızgarayı kapsayan yarıçap (sorgu bu değeri aşınca tüm segmentler aday olur)
+        self._max_radius = float(np.hypot(*(self.grid.shape * self.grid.cell_size)))
+
+    def _distances(self, segments, x, y):
+        start = self.start[segments]
+        vector = self.vector[segments]
+        length_sq = self.length[segments] ** 2
+        t = ((x - start[:, 0]) * vector[:, 0] + (y - start[:, 1]) * vector[:, 1]) / np.where(length_sq > 0, length_sq, 1.0)
+        t = np.clip(t, 0.0, 1.0)
+        dist = np.hypot(start[:, 0] + t * vector[:, 0] - x, start[:, 1] + t * vector[:, 1] - y)
+        return dist, t
+
+    def nearest(self, x, y, k=1, lane_mask=None):
+        """En yakın k şerit için (şerit indeksi, şerit üzerindeki konum, mesafe) listesi
+
+        lane_mask verilirse yalnızca mask'te True olan şeritler dikkate alınır.
+        """
+        if not len(self.lane) or (lane_mask is not None and not lane_mask[self.lane].any()):
+            return []
+
+        # Izgaranın dışındaki noktalar için ilk yarıçap ızgaraya olan uzaklığı da kapsamalı
+        grid_min = self.grid.origin
+        grid_max = grid_min + self.grid.shape * self.grid.cell_size
+        outside = np.hypot(*np.maximum(np.maximum(grid_min - (x, y), (x, y) - grid_max), 0))
+        radius = self.grid.cell_size + outside
+
+        while True:
+            segments = self.grid.candidates((x - radius, y - radius, x + radius, y + radius))
+            if lane_mask is not None:
+                segments = segments[lane_mask[self.lane[segments]]]
+            dist, t = self._distances(segments, x, y)
+            within = dist <= radius
+            segments, dist, t = segments[within], dist[within], t[within]
+
+            # Her şerit için en yakın segment
+            order = np.argsort(dist, kind="stable")
+            _, first = np.unique(self.lane[segments[order]], return_index=True)
+            best = order[np.sort(first)]
+            best = best[np.argsort(dist[best], kind="stable")]
+
+            # Yarıçap içindeki tüm segmentler aday kümesindedir; k şerit bulunduysa sonuç kesindir
+            if len(best) >= k or radius > self._max_radius + outside:
+                break
+            radius *= 2
+
+        results = []
+        for i in best[:k]:
+            seg = segments[i]
+            pos = self._lane_position(seg, t[i])
+            results.append((int(self.lane[seg]), float(pos), float(dist[i])))
+        return results
+
+    def _lane_position(self, segments, t):
+        """Segment üzerine tam izdüşüm: segment başlangıç konumu + t * segment uzunluğu (SUMO şerit birimlerinde)"""
+        lane = self.lane[segments]
+        pos = (self.start_pos[segments] + t * self.length[segments]) * self.lane_scale[lane]
+        return np.clip(pos, 0.0, self.lane_length[lane])
+
+    def _nearest_in_block(self, xy, reach, lane_mask):
+        """Her noktayı hücresinin (2*reach+1)^2 komşuluğundaki segmentlerle karşılaştırır"""
+        grid = self.grid
+        count = len(xy)
+        if count * (2 * reach + 1) ** 2 > self.MAX_BLOCK_PAIRS and count > 1:
+            return self._split_block(xy, reach, lane_mask)
+        lanes = np.full(count, -1, dtype=np.int64)
+        positions = np.zeros(count)
+        distances = np.full(count, np.inf)
+
+        # Her nokta için hücre bloğu (ızgara dışındaki hücreler atlanır)
+        cell = np.floor((xy - grid.origin) / grid.cell_size).astype(np.int64)
+        steps = np.arange(-reach, reach + 1)
+        offsets = np.stack(np.meshgrid(steps, steps, indexing="ij"), axis=-1).reshape(-1, 2)
+        block = cell[:, None, :] + offsets[None, :, :]
+        inside = ((block >= 0) & (block < grid.shape)).all(axis=2)
+        point_of_cell = np.nonzero(inside)[0]
+        cell_ids = block[inside][:, 0] * grid.shape[1] + block[inside][:, 1]
+
+        # (nokta, segment) aday çiftlerini CSR'den üret; çift sayısı sınırı aşarsa
+        # noktalar ikiye bölünür (bellek nokta sayısı x aday segmentle büyür)
+        starts = grid.cell_offsets[cell_ids]
+        counts = grid.cell_offsets[cell_ids + 1] - starts
+        if counts.sum() > self.MAX_BLOCK_PAIRS and count > 1:
+            return self._split_block(xy, reach, lane_mask)
+        pair_point = np.repeat(point_of_cell, counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_seg = grid.cell_items[np.repeat(starts, counts) + local]
+        if lane_mask is not None:
+            keep = lane_mask[self.lane[pair_seg]]
+            pair_point, pair_seg = pair_point[keep], pair_seg[keep]
+        if not len(pair_seg):
+            return lanes, positions, distances
+
+        start = self.start[pair_seg]
+        vector = self.vector[pair_seg]
+        length_sq = self.length[pair_seg] ** 2
+        px, py = xy[pair_point, 0], xy[pair_point, 1]
+        t = ((px - start[:, 0]) * vector[:, 0] + (py - start[:, 1]) * vector[:, 1]) / np.where(length_sq > 0, length_sq, 1.0)
+        t = np.clip(t, 0.0, 1.0)
+        dist = np.hypot(start[:, 0] + t * vector[:, 0] - px, start[:, 1] + t * vector[:, 1] - py)
+
+        # Nokta başına en yakın çift (çiftler noktaya göre zaten gruplu)
+        group_start = np.flatnonzero(np.r_[True, pair_point[1:] != pair_point[:-1]])
+        group_min = np.minimum.reduceat(dist, group_start)
+        is_min = np.flatnonzero(dist == np.repeat(group_min, np.diff(np.r_[group_start, len(dist)])))
+        # Eşit mesafede (ör. ortak köşe) en küçük segment indeksi seçilir; sonuç ızgara düzeninden bağımsızdır
+        is_min = is_min[np.lexsort((pair_seg[is_min], pair_point[is_min]))]
+        first = is_min[np.r_[True, pair_point[is_min][1:] != pair_point[is_min][:-1]]]
+        points = pair_point[first]
+        lanes[points] = self.lane[pair_seg[first]]
+        positions[points] = self._lane_position(pair_seg[first], t[first])
+        distances[points] = dist[first]
+        return lanes, positions, distances
+
+    def _split_block(self, xy, reach, lane_mask):
+        """Noktaları ikiye bölüp ayrı ayrı çözer (noktalar bağımsız, sonuç aynı)"""
+        half = len(xy) // 2
+        parts = (self._nearest_in_block(xy[:half], reach, lane_mask),
+                 self._nearest_in_block(xy[half:], reach, lane_mask))
+        return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+    def nearest_many(self, xy, lane_mask=None):
+        """Çok sayıda nokta için en yakın şeridi vektörel olarak bulur
+
+        Noktalar önce hücrelerinin 3x3, kalanlar 7x7 komşuluğundaki segmentlerle
+        tek seferde karşılaştırılır; blok en az `reach` hücre boyu yarıçapı
+        kapsadığından o mesafe içindeki sonuçlar kesindir. Daha uzaktaki
+        noktalar tek tek nearest() ile çözülür.
+
+        Dönüş: (şerit indeksleri, konumlar, mesafeler); şerit bulunamazsa indeks -1.
+        """
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        count = len(xy)
+        lanes = np.full(count, -1, dtype=np.int64)
+        positions = np.zeros(count)
+        distances = np.full(count, np.inf)
+        if not count or not len(self.lane):
+            return lanes, positions, distances
+
+        pending = np.arange(count)
+        for reach in (1, 3):
+            block_lanes, block_pos, block_dist = self._nearest_in_block(xy[pending], reach, lane_mask)
+            exact = block_dist <= reach * self.grid.cell_size
+            done = pending[exact]
+            lanes[done], positions[done], distances[done] = block_lanes[exact], block_pos[exact], block_dist[exact]
+            pending = pending[~exact]
+            if not len(pending):
+                break
+
+        for i in pending:
+            result = self.nearest(xy[i, 0], xy[i, 1], 1, lane_mask)
+            if result:
+                lanes[i], positions[i], distances[i] = result[0]
+        return lanes, positions, distances
+
+
+class EdgeGeometry:
+    """Kenar geometrisinin CSR düzeni: kenar ID tablosu, offset dizisi ve tek düz lon/lat dizisi
+
+    i. kenarın noktaları coords[offsets[i]:offsets[i + 1]]'dir; dilimler kopya
+    değil görünümdür. Diziler salt okunurdur, böylece nesne oturumlar arasında
+    kopyalanmadan paylaşılabilir.
+    """
+
+    def __init__(self, ids, offsets, coords, edge_indices):
+        self.ids = ids
+        self.offsets = offsets
+        self.coords = coords
+        # Snapshot'taki kenar indeksleri (edge_ids, lane_edge ile eşleşir)
+        self.edge_indices = edge_indices
+        for array in (ids, offsets, coords, edge_indices):
+            array.flags.writeable = False
+        self._index = None
+
+    @classmethod
+    def from_snapshot(cls, net, tolerance=0.0, min_length=0.0):
+        """Sadeleştirilmiş kenarları lon/lat'e dönüştürür; iki noktadan kısa kenarlar atılır"""
+        edge_indices, offsets, coords = net.simplified_edges(tolerance, min_length)
+        counts = np.diff(offsets)
+        keep = counts > 1
+        kept_offsets = np.zeros(np.count_nonzero(keep) + 1, dtype=np.int64)
+        np.cumsum(counts[keep], out=kept_offsets[1:])
+        lonlat = net.xy_to_lonlat(coords[np.repeat(keep, counts)])
+        return cls(net.edge_ids[edge_indices[keep]], kept_offsets, lonlat, edge_indices[keep])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        """i. kenarın (N, 2) lon/lat noktaları (görünüm)"""
+        return self.coords[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        """(edge_id, lon/lat görünümü) çiftlerini sırayla üretir"""
+        offsets = self.offsets.tolist()
+        for i, edge_id in enumerate(self.ids.tolist()):
+            yield edge_id, self.coords[offsets[i]:offsets[i + 1]]
+
+    def get(self, edge_id):
+        """Kenar ID'sine göre lon/lat noktaları; kenar yoksa None"""
+        if self._index is None:
+            self._index = {edge_id: i for i, edge_id in enumerate(self.ids.tolist())}
+        i = self._index.get(edge_id)
+        return None if i is None else self[i]
+
+    def nbytes(self):
+        return sum(array.nbytes for array in (self.ids, self.offsets, self.coords, self.edge_indices))
+
+
+class NetworkSnapshot:
+    """SUMO ağının harita ve nokta eşleme için gereken kısmının sıkıştırılmış kopyası
+
+    Kenarlar, şeritler, şekiller, projeksiyon parametreleri ve düğüm tablosu NumPy
+    dizileri olarak tutulur; böylece ağ .npz dosyasına yazılıp saniyenin küçük bir
+    kesrinde geri yüklenebilir.
+    """
+
+    ARRAY_FIELDS = (
+        "edge_ids", "edge_functions", "edge_from", "edge_to",
+        "edge_shape_offsets", "edge_shape_coords",
+        "lane_ids", "lane_edge", "lane_index", "lane_length", "lane_speed", "lane_allowed",
+        "allowed_classes",
+        "lane_shape_offsets", "lane_shape_coords",
+        "node_ids", "node_types", "node_coords",
+    )
+
+    def __init__(self, location, **arrays):
+        self.location = location
+        # Kaynak ağ dosyasının içerik hash'i (load_network tarafından atanır)
+        self.digest = None
+        for name in self.ARRAY_FIELDS:
+            setattr(self, name, arrays[name])
+        self._proj = None
+        self._edge_lonlat = None
+        self._simplified = {}
+        self._geometry = {}
+        self._edge_grid = None
+        self._lane_index = None
+        self._vclass_masks = {}
+        self._edge_index = {edge_id: i for i, edge_id in enumerate(self.edge_ids.tolist())}
+
+    @classmethod
+    def from_net_file(cls, net_file_path, on_progress=None):
+        """Ağ dosyasından sumolib nesne grafiği kurmadan doğrudan snapshot oluşturur (bkz. read_net_columns)"""
+        location, arrays = read_net_columns(net_file_path, on_progress)
+        return cls(location, **arrays)
+
+    def save(self, path):
+        """Snapshot'ı atomik olarak .npz dosyasına yazar"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=np.array(SNAPSHOT_VERSION),
+                location=np.array(json.dumps(self.location)),
+                **{name: getattr(self, name) for name in self.ARRAY_FIELDS}
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """.npz dosyasından snapshot yükler"""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != SNAPSHOT_VERSION:
+                raise ValueError(f"Snapshot sürümü uyumsuz: {path}")
+            location = json.loads(str(data["location"]))
+            arrays = {name: data[name] for name in cls.ARRAY_FIELDS}
+        return cls(location, **arrays)
+
+    # --- Projeksiyon (sumolib.net.Net ile aynı imza) ---
+
+    def getGeoProj(self):
+        if self._proj is None:
+            self._proj = _make_proj(self.location["projParameter"])
+        return self._proj
+
+    def getLocationOffset(self):
+        return list(map(float, self.location["netOffset"].split(",")))
+
+    def getBoundary(self):
+        return list(map(float, self.location["convBoundary"].split(",")))
+
+    def convertLonLat2XY(self, lon, lat):
+        x, y = self.getGeoProj()(lon, lat)
+        x_off, y_off = self.getLocationOffset()
+        return x + x_off, y + y_off
+
+    def convertXY2LonLat(self, x, y):
+        x_off, y_off = self.getLocationOffset()
+        return self.getGeoProj()(x - x_off, y - y_off, inverse=True)
+
+    # --- Toplu projeksiyon (NumPy dizileri) ---
+
+    def xy_to_lonlat(self, xy):
+        """(N, 2) x/y dizisini tek çağrıda (N, 2) lon/lat dizisine dönüştürür"""
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        x_off, y_off = self.getLocationOffset()
+        lon, lat = self.getGeoProj()(xy[:, 0] - x_off, xy[:, 1] - y_off, inverse=True)
+        return np.column_stack((lon, lat))
+
+    def lonlat_to_xy(self, lonlat):
+        """(N, 2) lon/lat dizisini tek çağrıda (N, 2) x/y dizisine dönüştürür"""
+        lonlat = np.asarray(lonlat, dtype=np.float64).reshape(-1, 2)
+        x, y = self.getGeoProj()(lonlat[:, 0], lonlat[:, 1])
+        x_off, y_off = self.getLocationOffset()
+        return np.column_stack((x + x_off, y + y_off))
+
+    def edge_shapes_lonlat(self):
+        """Tüm kenar şekillerinin lon/lat karşılığı (edge_shape_coords ile aynı sırada, bir kez hesaplanır)"""
+        if self._edge_lonlat is None:
+            self._edge_lonlat = self.xy_to_lonlat(self.edge_shape_coords)
+        return self._edge_lonlat
+
+    # --- Sorgular ---
+
+    def nbytes(self):
+        """Snapshot dizileri ve ağla birlikte yaşayan türetilmiş yapıların bellekte kapladığı toplam bayt
+
+        Şerit indeksi, kenar ızgarası, sadeleştirilmiş ve lon/lat kenar geometrileri
+        ile araç sınıfı maskeleri ilk kullanımda oluşturulduğundan toplam zamanla büyür.
+        """
+        total = sum(getattr(self, name).nbytes for name in self.ARRAY_FIELDS)
+        if self._edge_lonlat is not None:
+            total += self._edge_lonlat.nbytes
+        for arrays in self._simplified.values():
+            total += sum(array.nbytes for array in arrays)
+        total += sum(geometry.nbytes() for geometry in self._geometry.values())
+        total += sum(mask.nbytes for mask in self._vclass_masks.values())
+        for index in (self._edge_grid, self._lane_index):
+            if index is not None:
+                total += index.nbytes()
+        return total
+
+    def edge_count(self):
+        return len(self.edge_ids)
+
+    def node_count(self):
+        return len(self.node_ids)
+
+    def edge_length(self, edge_id):
+        """Kenar uzunluğu (sumolib'deki gibi ilk şeridin uzunluğu)"""
+        lanes = np.nonzero(self.lane_edge == self._edge_index[edge_id])[0]
+        return float(self.lane_length[lanes[0]])
+
+    def edge_lengths(self):
+        """Tüm kenarların uzunlukları (her kenarın ilk şeridi)"""
+        _, first_lane = np.unique(self.lane_edge, return_index=True)
+        return self.lane_length[first_lane]
+
+    def simplified_edges(self, tolerance, min_length=0.0, include_internal=False):
+        """Sadeleştirilmiş kenar geometrisi: (kenar indeksleri, offsetler, x/y koordinatları)
+
+        Her kenar şekli Douglas–Peucker ile `tolerance` metre hassasiyete indirgenir;
+        `min_length` metreden kısa kenarlar ve (istenmezse) kavşak içi kenarlar atılır.
+        Sonuç her parametre kombinasyonu için bir kez hesaplanıp saklanır.
+        """
+        key = (tolerance, min_length, include_internal)
+        if key not in self._simplified:
+            selected = self.edge_lengths() >= min_length
+            if not include_internal:
+                selected &= self.edge_functions != "internal"
+
+            edge_indices = np.nonzero(selected)[0]
+            offsets = np.zeros(len(edge_indices) + 1, dtype=np.int64)
+            parts = []
+            for i, edge_idx in enumerate(edge_indices):
+                shape = self.get_edge_shape(edge_idx)
+                part = shape[simplify_polyline(shape, tolerance)]
+                parts.append(part)
+                offsets[i + 1] = offsets[i] + len(part)
+            coords = np.concatenate(parts) if parts else np.zeros((0, 2))
+            self._simplified[key] = (edge_indices, offsets, coords)
+        return self._simplified[key]
+
+    def edge_geometry(self, tolerance=0.0, min_length=0.0):
+        """Sadeleştirilmiş kenar geometrisi lon/lat olarak, CSR düzeninde (her seviye için bir kez hesaplanır)"""
+        key = (tolerance, min_length)
+        if key not in self._geometry:
+            self._geometry[key] = EdgeGeometry.from_snapshot(self, tolerance, min_length)
+        return self._geometry[key]
+
+    def edge_bboxes(self):
+        """Her kenarın (xmin, ymin, xmax, ymax) sınırlayıcı kutusu"""
+        counts = np.diff(self.edge_shape_offsets)
+        bboxes = np.zeros((len(self.edge_ids), 4))
+        nonempty = counts > 0
+        starts = self.edge_shape_offsets[:-1][nonempty]
+        coords = self.edge_shape_coords
+        bboxes[nonempty, :2] = np.minimum.reduceat(coords, starts, axis=0)
+        bboxes[nonempty, 2:] = np.maximum.reduceat(coords, starts, axis=0)
+        return bboxes
+
+    def edges_in_bbox(self, bbox):
+        """x/y koordinatlarındaki bbox ile kesişen kenarların indeksleri (ızgara indeksi ile)"""
+        if self._edge_grid is None:
+            self._edge_grid = GridIndex(self.edge_bboxes())
+        return self._edge_grid.query(bbox)
+
+    def edges_in_lonlat_bbox(self, min_lon, min_lat, max_lon, max_lat):
+        """Coğrafi bbox ile kesişen kenarların indeksleri"""
+        corners = self.lonlat_to_xy([[min_lon, min_lat], [max_lon, min_lat], [min_lon, max_lat], [max_lon, max_lat]])
+        x0, y0 = corners.min(axis=0)
+        x1, y1 = corners.max(axis=0)
+        return self.edges_in_bbox((x0, y0, x1, y1))
+
+    def get_edge_shape(self, edge_idx):
+        """Kenarın şeklini (N, 2) dizisi olarak döndürür"""
+        return self.edge_shape_coords[self.edge_shape_offsets[edge_idx]:self.edge_shape_offsets[edge_idx + 1]]
+
+    def iter_edge_shapes(self):
+        """(edge_id, shape) çiftlerini sırayla üretir"""
+        for i, edge_id in enumerate(self.edge_ids.tolist()):
+            yield edge_id, self.get_edge_shape(i)
+
+    def get_lane_index(self):
+        """Şerit segmentleri üzerindeki uzamsal indeks (ilk kullanımda oluşturulur)"""
+        if self._lane_index is None:
+            self._lane_index = LaneIndex(self)
+        return self._lane_index
+
+    def lanes_allowing(self, vclass):
+        """vclass araç sınıfına izin veren şeritler için boolean mask"""
+        if vclass not in self._vclass_masks:
+            table = np.array([vclass in allowed.split() for allowed in self.allowed_classes.tolist()], dtype=bool)
+            self._vclass_masks[vclass] = table[self.lane_allowed]
+        return self._vclass_masks[vclass]
+
+    def nearest_lanes(self, x, y, k=1, vclass=None):
+        """(x, y) noktasına en yakın k şeridi döndürür (sabit arama yarıçapı yok)
+
+        vclass verilirse yalnızca o araç sınıfına izin veren şeritler aranır.
+        Her sonuç: lane_id, edge_id, lane_index, pos (şerit başından uzaklık), lane_length, distance.
+        """
+        lane_mask = self.lanes_allowing(vclass) if vclass else None
+        results = []
+        for lane_idx, pos, dist in self.get_lane_index().nearest(x, y, k, lane_mask):
+            results.append({
+                'lane_id': str(self.lane_ids[lane_idx]),
+                'edge_id': str(self.edge_ids[self.lane_edge[lane_idx]]),
+                'lane_index': int(self.lane_index[lane_idx]),
+                'pos': pos,
+                'lane_length': float(self.lane_length[lane_idx]),
+                'distance': dist
+            })
+        return results
+
+    def snap_points(self, lonlat, vclass=None):
+        """lon/lat noktalarını toplu olarak en yakın şeritlere eşler
+
+        Dönüş: x, y, lane (şerit indeksi, bulunamazsa -1), pos, distance dizilerini
+        içeren sözlük.
+        """
+        xy = self.lonlat_to_xy(lonlat)
+        lane_mask = self.lanes_allowing(vclass) if vclass else None
+        lanes, positions, distances = self.get_lane_index().nearest_many(xy, lane_mask)
+        return {'x': xy[:, 0], 'y': xy[:, 1], 'lane': lanes, 'pos': positions, 'distance': distances}
+
+
+def snapshot_path(net_file_path, digest, cache_dir=DEFAULT_CACHE_DIR):
+    """Ağ dosyası ve içerik hash'inden snapshot dosya yolunu üretir"""
+    name = os.path.basename(net_file_path)
+    return os.path.join(cache_dir, f"{name}.{digest[:16]}.v{SNAPSHOT_VERSION}.npz")
+
+
+def _remove_stale_snapshots(net_file_path, keep_path, cache_dir):
+    """Aynı ağ dosyasına ait eski (hash'i değişmiş) snapshot'ları siler"""
+    prefix = os.path.basename(net_file_path) + "."
+    for file_name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, file_name)
+        if file_name.startswith(prefix) and file_name.endswith(".npz") and path != keep_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_network(net_file_path, cache_dir=DEFAULT_CACHE_DIR, digest=None, on_progress=None):
+    """Ağı snapshot'tan yükler; snapshot yoksa veya ağ değiştiyse ağ dosyasını okuyup snapshot oluşturur
+
+    on_progress(mesaj, oran) verilirse yükleme aşamaları ve toplam ilerleme (0-1) bildirilir.
+    """
+    def progress(message, fraction):
+        if on_progress:
+            on_progress(message, fraction)
+
+    if digest is None:
+        progress("Ağ dosyası doğrulanıyor", 0.0)
+        digest = file_sha256(net_file_path)
+    path = snapshot_path(net_file_path, digest, cache_dir)
+
+    if os.path.exists(path):
+        try:
+            progress("Snapshot yükleniyor", 0.05)
+            snapshot = NetworkSnapshot.load(path)
+            snapshot.digest = digest
+            return snapshot
+        except (OSError, ValueError, KeyError):
+            # Bozuk veya eski formatlı snapshot: yeniden oluştur
+            pass
+
+    snapshot = NetworkSnapshot.from_net_file(
+        net_file_path, lambda fraction: progress("Ağ dosyası okunuyor", 0.05 + 0.8 * fraction))
+    snapshot.digest = digest
+
+    progress("Snapshot yazılıyor", 0.85)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        snapshot.save(path)
+        _remove_stale_snapshots(net_file_path, path, cache_dir)
+    except OSError:
+        # Önbelleğe yazılamıyorsa yine de bellekteki snapshot ile devam et
+        pass
+
+    return snapshot
+
+
+class NetworkCache:
+    """İçerik hash'ine göre anahtarlanan, bellek bütçeli LRU ağ önbelleği
+
+    Aynı içerikteki ağ dosyası (farklı adla yüklenmiş olsa bile) yalnızca bir kez
+    yüklenir; tüm çağrılar, yeniden çalıştırmalar ve oturumlar aynı nesneyi paylaşır.
+    Toplam boyut bütçeyi aşarsa en uzun süredir kullanılmayan ağlar bellekten atılır.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BUDGET_MB * 1024 * 1024, cache_dir=DEFAULT_CACHE_DIR):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        # Yüklenmekte olan ağlar: hash -> yükleme bitince işaretlenen Event
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get(self, net_file_path, on_progress=None):
+        """Ağı önbellekten döndürür; yoksa yükleyip önbelleğe ekler
+
+        Yükleme kilit dışında yapılır; böylece bir ağın yüklenmesi diğer ağların
+        sorgularını bekletmez. Aynı ağı isteyen diğer çağrılar süren yüklemeyi bekler.
+        """
+        if on_progress:
+            on_progress("Ağ dosyası doğrulanıyor", 0.0)
+        digest = file_sha256(net_file_path)
+        while True:
+            with self._lock:
+                if digest in self._entries:
+                    self._entries.move_to_end(digest)
+                    # Türetilmiş yapılar (şerit indeksi vb.) sonradan büyümüş olabilir
+                    self._evict()
+                    return self._entries[digest]
+                loading = self._loading.get(digest)
+                if loading is None:
+                    loading = self._loading[digest] = threading.Event()
+                    break
+            # Başka bir çağrı yüklüyor; bitince önbelleğe yeniden bak (yükleme hata verdiyse bu çağrı dener)
+            loading.wait()
+
+        try:
+            net = load_network(net_file_path, self.cache_dir, digest=digest, on_progress=on_progress)
+            with self._lock:
+                self._entries[digest] = net
+                self._evict()
+            return net
+        finally:
+            with self._lock:
+                del self._loading[digest]
+            loading.set()
+
+    def total_bytes(self):
+        """Önbellekteki ağların türetilmiş yapılarıyla birlikte toplam boyutu"""
+        return sum(net.nbytes() for net in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self):
+        # En son eklenen ağ bütçeyi tek başına aşsa bile bellekte kalır
+        while len(self._entries) > 1 and self.total_bytes() > self.max_bytes:
+            self._entries.popitem(last=False)
+
+
+# Süreç genelinde paylaşılan önbellek
+network_cache = NetworkCache()
+
+
+def get_network(net_file_path):
+    """Paylaşılan önbellekten ağı döndürür"""
+    return network_cache.get(net_file_path)
+
+
+class NetworkLoader:
+    """Ağı arka plan iş parçacığında paylaşılan önbelleğe yükler
+
+    Arayüz ağ hazır olmadan çizilebilsin diye kullanılır: message/fraction
+    ilerlemeyi, done() hazır olup olmadığını, result() ağı (hata olduysa
+    istisnayı) verir. Yüklemeden sonra şerit indeksi de kurulur, böylece ilk
+    eşleme beklemez. Yükleyici ağa referans tutmaz; ağ önbellekte kalır ve
+    bütçe aşılınca diğer ağlar gibi bellekten atılabilir.
+    """
+
+    def __init__(self, net_file_path, cache=None):
+        self.net_file_path = net_file_path
+        self.message = "Ağ yükleniyor"
+        self.fraction = 0.0
+        self.error = None
+        self.elapsed = None
+        self._cache = cache if cache is not None else network_cache
+        self._done = threading.Event()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="network-loader", daemon=True)
+        self._thread.start()
+
+    def _progress(self, message, fraction):
+        self.message = message
+        self.fraction = fraction
+
+    def _run(self):
+        try:
+            net = self._cache.get(self.net_file_path, on_progress=self._progress)
+            self._progress("Şerit indeksi kuruluyor", 0.95)
+            net.get_lane_index()
+            self._progress("Ağ hazır", 1.0)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.elapsed = time.perf_counter() - self._started
+            self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Yükleme bitene kadar bekler ve result() döndürür"""
+        self._done.wait(timeout)
+        return self.result()
+
+    def result(self):
+        """Hazırsa ağı önbellekten, değilse None döndürür; yükleme hata verdiyse istisnayı yükseltir
+
+        Ağ bu arada önbellekten atıldıysa snapshot'tan yeniden yüklenir.
+        """
+        if self.error is not None:
+            raise self.error
+        if not self.done():
+            return None
+        return self._cache.get(self.net_file_path)
@@ -0,0 +1,316 @@
+"""SUMO durak/şarj istasyonu eşleme ve additional dosyası üretimi
+
+Streamlit'e bağımlı değildir; uygulamalar ve toplu işler (CLI) tarafından
+ortak kullanılır. Ağır bağımlılıklar (NumPy, pyproj) yalnızca ağ
+yüklenirken içe aktarılır, böylece `--help` gibi çağrılar hızlı açılır.
+
+Kullanım:
+    python sumo_stops.py osm.net.xml.gz noktalar.csv -o stops.add.xml
+"""
+import argparse
+import bisect
+import gzip
+import io
+import sys
+import time
+from datetime import datetime
+from xml.sax.saxutils import quoteattr
+
+POINT_TYPES = ('containerStop', 'chargingStation')
+
+# Durak, eşlenen konumun bu kadar metre öncesinden sonrasına kadar uzanır
+STOP_HALF_LENGTH = 5.0
+
+CHARGING_POWER = "200000.00"
+
+# Aynı şerit/edge üzerinde bu mesafeden yakın iki durak aynı kabul edilir (metre)
+DUPLICATE_DISTANCE = 10.0
+
+
+class StopIndex:
+    """Şerit (veya edge) başına sıralı durak konumları; yakın durak sorguları O(log n)
+
+    Her anahtar için konumlar sıralı bir listede tutulur; ekleme/silme bisect ile
+    yapılır, "bu şeritte d metre içinde durak var mı" sorgusu yalnızca en yakın
+    iki komşuya bakar.
+    """
+
+    def __init__(self, entries=()):
+        self._positions = {}
+        self._count = 0
+        for key, pos in entries:
+            self.add(key, pos)
+
+    def add(self, key, pos):
+        bisect.insort(self._positions.setdefault(key, []), pos)
+        self._count += 1
+
+    def remove(self, key, pos):
+        """Anahtardaki pos değerine eşit bir kaydı siler; bulunamazsa False döndürür"""
+        positions = self._positions.get(key)
+        if not positions:
+            return False
+        i = bisect.bisect_left(positions, pos)
+        if i == len(positions) or positions[i] != pos:
+            return False
+        positions.pop(i)
+        if not positions:
+            del self._positions[key]
+        self._count -= 1
+        return True
+
+    def nearest(self, key, pos):
+        """Anahtardaki pos'a en yakın durak konumu (yoksa None)"""
+        positions = self._positions.get(key)
+        if not positions:
+            return None
+        i = bisect.bisect_left(positions, pos)
+        neighbours = positions[max(0, i - 1):i + 1]
+        return min(neighbours, key=lambda other: abs(other - pos))
+
+    def has_near(self, key, pos, distance=DUPLICATE_DISTANCE):
+        """Anahtarda pos'a `distance` metreden yakın bir durak var mı?"""
+        nearest = self.nearest(key, pos)
+        return nearest is not None and abs(nearest - pos) < distance
+
+    def __len__(self):
+        return self._count
+
+
+def add_unique(index, points, key_field, pos_field, distance=DUPLICATE_DISTANCE):
+    """Dizindeki (ve listede kendinden önceki) duraklara yakın olmayan noktaları döndürür ve dizine ekler"""
+    unique = []
+    for point in points:
+        key, pos = point[key_field], point[pos_field]
+        if not index.has_near(key, pos, distance):
+            index.add(key, pos)
+            unique.append(point)
+    return unique
+
+
+def stop_from_snap(lane_id, edge_id, pos, lane_length, distance):
+    """Şerit eşleme sonucundan durak konum bilgisini üretir"""
+    return {
+        'lane': lane_id,
+        'edge_id': edge_id,
+        'startPos': round(max(0.0, pos - STOP_HALF_LENGTH), 2),
+        'endPos': round(min(lane_length, pos + STOP_HALF_LENGTH), 2),
+        'edge_length': lane_length,
+        'distance_to_edge': round(distance, 2)
+    }
+
+
+def nearest_stop_location(net, lat, lon, point_type=None, memo=None):
+    """Noktayı en yakın uygun şeride eşler; şerit bulunamazsa None döndürür
+
+    Nokta, durak türünün araç sınıfına (containerStop: truck, chargingStation:
+    evehicle) izin veren en yakın şeride eşlenir; böyle bir şerit yoksa
+    herhangi bir şeride düşülür. memo (snap_memo.SnapMemo) verilirse sonuç
+    önbellekten alınır.
+    """
+    import snap_memo
+    import sumo_network
+
+    vclass = sumo_network.STOP_VEHICLE_CLASSES.get(point_type)
+    if memo is not None:
+        lane = memo.nearest_lane(net, lon, lat, vclass)
+    else:
+        lane = snap_memo.nearest_lane(net, lon, lat, vclass)
+    if lane is None:
+        return None
+    return stop_from_snap(lane['lane_id'], lane['edge_id'], lane['pos'], lane['lane_length'], lane['distance'])
+
+
+def import_points(net, binary_stream, file_name, default_type='containerStop', bounds=None,
+                  total_bytes=None, on_progress=None, workers=1):
+    """Aday nokta dosyasını toplu olarak eşleyip point-selector nokta listesi üretir
+
+    Dönüş: (noktalar, istatistik sözlüğü)
+    """
+    import point_import
+
+    results, stats = point_import.bulk_import(
+        binary_stream, file_name, net,
+        bounds=bounds,
+        default_type=default_type,
+        total_bytes=total_bytes,
+        on_progress=on_progress,
+        workers=workers
+    )
+    points = []
+    for result in results:
+        point = {
+            'lat': result['lat'],
+            'lon': result['lon'],
+            'type': result['type'],
+            'name': result['name']
+        }
+        point.update(stop_from_snap(result['lane'], result['edge_id'], result['pos'],
+                                    result['lane_length'], result['distance']))
+        points.append(point)
+    return points, stats
+
+
+def name_points(points, start=1):
+    """Adı boş noktalara tür ve sıra numarasından ad verir"""
+    for i, point in enumerate(points, start=start):
+        if not point.get('name'):
+            point['name'] = f"{point['type']}_{i}"
+    return points
+
+
+def stop_elements(points_list):
+    """point-selector nokta listesinden (etiket, öznitelikler) çiftleri üretir"""
+    container_id = 1
+    charging_id = 1
+
+    for point in points_list:
+        if point['type'] == 'containerStop':
+            attributes = [("id", container_id)]
+            container_id += 1
+        elif point['type'] == 'chargingStation':
+            attributes = [("id", f"cs{charging_id}")]
+            charging_id += 1
+        else:
+            continue
+        if point['name']:
+            attributes.append(("name", point['name']))
+        attributes += [("lane", point['lane']), ("startPos", point['startPos']), ("endPos", point['endPos'])]
+        if point['type'] == 'chargingStation':
+            attributes.append(("power", CHARGING_POWER))
+        yield point['type'], attributes
+
+
+def cs_stop_elements(points):
+    """addition-app nokta listesinden (lane/edge_id + position) cs.add.xml öğeleri üretir
+
+    position, eşlenen şerit ('lane') üzerinde ölçülür; şerit bilgisi olmayan
+    eski kayıtlar için kenarın ilk şeridi kullanılır.
+    """
+    for i, point in enumerate(points, start=1):
+        if point['type'] not in POINT_TYPES:
+            continue
+        attributes = [
+            ("id", f"cs_{i}"),
+            ("lane", point.get('lane') or f"{point['edge_id']}_0"),
+            ("startPos", f"{point['position']:.2f}"),
+            ("endPos", f"{point['position'] + 5:.2f}")
+        ]
+        if point['type'] == 'chargingStation':
+            attributes.append(("power", "50000"))
+        yield point['type'], attributes
+
+
+def write_additional(f, elements, comment=None):
+    """Öğeleri additional dosyasına tek tek yazar (belge bellekte kurulmaz)
+
+    f: metin akışı; elements: (etiket, [(ad, değer), ...]) çiftleri. Öznitelik
+    değerleri XML için kaçışlanır.
+    """
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write('<additional xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:noNamespaceSchemaLocation="http://sumo.dlr.de/xsd/additional_file.xsd">\n')
+    if comment:
+        # Yorum içinde "--" geçemez
+        f.write(f'    <!-- {comment.replace("--", "- -")} -->\n')
+    for tag, attributes in elements:
+        f.write(f'    <{tag} ' + ' '.join(f'{name}={quoteattr(str(value))}' for name, value in attributes) + '/>\n')
+    f.write('</additional>\n')
+
+
+def generated_comment():
+    return f"Generated by SUMO Point Mapper on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+
+
+def open_output(path, compress=None):
+    """Çıktı dosyasını metin olarak açar; compress verilmezse .gz uzantısına göre gzip kullanılır"""
+    if compress is None:
+        compress = path.endswith('.gz')
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def additional_bytes(elements, compress=False, comment=None):
+    """İndirme butonları için additional dosyasını (isteğe bağlı gzip'li) bayt olarak üretir"""
+    buffer = io.BytesIO()
+    raw = gzip.GzipFile(fileobj=buffer, mode='wb') if compress else buffer
+    text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    write_additional(text, elements, comment)
+    text.flush()
+    text.detach()
+    if compress:
+        raw.close()
+    return buffer.getvalue()
+
+
+def create_sumo_xml(points_list):
+    """SUMO XML formatında dosya oluşturur"""
+    output = io.StringIO()
+    write_additional(output, stop_elements(points_list), generated_comment())
+    return output.getvalue()
+
+
+def write_cs_add_xml(f, points):
+    """addition-app nokta listesini (lane/edge_id + position) cs.add.xml biçiminde yazar"""
+    write_additional(f, cs_stop_elements(points))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Aday noktaları SUMO ağına eşleyip additional dosyası (containerStop/chargingStation) üretir"
+    )
+    parser.add_argument("net", help="SUMO ağ dosyası (.net.xml veya .net.xml.gz)")
+    parser.add_argument("points", nargs="+", help="Aday nokta dosyaları (CSV, GeoJSON, NDJSON)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Çıktı dosyası; .gz uzantılıysa gzip ile sıkıştırılır (varsayılan: standart çıktı)")
+    parser.add_argument("-t", "--type", default="containerStop", choices=POINT_TYPES,
+                        help="Dosyada tipi belirtilmeyen noktalar için durak tipi")
+    parser.add_argument("--no-bounds", action="store_true",
+                        help="Ağ sınırları dışındaki noktaları reddetme")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Paralel eşleme için süreç sayısı (0: çekirdek sayısına göre)")
+    parser.add_argument("--cache-dir", default=None, help="Ağ snapshot klasörü (varsayılan: .sumo_cache)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Özet çıktısını gösterme")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    import sumo_network
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    workers = args.workers
+    if workers == 0:
+        import parallel_snap
+        workers = parallel_snap.default_workers()
+
+    started = time.perf_counter()
+    cache_dir = args.cache_dir or sumo_network.DEFAULT_CACHE_DIR
+    net = sumo_network.load_network(args.net, cache_dir)
+    bounds = None if args.no_bounds else sumo_network.header_bounds(args.net)
+    log(f"Ağ yüklendi: {net.edge_count()} edge ({time.perf_counter() - started:.2f} s)")
+
+    points = []
+    for path in args.points:
+        with open(path, 'rb') as f:
+            imported, stats = import_points(net, f, path, default_type=args.type, bounds=bounds, workers=workers)
+        points.extend(imported)
+        log(f"{path}: {stats['imported']}/{stats['total']} nokta eşlendi "
+            f"(geçersiz {stats['invalid']}, sınır dışı {stats['out_of_bounds']}, eşlenemeyen {stats['unsnapped']})")
+
+    elements = stop_elements(name_points(points))
+    if args.output == "-":
+        write_additional(sys.stdout, elements, generated_comment())
+    else:
+        with open_output(args.output) as f:
+            write_additional(f, elements, generated_comment())
+        log(f"{len(points)} durak yazıldı: {args.output} ({time.perf_counter() - started:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
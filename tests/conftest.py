@@ -0,0 +1,42 @@
+"""Testler için ortak ağ dosyaları: paketle gelen Emek ağı ve küçük sentetik ağlar"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import synthetic_nets  # noqa: E402
+
+EMEK_NET = os.path.join(ROOT, "sumo_configs_emek", "osm.net.xml.gz")
+
+
+@pytest.fixture(scope="session")
+def synthetic_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("nets")
+    synthetic_nets.grid_net(str(path / "grid.net.xml"), 4)
+    synthetic_nets.radial_net(str(path / "radial.net.xml.gz"), 2)
+    return path
+
+
+@pytest.fixture(scope="session", params=["emek", "grid", "radial"])
+def net_file(request, synthetic_dir):
+    if request.param == "emek":
+        return EMEK_NET
+    return str(next(synthetic_dir.glob(f"{request.param}.net.xml*")))
+
+
+@pytest.fixture(scope="session")
+def sumolib_nets():
+    """sumolib ile okunan ağlar (yavaş olduğu için dosya başına bir kez)"""
+    import sumolib
+
+    nets = {}
+
+    def read(path):
+        if path not in nets:
+            nets[path] = sumolib.net.readNet(path)
+        return nets[path]
+    return read
@@ -0,0 +1,43 @@
+"""EdgeGeometry (CSR kenar geometrisi) dilimlerinin sumolib kenar şekilleriyle karşılaştırılması"""
+import numpy as np
+import pytest
+
+import sumo_network
+
+
+@pytest.fixture(scope="module")
+def snapshot(net_file):
+    return sumo_network.NetworkSnapshot.from_net_file(net_file)
+
+
+def test_slices_match_sumolib_shapes(snapshot, net_file, sumolib_nets):
+    net = sumolib_nets(net_file)
+    geometry = snapshot.edge_geometry()
+    shapes = {edge.getID(): edge.getShape() for edge in net.getEdges() if len(edge.getShape()) > 1}
+
+    assert sorted(geometry.ids.tolist()) == sorted(shapes)
+    for i, (edge_id, lonlat) in enumerate(geometry):
+        expected = np.array([net.convertXY2LonLat(x, y) for x, y in shapes[edge_id]])
+        np.testing.assert_allclose(lonlat, expected, rtol=0, atol=1e-9)
+        assert np.array_equal(geometry[i], lonlat)
+        assert np.array_equal(geometry.get(edge_id), lonlat)
+        assert snapshot.edge_ids[geometry.edge_indices[i]] == edge_id
+
+
+def test_slices_are_read_only_views(snapshot):
+    geometry = snapshot.edge_geometry()
+    assert len(geometry) == len(geometry.offsets) - 1
+    assert geometry.offsets[-1] == len(geometry.coords)
+    assert geometry[0].base is not None
+    with pytest.raises(ValueError):
+        geometry[0][0, 0] = 0.0
+    assert geometry.get("olmayan-kenar") is None
+
+
+def test_simplified_geometry_keeps_endpoints(snapshot):
+    full = snapshot.edge_geometry()
+    simplified = snapshot.edge_geometry(tolerance=5.0)
+    assert len(simplified.coords) <= len(full.coords)
+    for edge_id, lonlat in simplified:
+        original = full.get(edge_id)
+        np.testing.assert_array_equal(lonlat[[0, -1]], original[[0, -1]])
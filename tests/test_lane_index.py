@@ -0,0 +1,68 @@
+"""LaneIndex.nearest / nearest_many sonuçlarının sumolib şerit eşlemesiyle karşılaştırılması"""
+import numpy as np
+import pytest
+
+import sumo_network
+
+POINT_COUNT = 25
+
+
+@pytest.fixture(scope="module")
+def snapshot(net_file):
+    return sumo_network.NetworkSnapshot.from_net_file(net_file)
+
+
+@pytest.fixture(scope="module")
+def points(snapshot):
+    """Ağ sınırları içinde ve biraz dışında rastgele x/y noktaları"""
+    rng = np.random.default_rng(7)
+    low, high = snapshot.lane_shape_coords.min(0), snapshot.lane_shape_coords.max(0)
+    margin = (high - low) * 0.1
+    return rng.uniform(low - margin, high + margin, size=(POINT_COUNT, 2))
+
+
+def sumolib_distances(net, x, y, vclass=None):
+    """sumolib ile (kavşak içi şekiller hariç) her şeridin noktaya uzaklığı, yakından uzağa"""
+    lanes = net.getNeighboringLanes(x, y, 1e9, includeJunctions=False)
+    if vclass:
+        lanes = [(lane, dist) for lane, dist in lanes if lane.allows(vclass)]
+    return sorted(lanes, key=lambda item: item[1])
+
+
+@pytest.mark.filterwarnings("ignore:Module 'rtree' not available")
+@pytest.mark.parametrize("vclass", [None, "passenger"])
+def test_nearest_matches_sumolib(snapshot, points, net_file, sumolib_nets, vclass):
+    net = sumolib_nets(net_file)
+    for x, y in points:
+        expected = sumolib_distances(net, x, y, vclass)[:3]
+        results = snapshot.nearest_lanes(x, y, k=3, vclass=vclass)
+        np.testing.assert_allclose([result['distance'] for result in results],
+                                   [dist for _, dist in expected], rtol=0, atol=1e-6)
+        for result in results:
+            pos, dist = net.getLane(result['lane_id']).getClosestLanePosAndDist((x, y))
+            assert result['distance'] == pytest.approx(dist, abs=1e-6)
+            assert result['pos'] == pytest.approx(min(pos, result['lane_length']), abs=1e-6)
+
+
+def test_nearest_many_matches_nearest(snapshot, points, monkeypatch):
+    index = snapshot.get_lane_index()
+    # Ağın çok dışındaki noktalar tek tek nearest() ile çözülür
+    xy = np.vstack([points, points.max(0) + 5000.0])
+    expected = [index.nearest(x, y)[0] for x, y in xy]
+
+    # Küçük blok sınırıyla noktalar bölünerek çözülür; sonuç değişmemeli
+    for max_pairs in (sumo_network.LaneIndex.MAX_BLOCK_PAIRS, 50):
+        monkeypatch.setattr(sumo_network.LaneIndex, "MAX_BLOCK_PAIRS", max_pairs)
+        lanes, positions, distances = index.nearest_many(xy)
+        np.testing.assert_allclose(distances, [dist for _, _, dist in expected], rtol=0, atol=1e-9)
+        same_lane = lanes == [lane for lane, _, _ in expected]
+        np.testing.assert_allclose(positions[same_lane], np.array([pos for _, pos, _ in expected])[same_lane],
+                                   rtol=0, atol=1e-9)
+
+
+def test_nearest_many_with_lane_mask(snapshot, points):
+    mask = snapshot.lanes_allowing("passenger")
+    lanes, _, distances = snapshot.get_lane_index().nearest_many(points, mask)
+    assert mask[lanes].all()
+    expected = [snapshot.get_lane_index().nearest(x, y, 1, mask)[0][2] for x, y in points]
+    np.testing.assert_allclose(distances, expected, rtol=0, atol=1e-9)
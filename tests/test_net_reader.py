@@ -0,0 +1,52 @@
+"""read_net_columns'un sumolib.net.readNet ile aynı ağı verdiğinin kontrolü"""
+import numpy as np
+
+import sumo_network
+
+
+def test_location_matches_sumolib(net_file, sumolib_nets):
+    location, _ = sumo_network.read_net_columns(net_file)
+    assert location == sumolib_nets(net_file)._location
+
+
+def test_edges_match_sumolib(net_file, sumolib_nets):
+    net = sumolib_nets(net_file)
+    _, arrays = sumo_network.read_net_columns(net_file)
+    edges = net.getEdges()
+    node_ids = arrays['node_ids'].tolist()
+
+    assert arrays['edge_ids'].tolist() == [edge.getID() for edge in edges]
+    assert arrays['edge_functions'].tolist() == [edge.getFunction() for edge in edges]
+    assert [node_ids[i] for i in arrays['edge_from']] == [edge.getFromNode().getID() for edge in edges]
+    assert [node_ids[i] for i in arrays['edge_to']] == [edge.getToNode().getID() for edge in edges]
+    offsets, coords = arrays['edge_shape_offsets'], arrays['edge_shape_coords']
+    for i, edge in enumerate(edges):
+        np.testing.assert_allclose(coords[offsets[i]:offsets[i + 1]], np.array(edge.getShape()).reshape(-1, 2))
+
+
+def test_lanes_match_sumolib(net_file, sumolib_nets):
+    net = sumolib_nets(net_file)
+    _, arrays = sumo_network.read_net_columns(net_file)
+    lanes = [lane for edge in net.getEdges() for lane in edge.getLanes()]
+    edge_ids = arrays['edge_ids']
+
+    assert arrays['lane_ids'].tolist() == [lane.getID() for lane in lanes]
+    assert edge_ids[arrays['lane_edge']].tolist() == [lane.getEdge().getID() for lane in lanes]
+    assert arrays['lane_index'].tolist() == [lane.getIndex() for lane in lanes]
+    np.testing.assert_allclose(arrays['lane_length'], [lane.getLength() for lane in lanes])
+    np.testing.assert_allclose(arrays['lane_speed'], [lane.getSpeed() for lane in lanes])
+    permissions = arrays['allowed_classes'][arrays['lane_allowed']]
+    assert [set(allowed.split()) for allowed in permissions.tolist()] == [set(lane.getPermissions()) for lane in lanes]
+    offsets, coords = arrays['lane_shape_offsets'], arrays['lane_shape_coords']
+    for i, lane in enumerate(lanes):
+        np.testing.assert_allclose(coords[offsets[i]:offsets[i + 1]], np.array(lane.getShape()).reshape(-1, 2))
+
+
+def test_nodes_match_sumolib(net_file, sumolib_nets):
+    net = sumolib_nets(net_file)
+    _, arrays = sumo_network.read_net_columns(net_file)
+    nodes = net.getNodes()
+
+    assert arrays['node_ids'].tolist() == [node.getID() for node in nodes]
+    assert arrays['node_types'].tolist() == [node.getType() or "" for node in nodes]
+    np.testing.assert_allclose(arrays['node_coords'], np.array([node.getCoord()[:2] for node in nodes]).reshape(-1, 2))
@@ -0,0 +1,109 @@
+"""Akış halinde nokta içe aktarma: CSV / GeoJSON / NDJSON ayrıştırıcıları ve toplu eşleme"""
+import io
+import json
+
+import numpy as np
+import pytest
+
+import point_import
+import sumo_network
+
+RECORDS = [
+    {'lat': 39.7767, 'lon': 30.5206, 'type': 'chargingStation', 'name': 'Şarj 1'},
+    {'lat': 39.7770, 'lon': 30.5210, 'type': None, 'name': ''},
+    {'lat': 39.7780, 'lon': 30.5190, 'type': 'containerStop', 'name': 'Depo, "kuzey"'},
+]
+
+
+def as_csv(records):
+    lines = ["Enlem,Boylam,tip,ad"]
+    for record in records:
+        name = record['name'].replace('"', '""')
+        lines.append(f"{record['lat']},{record['lon']},{record['type'] or ''},\"{name}\"")
+    return "\n".join(lines) + "\n"
+
+
+def as_ndjson(records):
+    return "".join(json.dumps({'latitude': r['lat'], 'lng': r['lon'], 'type': r['type'], 'name': r['name']},
+                              ensure_ascii=False) + "\n\n" for r in records)
+
+
+def as_geojson(records):
+    features = [{'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [r['lon'], r['lat']]},
+                 'properties': {'type': r['type'], 'name': r['name']}} for r in records]
+    return json.dumps({'type': 'FeatureCollection', 'name': 'noktalar', 'features': features},
+                      ensure_ascii=False, indent=2)
+
+
+def candidates(text, file_name):
+    return list(point_import.iter_candidates(io.BytesIO(text.encode('utf-8')), file_name))
+
+
+@pytest.mark.parametrize("file_name, encode", [
+    ("noktalar.csv", as_csv), ("noktalar.ndjson", as_ndjson), ("noktalar.jsonl", as_ndjson),
+    ("noktalar.geojson", as_geojson), ("noktalar.json", as_geojson),
+])
+def test_formats_yield_same_candidates(file_name, encode):
+    assert candidates(encode(RECORDS), file_name) == RECORDS
+
+
+def test_csv_has_bom_and_invalid_rows():
+    text = "\ufefflat,lon\n39.7,30.5\nabc,30.5\n95,30.5\n,\n"
+    assert candidates(text, "a.csv") == [{'lat': 39.7, 'lon': 30.5, 'type': None, 'name': ''}, None, None, None]
+
+
+def test_ndjson_invalid_lines():
+    text = '{"lat": 39.7, "lon": 30.5}\n{bozuk\n[1, 2]\n'
+    assert candidates(text, "a.ndjson") == [{'lat': 39.7, 'lon': 30.5, 'type': None, 'name': ''}, None, None]
+
+
+def test_geojson_small_chunks():
+    text = as_geojson(RECORDS)
+    features = list(point_import.iter_geojson(io.StringIO(text), chunk_size=7))
+    assert features == RECORDS
+
+
+def test_geojson_non_point_features():
+    text = json.dumps({'features': [
+        {'type': 'Feature', 'geometry': {'type': 'LineString', 'coordinates': [[30.5, 39.7], [30.6, 39.8]]}},
+        {'type': 'Feature', 'geometry': None},
+    ]})
+    assert candidates(text, "a.geojson") == [None, None]
+
+
+@pytest.mark.parametrize("text", ['{"type": "FeatureCollection"}', '{"features": [{"type": "Feature"'])
+def test_geojson_errors(text):
+    with pytest.raises(ValueError):
+        candidates(text, "a.geojson")
+
+
+def test_unsupported_extension():
+    with pytest.raises(ValueError):
+        point_import.detect_format("noktalar.xlsx")
+
+
+def test_bulk_import_matches_single_snaps(synthetic_dir):
+    net = sumo_network.NetworkSnapshot.from_net_file(str(synthetic_dir / "grid.net.xml"))
+    bounds = sumo_network.header_bounds(str(synthetic_dir / "grid.net.xml"))
+    rng = np.random.default_rng(5)
+    lat = rng.uniform(bounds['min_lat'], bounds['max_lat'], 40)
+    lon = rng.uniform(bounds['min_lon'], bounds['max_lon'], 40)
+    records = [{'lat': float(a), 'lon': float(b), 'type': ('chargingStation', None)[i % 2], 'name': ''}
+               for i, (a, b) in enumerate(zip(lat, lon))]
+    records.append({'lat': bounds['max_lat'] + 1.0, 'lon': bounds['max_lon'], 'type': None, 'name': ''})
+    progress = []
+
+    imported, stats = point_import.bulk_import(
+        io.BytesIO((as_csv(records) + "bozuk,satır\n").encode('utf-8')), "noktalar.csv", net, bounds=bounds,
+        batch_size=16, on_progress=lambda fraction, count: progress.append(count))
+
+    assert stats == {'total': 42, 'invalid': 1, 'out_of_bounds': 1, 'unsnapped': 0, 'imported': 40}
+    assert progress == [16, 32, 42]
+    for record, point in zip(records, imported):
+        point_type = record['type'] or 'containerStop'
+        assert point['type'] == point_type
+        x, y = net.convertLonLat2XY(record['lon'], record['lat'])
+        expected = net.nearest_lanes(x, y, vclass=sumo_network.STOP_VEHICLE_CLASSES.get(point_type))[0]
+        assert point['distance'] == pytest.approx(expected['distance'], abs=1e-6)
+        if point['lane'] == expected['lane_id']:
+            assert point['pos'] == pytest.approx(expected['pos'], abs=1e-6)
@@ -0,0 +1,45 @@
+"""Snapshot'ın .npz'ye yazılıp aynen geri okunması ve load_network önbelleği"""
+import os
+import shutil
+
+import numpy as np
+
+import sumo_network
+
+
+def assert_same_snapshot(a, b):
+    assert a.location == b.location
+    for name in sumo_network.NetworkSnapshot.ARRAY_FIELDS:
+        assert np.array_equal(getattr(a, name), getattr(b, name)), name
+
+
+def test_save_load_roundtrip(net_file, tmp_path):
+    snapshot = sumo_network.NetworkSnapshot.from_net_file(net_file)
+    path = str(tmp_path / "net.npz")
+    snapshot.save(path)
+    assert_same_snapshot(snapshot, sumo_network.NetworkSnapshot.load(path))
+
+
+def test_load_network_reuses_snapshot(net_file, tmp_path, monkeypatch):
+    first = sumo_network.load_network(net_file, cache_dir=str(tmp_path))
+    assert os.path.exists(sumo_network.snapshot_path(net_file, first.digest, str(tmp_path)))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Ağ dosyası yeniden okunmamalıydı")
+    monkeypatch.setattr(sumo_network.NetworkSnapshot, "from_net_file", fail)
+    second = sumo_network.load_network(net_file, cache_dir=str(tmp_path))
+    assert second.digest == first.digest
+    assert_same_snapshot(first, second)
+
+
+def test_changed_net_replaces_stale_snapshot(synthetic_dir, tmp_path):
+    net_file = str(tmp_path / "grid.net.xml")
+    shutil.copy(synthetic_dir / "grid.net.xml", net_file)
+    old = sumo_network.load_network(net_file, cache_dir=str(tmp_path))
+
+    with open(net_file, "a") as f:
+        f.write("<!-- değişti -->\n")
+    new = sumo_network.load_network(net_file, cache_dir=str(tmp_path))
+    assert new.digest != old.digest
+    snapshots = [name for name in os.listdir(tmp_path) if name.endswith(".npz")]
+    assert snapshots == [os.path.basename(sumo_network.snapshot_path(net_file, new.digest, str(tmp_path)))]
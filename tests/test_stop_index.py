@@ -0,0 +1,47 @@
+"""StopIndex'in doğrusal taramayla aynı yakın durak kararlarını verdiğinin kontrolü"""
+import random
+
+import sumo_stops
+
+
+def brute_has_near(stops, key, pos, distance):
+    return any(other_key == key and abs(other_pos - pos) < distance for other_key, other_pos in stops)
+
+
+def test_matches_linear_scan():
+    rng = random.Random(3)
+    index = sumo_stops.StopIndex()
+    stops = []
+    for _ in range(2000):
+        key = f"e{rng.randrange(5)}_0"
+        pos = round(rng.uniform(0, 500), 1)
+        if stops and rng.random() < 0.2:
+            removed = stops.pop(rng.randrange(len(stops)))
+            assert index.remove(*removed)
+        assert index.has_near(key, pos) == brute_has_near(stops, key, pos, sumo_stops.DUPLICATE_DISTANCE)
+        nearest = index.nearest(key, pos)
+        same_key = [other_pos for other_key, other_pos in stops if other_key == key]
+        if same_key:
+            assert abs(nearest - pos) == min(abs(other_pos - pos) for other_pos in same_key)
+        else:
+            assert nearest is None
+        index.add(key, pos)
+        stops.append((key, pos))
+        assert len(index) == len(stops)
+
+
+def test_remove_missing_entry():
+    index = sumo_stops.StopIndex([("e1_0", 10.0)])
+    assert not index.remove("e1_0", 11.0)
+    assert not index.remove("e2_0", 10.0)
+    assert index.remove("e1_0", 10.0)
+    assert len(index) == 0 and index.nearest("e1_0", 10.0) is None
+
+
+def test_add_unique_skips_near_duplicates():
+    index = sumo_stops.StopIndex([("e1_0", 100.0)])
+    points = [{'lane': "e1_0", 'pos': 105.0}, {'lane': "e1_0", 'pos': 120.0},
+              {'lane': "e1_0", 'pos': 125.0}, {'lane': "e2_0", 'pos': 100.0}]
+    unique = sumo_stops.add_unique(index, points, 'lane', 'pos')
+    assert unique == [points[1], points[3]]
+    assert len(index) == 3
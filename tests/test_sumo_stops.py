@@ -0,0 +1,62 @@
+"""Additional dosyası yazıcısı (write_additional, stop_elements, cs_stop_elements)"""
+import gzip
+import io
+import xml.etree.ElementTree as ET
+
+import sumo_stops
+
+POINTS = [
+    {'type': 'containerStop', 'name': 'Depo "A" & <B>', 'lane': 'e1_0', 'startPos': '10.00', 'endPos': '20.00'},
+    {'type': 'chargingStation', 'name': '', 'lane': 'e2_1', 'startPos': '0.00', 'endPos': '10.00'},
+    {'type': 'bilinmeyen', 'name': 'atlanır', 'lane': 'e3_0', 'startPos': '0.00', 'endPos': '1.00'},
+    {'type': 'containerStop', 'name': 'Şarj Ünitesi', 'lane': 'e4_0', 'startPos': '5.50', 'endPos': '15.50'},
+]
+
+
+def parse(text):
+    return ET.fromstring(text.encode('utf-8'))
+
+
+def test_stop_elements_parse_back():
+    root = parse(sumo_stops.create_sumo_xml(POINTS))
+    assert root.tag == 'additional'
+    assert [(child.tag, child.attrib) for child in root] == [
+        ('containerStop', {'id': '1', 'name': 'Depo "A" & <B>', 'lane': 'e1_0', 'startPos': '10.00', 'endPos': '20.00'}),
+        ('chargingStation', {'id': 'cs1', 'lane': 'e2_1', 'startPos': '0.00', 'endPos': '10.00',
+                             'power': sumo_stops.CHARGING_POWER}),
+        ('containerStop', {'id': '2', 'name': 'Şarj Ünitesi', 'lane': 'e4_0', 'startPos': '5.50', 'endPos': '15.50'}),
+    ]
+
+
+def test_comment_cannot_break_xml():
+    output = io.StringIO()
+    sumo_stops.write_additional(output, [], comment="a -- b -->")
+    assert len(parse(output.getvalue())) == 0
+
+
+def test_cs_stop_elements_use_snapped_lane():
+    points = [
+        {'type': 'chargingStation', 'edge_id': 'e1', 'lane': 'e1_2', 'position': 12.25},
+        {'type': 'containerStop', 'edge_id': 'e2', 'position': 3.0},
+    ]
+    output = io.StringIO()
+    sumo_stops.write_cs_add_xml(output, points)
+    root = parse(output.getvalue())
+    assert [(child.tag, child.attrib) for child in root] == [
+        ('chargingStation', {'id': 'cs_1', 'lane': 'e1_2', 'startPos': '12.25', 'endPos': '17.25', 'power': '50000'}),
+        ('containerStop', {'id': 'cs_2', 'lane': 'e2_0', 'startPos': '3.00', 'endPos': '8.00'}),
+    ]
+
+
+def test_additional_bytes_match_text_writer(tmp_path):
+    output = io.StringIO()
+    sumo_stops.write_additional(output, sumo_stops.stop_elements(POINTS))
+    plain = sumo_stops.additional_bytes(sumo_stops.stop_elements(POINTS))
+    assert plain == output.getvalue().encode('utf-8')
+    assert gzip.decompress(sumo_stops.additional_bytes(sumo_stops.stop_elements(POINTS), compress=True)) == plain
+
+    path = str(tmp_path / "stops.add.xml.gz")
+    with sumo_stops.open_output(path) as f:
+        sumo_stops.write_additional(f, sumo_stops.stop_elements(POINTS))
+    with gzip.open(path, 'rb') as f:
+        assert f.read() == plain
@@ -0,0 +1,155 @@
+"""Yüklenen ağ dosyaları için içerik adresli disk önbelleği
+
+Yüklenen dosya bir kez, parça parça okunarak `.sumo_cache/uploads/` altına
+içerik hash'i (sha256) ile adlandırılmış olarak yazılır. Aynı içerik (farklı
+adla ya da farklı kullanıcılarca yüklense bile) tek kopya olarak tutulur.
+gzip ile sıkıştırılmış ağlar (.net.xml.gz) olduğu gibi saklanır. Boyut
+sınırı aşan yüklemeler reddedilir; toplam boyut veya yaş sınırını aşan en az
+kullanılan dosyalar otomatik olarak silinir; bu dosyalardan üretilen ağ
+snapshot'ları (.npz) da onlarla birlikte silinir.
+"""
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+from sumo_network import DEFAULT_CACHE_DIR, open_net_file, remember_sha256
+
+UPLOAD_DIR = os.path.join(DEFAULT_CACHE_DIR, "uploads")
+# Tek yükleme ve tüm önbellek için üst sınırlar (MB) ve dosyaların en uzun saklanma süresi (gün)
+MAX_UPLOAD_MB = int(os.environ.get("SUMO_MAX_UPLOAD_MB", "200"))
+MAX_CACHE_MB = int(os.environ.get("SUMO_UPLOAD_CACHE_MB", "1024"))
+MAX_AGE_DAYS = float(os.environ.get("SUMO_UPLOAD_MAX_AGE_DAYS", "7"))
+
+CHUNK_SIZE = 1 << 20
+
+# Yüklenen dosyalardan üretilen snapshot adları: <sha256>.net.xml[.gz].<hash>.v<sürüm>.npz
+_SNAPSHOT_NAME = re.compile(r"^([0-9a-f]{64}\.net\.xml(?:\.gz)?)\..+\.npz$")
+
+
+def _extension(data_start):
+    return ".net.xml.gz" if data_start[:2] == b"\x1f\x8b" else ".net.xml"
+
+
+def is_net_file(path):
+    """Dosyanın (gzip'li olsa da) bir SUMO ağı (<net> kök elemanı) olup olmadığını kontrol eder"""
+    try:
+        with open_net_file(path) as f:
+            head = f.read(64 * 1024)
+    except OSError:
+        return False
+    return b"<net " in head or b"<net>" in head
+
+
+def touch(path):
+    """Son kullanım zamanını (atime) günceller; temizlikte en az kullanılanlar önce silinir"""
+    try:
+        # mtime nanosaniye hassasiyetiyle korunur (file_sha256 önbelleğinin anahtarı)
+        os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+    except OSError:
+        pass
+
+
+def store_upload(stream, size=None, cache_dir=UPLOAD_DIR, max_bytes=MAX_UPLOAD_MB * 1024 * 1024):
+    """Yüklenen dosyayı hash'le adlandırılmış olarak önbelleğe yazar
+
+    stream: okunabilir ikili akış (ör. Streamlit UploadedFile). Dönüş:
+    (dosya yolu, sha256). Dosya çok büyükse veya SUMO ağı değilse ValueError.
+    """
+    if size is not None and size > max_bytes:
+        raise ValueError(f"Dosya çok büyük ({size / 1024 / 1024:.0f} MB, sınır {max_bytes / 1024 / 1024:.0f} MB)")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    written = 0
+    first = b""
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise ValueError(f"Dosya çok büyük (sınır {max_bytes / 1024 / 1024:.0f} MB)")
+                if not first:
+                    first = chunk[:2]
+                digest.update(chunk)
+                f.write(chunk)
+
+        sha = digest.hexdigest()
+        path = os.path.join(cache_dir, sha + _extension(first))
+        if os.path.exists(path):
+            # Aynı içerik zaten önbellekte
+            os.remove(tmp_path)
+        else:
+            if not is_net_file(tmp_path):
+                raise ValueError("Dosya bir SUMO ağı (.net.xml / .net.xml.gz) değil")
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Hash zaten hesaplandı; ağ önbelleği dosyayı yeniden okumasın
+    remember_sha256(path, sha)
+    touch(path)
+    cleanup(cache_dir, keep=path)
+    return path, sha
+
+
+def cleanup(cache_dir=UPLOAD_DIR, max_total_bytes=MAX_CACHE_MB * 1024 * 1024,
+            max_age_days=MAX_AGE_DAYS, keep=None, snapshot_dir=DEFAULT_CACHE_DIR):
+    """Süresi dolan dosyaları, ardından toplam boyut sınırı sağlanana kadar en az kullanılanları siler
+
+    Kaynağı artık önbellekte olmayan yükleme snapshot'ları da `snapshot_dir`'den
+    silinir. Dönüş: silinen dosya sayısı.
+    """
+    if not os.path.isdir(cache_dir):
+        return _remove_orphan_snapshots(cache_dir, snapshot_dir)
+    now = time.time()
+    files = []
+    removed = 0
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        last_used = max(stat.st_atime, stat.st_mtime)
+        # Yarım kalmış yüklemeler ve süresi dolanlar
+        stale = name.endswith(".part") and now - stat.st_mtime > 3600
+        if path != keep and (stale or now - last_used > max_age_days * 86400):
+            removed += _remove(path)
+            continue
+        if not name.endswith(".part"):
+            files.append((last_used, stat.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_total_bytes:
+            break
+        if path != keep:
+            removed += _remove(path)
+            total -= size
+    return removed + _remove_orphan_snapshots(cache_dir, snapshot_dir)
+
+
+def _remove_orphan_snapshots(cache_dir, snapshot_dir):
+    """Kaynak yükleme dosyası silinmiş snapshot'ları siler"""
+    if not os.path.isdir(snapshot_dir):
+        return 0
+    uploads = set(os.listdir(cache_dir)) if os.path.isdir(cache_dir) else set()
+    removed = 0
+    for name in os.listdir(snapshot_dir):
+        match = _SNAPSHOT_NAME.match(name)
+        if match and match.group(1) not in uploads:
+            removed += _remove(os.path.join(snapshot_dir, name))
+    return removed
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return 1
+    except OSError:
+        return 0